@@ -1,10 +1,27 @@
 import os
 import pathlib
+import time
 from collections import defaultdict
-from typing import Optional
+from dataclasses import dataclass
+from typing import List, Optional, TypedDict
 
 from integration_tests.subroutes import di_subrouter, sub_router
-from robyn import Headers, Request, Response, Robyn, WebSocket, WebSocketConnector, jsonify, serve_file, serve_html
+from robyn import (
+    BlockingPool,
+    BodyStream,
+    Cache,
+    Headers,
+    RateLimit,
+    Request,
+    Response,
+    Robyn,
+    StreamingResponse,
+    WebSocket,
+    WebSocketConnector,
+    jsonify,
+    serve_file,
+    serve_html,
+)
 from robyn.authentication import AuthenticationHandler, BearerGetter, Identity
 from robyn.robyn import QueryParams, Url
 from robyn.templating import JinjaTemplate
@@ -201,6 +218,18 @@ def sync_middlewares_401():
     pass
 
 
+# a middleware on one of the paths of a route with params
+@app.after_request("/sync/middlewares/path/special")
+def sync_after_request_special_path(response: Response):
+    response.headers.set("after", "special_path")
+    return response
+
+
+@app.get("/sync/middlewares/path/:id")
+def sync_middlewares_path(request: Request):
+    return request.path_params["id"]
+
+
 # ===== Routes =====
 
 # --- GET ---
@@ -336,6 +365,171 @@ async def async_octet_response_get():
     )
 
 
+LARGE_BINARY_BODY = b"robyn" * 20000
+
+
+@app.get("/sync/octet/memoryview")
+def sync_octet_memoryview_get():
+    return memoryview(LARGE_BINARY_BODY)
+
+
+@app.get("/async/octet/bytearray")
+async def async_octet_bytearray_get():
+    return bytearray(LARGE_BINARY_BODY)
+
+
+@app.get("/sync/octet/readonly_view")
+def sync_octet_readonly_view_get():
+    # read only, but the bytearray behind it can still change, so the body must be copied
+    return memoryview(bytearray(LARGE_BINARY_BODY)).toreadonly()
+
+
+# Cache
+
+items_cache = Cache(ttl=60, vary=["accept"], query_params=["page"])
+items_calls = {"count": 0}
+
+
+@app.get("/sync/cache/items/:id", cache=items_cache)
+def sync_cached_item_get(request: Request):
+    items_calls["count"] += 1
+    return f"{request.path_params['id']} {request.query_params.get('page', '1')} {items_calls['count']}"
+
+
+@app.get("/sync/cache/stats")
+def sync_cache_stats_get():
+    return {"hits": items_cache.hits, "misses": items_cache.misses}
+
+
+# ETag
+
+
+@app.get("/sync/etag", etag=True)
+def sync_etag_get():
+    return {"items": list(range(100))}
+
+
+@app.get("/sync/etag/custom", etag=True)
+def sync_etag_custom_get():
+    return Response(status_code=200, headers=Headers({"ETag": '"v1"'}), description="custom etag")
+
+
+# Rate limit
+
+
+@app.get("/sync/rate_limit", rate_limit=RateLimit(rate=2, per=60, key="header:X-Api-Key"))
+def sync_rate_limit_get():
+    return "not limited"
+
+
+@app.post("/async/rate_limit", rate_limit=RateLimit(rate=1, per=60, burst=3, key="header:X-Api-Key"))
+async def async_rate_limit_post():
+    return "not limited"
+
+
+# Blocking pool
+
+slow_pool = BlockingPool(size=1)
+
+
+@app.get("/sync/blocking_pool/slow", blocking_pool=slow_pool)
+def sync_blocking_pool_slow():
+    time.sleep(1)
+    return "slow"
+
+
+@app.get("/sync/blocking_pool/stats")
+def sync_blocking_pool_stats():
+    return {
+        "size": slow_pool.size,
+        "active": slow_pool.active,
+        "queue_depth": slow_pool.queue_depth,
+        "completed": slow_pool.completed,
+        "max_wait_time": slow_pool.max_wait_time,
+    }
+
+
+stream_pool = BlockingPool(size=1)
+
+
+def blocking_pool_stream():
+    async def rows():
+        for i in range(3):
+            yield f"{i},pool\n"
+
+    return StreamingResponse(rows(), media_type="text/csv")
+
+
+@app.get("/sync/blocking_pool/stream", blocking_pool=stream_pool)
+def sync_blocking_pool_stream():
+    return blocking_pool_stream()
+
+
+# with an async middleware, only the handler runs on the pool
+@app.before_request("/sync/blocking_pool/stream/async_middleware")
+async def async_before_request_blocking_pool_stream(request: Request):
+    return request
+
+
+@app.get("/sync/blocking_pool/stream/async_middleware", blocking_pool=stream_pool)
+def sync_blocking_pool_stream_async_middleware():
+    return blocking_pool_stream()
+
+
+# Streaming
+
+
+@app.get("/sync/stream")
+def sync_stream_get():
+    for i in range(3):
+        yield f"sync chunk {i}\n"
+
+
+@app.get("/async/stream")
+async def async_stream_get():
+    for i in range(3):
+        yield f"async chunk {i}\n".encode()
+
+
+@app.get("/sync/stream/response")
+def sync_stream_response_get():
+    rows = (f"{i},robyn\n" for i in range(3))
+    return StreamingResponse(rows, status_code=201, media_type="text/csv")
+
+
+@app.get("/async/stream/response")
+async def async_stream_response_get():
+    async def rows():
+        for i in range(3):
+            yield f"{i},robyn\n"
+
+    return StreamingResponse(rows(), status_code=201, media_type="text/csv")
+
+
+@app.post("/async/body_stream")
+async def async_body_stream_post(body: BodyStream):
+    size = 0
+    async for chunk in body:
+        size += len(chunk)
+    return str(size)
+
+
+@app.post("/async/body_stream/request")
+async def async_body_stream_request_post(request: Request, body: BodyStream):
+    chunks = [chunk async for chunk in body]
+    return b"".join(chunks) if request.body == "" else "body was buffered"
+
+
+@app.post("/sync/raw_body")
+def sync_raw_body_post(request: Request):
+    return request.raw_body
+
+
+@app.post("/async/raw_body")
+async def async_raw_body_post(request: Request):
+    return request.raw_body
+
+
 # JSON
 
 
@@ -359,6 +553,57 @@ async def async_json_const_get():
     return jsonify({"async json const get": "json"})
 
 
+@dataclass
+class Hero:
+    name: str
+    powers: List[str]
+
+
+class Villain(TypedDict):
+    name: str
+    nemesis: Hero
+
+
+@app.get("/sync/global_response_header/override")
+def sync_global_response_header_override():
+    return Response(status_code=200, headers=Headers({"server": "custom"}), description="overridden")
+
+
+@app.after_request("/sync/global_response_header/after_middleware")
+def sync_global_response_header_after_request(response: Response):
+    # the global response headers are set before the after middlewares run
+    response.headers.set("server", f"{response.headers.get('server')} after")
+    return response
+
+
+@app.get("/sync/global_response_header/after_middleware")
+def sync_global_response_header_after_middleware():
+    return "after middleware"
+
+
+@app.get("/sync/headers/:count")
+def sync_headers_count(request: Request):
+    # the request headers are converted from actix, and as many response headers are set on actix
+    count = int(request.path_params["count"])
+    headers = Headers({f"x-response-{index}": f"value-{index}" for index in range(count)})
+    return Response(status_code=200, headers=headers, description=str(len(request.headers.get_headers())))
+
+
+@app.get("/sync/json/list")
+def sync_json_list_get():
+    return [1, "two", {"three": 3.0}, None]
+
+
+@app.get("/async/json/dataclass")
+async def async_json_dataclass_get():
+    return Hero(name="batman", powers=["money"])
+
+
+@app.get("/sync/json/typed_dict")
+def sync_json_typed_dict_get():
+    return Villain(name="joker", nemesis=Hero(name="batman", powers=["money"]))
+
+
 # Param
 
 
@@ -474,6 +719,23 @@ def sync_multipart_file(request: Request):
     return {"file_names": list(file_names)}
 
 
+@app.post("/sync/multipart-uploads")
+def sync_multipart_uploads(request: Request):
+    return {
+        "uploads": [
+            {
+                "name": upload.name,
+                "filename": upload.filename,
+                "content_type": upload.content_type,
+                "size": upload.size,
+                "spooled": upload.path is not None,
+                "valid": upload.read() == b"x" * upload.size,
+            }
+            for upload in request.uploads
+        ]
+    }
+
+
 # Queries
 
 
@@ -489,6 +751,17 @@ async def async_query(request: Request):
     return jsonify(query_data)
 
 
+@app.get("/sync/queries/typed")
+def sync_queries_typed(request: Request):
+    query_params = request.query_params
+    return {
+        "page": query_params.get_int("page", 1),
+        "debug": query_params.get_bool("debug", False),
+        "tags": query_params.get_list("tags"),
+        "q": query_params.get("q"),
+    }
+
+
 # Status code
 
 
@@ -601,6 +874,14 @@ async def request_json(request: Request):
     return json["key"]
 
 
+@app.post("/sync/request_json/nested")
+def sync_json_nested_post(request: Request):
+    json = request.json()
+    # the parsed body is cached on the request
+    assert request.json() is json
+    return jsonify({"type": type(json).__name__, "json": json})
+
+
 # --- PUT ---
 
 # dict
@@ -803,6 +1084,16 @@ def sync_router_di(request, router_dependencies):
     return router_dependencies["ROUTER_DEPENDENCY"]
 
 
+@app.get("/sync/dependencies_only_di")
+def sync_dependencies_only_di(global_dependencies, router_dependencies):
+    return global_dependencies["GLOBAL_DEPENDENCY"] + " " + router_dependencies["ROUTER_DEPENDENCY"]
+
+
+@app.get("/async/dependencies_only_di")
+async def async_dependencies_only_di(global_dependencies, router_dependencies):
+    return global_dependencies["GLOBAL_DEPENDENCY"] + " " + router_dependencies["ROUTER_DEPENDENCY"]
+
+
 # ===== Split request body =====
 
 
@@ -1058,6 +1349,16 @@ def create_item(request, body: CreateItemBody, query: CreateItemQueryParamsParam
     return CreateItemResponse(success=True, items_changed=2)
 
 
+@app.post("/sync/body_validation")
+def sync_body_validation(body: CreateItemBody):
+    return {"first": body.name.first, "is_present": body.name.initial.is_present, "price": body.price}
+
+
+@app.post("/async/body_validation")
+async def async_body_validation(body: CreateItemBody):
+    return {"first": body.name.first, "is_present": body.name.initial.is_present, "price": body.price}
+
+
 def main():
     app.set_response_header("server", "robyn")
     app.serve_directory(
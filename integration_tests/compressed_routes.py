@@ -0,0 +1,61 @@
+"""
+An app that compresses its responses, apart from the base routes so that the other tests
+see the responses as the handlers return them.
+"""
+
+import os
+import pathlib
+
+from robyn import Headers, Response, Robyn
+
+app = Robyn(__file__)
+
+current_file_path = pathlib.Path(__file__).parent.resolve()
+
+COMPRESSIBLE_BODY = "robyn compresses this body " * 100
+
+
+@app.get("/sync/str")
+def sync_str_get():
+    return "sync str get"
+
+
+@app.get("/sync/compression")
+def sync_compression_get():
+    return COMPRESSIBLE_BODY
+
+
+@app.get("/async/compression")
+async def async_compression_get():
+    return COMPRESSIBLE_BODY
+
+
+@app.get("/sync/compression/large")
+def sync_compression_large_get():
+    return COMPRESSIBLE_BODY * 30
+
+
+@app.get("/sync/compression/const", const=True)
+def sync_compression_const_get():
+    return COMPRESSIBLE_BODY
+
+
+@app.get("/sync/compression/image")
+def sync_compression_image_get():
+    return Response(status_code=200, headers=Headers({"Content-Type": "image/png"}), description=COMPRESSIBLE_BODY)
+
+
+@app.get("/sync/compression/stream")
+def sync_compression_stream_get():
+    for _ in range(3):
+        yield COMPRESSIBLE_BODY
+
+
+if __name__ == "__main__":
+    app.enable_compression(min_size=1024, algorithms=["gzip", "br", "zstd"])
+    app.serve_directory(
+        route="/test_dir",
+        directory_path=os.path.join(current_file_path, "build"),
+        index_file="index.html",
+    )
+    app.start(port=8084, _check_port=False)
@@ -5,7 +5,7 @@ import signal
 import socket
 import subprocess
 import time
-from typing import List
+from typing import List, Optional
 
 import pytest
 
@@ -33,16 +33,18 @@ def kill_process(process: subprocess.Popen) -> None:
         pass
 
 
-def start_server(domain: str, port: int, is_dev: bool = False) -> subprocess.Popen:
+def start_server(domain: str, port: int, is_dev: bool = False, app_file: str = "base_routes.py", args: Optional[List[str]] = None) -> subprocess.Popen:
     """
     Call this method to wait for the server to start
     """
     # Start the server
     current_file_path = pathlib.Path(__file__).parent.resolve()
-    base_routes = os.path.join(current_file_path, "./base_routes.py")
+    base_routes = os.path.join(current_file_path, app_file)
     command = ["python3", base_routes]
     if is_dev:
         command.append("--dev")
+    if args:
+        command.extend(args)
     process = spawn_process(command)
 
     # Wait for the server to be reachable
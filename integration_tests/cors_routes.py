@@ -0,0 +1,24 @@
+"""
+An app that handles CORS, apart from the base routes so that the other tests
+see the responses without the CORS headers. With `ROBYN_ALLOW_CORS=true`, it
+uses the `ALLOW_CORS` helper instead of `configure_cors`.
+"""
+
+import os
+
+from robyn import ALLOW_CORS, Robyn
+
+app = Robyn(__file__)
+
+
+@app.get("/sync/str")
+def sync_str_get():
+    return "sync str get"
+
+
+if __name__ == "__main__":
+    if os.getenv("ROBYN_ALLOW_CORS") == "true":
+        ALLOW_CORS(app, ["http://robyn.test"])
+    else:
+        app.configure_cors(origins=["http://robyn.test", "http://other.test/"], expose_headers=["X-Robyn"], max_age=600)
+    app.start(port=8085, _check_port=False)
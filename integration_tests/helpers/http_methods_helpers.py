@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Union
 
 import requests
 
@@ -63,7 +63,7 @@ def post(
 
 def multipart_post(
     endpoint: str,
-    files: Optional[dict] = None,
+    files: Optional[Union[dict, list]] = None,
     expected_status_code: int = 200,
     should_check_response: bool = True,
 ) -> requests.Response:
@@ -71,7 +71,7 @@ def multipart_post(
     Makes a POST request to the given endpoint and checks the response.
 
     endpoint str: The endpoint to make the request to.
-    files Optional[dict]: The files to send with the request.
+    files Optional[Union[dict, list]]: The files to send with the request.
     expected_status_code int: The expected status code of the response.
     should_check_response bool: A boolean to indicate if the status code and headers should be checked.
     """
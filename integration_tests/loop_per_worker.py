@@ -0,0 +1,71 @@
+"""
+An app with async handlers, to benchmark the event loop they run on, with and without
+an event loop per worker (`ROBYN_LOOP_PER_WORKER`), and to check when their first step runs.
+"""
+
+import asyncio
+import itertools
+import threading
+
+from robyn import Request, Robyn
+
+app = Robyn(__file__)
+
+
+@app.get("/sync/thread")
+def sync_thread():
+    return str(threading.get_ident())
+
+
+@app.get("/async/thread")
+async def async_thread():
+    await asyncio.sleep(0)
+    return str(threading.get_ident())
+
+
+@app.get("/async/sleep")
+async def async_sleep():
+    await asyncio.sleep(0)
+    return "slept"
+
+
+@app.get("/async/timer")
+async def async_timer():
+    await asyncio.sleep(0.01)
+    return "slept"
+
+
+# Eager tasks
+
+eager_cache = {}
+eager_marks = {}
+eager_mark_ids = itertools.count()
+
+
+@app.before_request("/async/eager/:key")
+def eager_mark(request: Request):
+    # runs on the worker, its loop is the current one
+    loop = asyncio.get_event_loop()
+    mark_id = str(next(eager_mark_ids))
+    eager_marks[mark_id] = mark = []
+    # the mark is set one iteration of the loop after the handler is handed over to it
+    loop.call_soon(loop.call_soon, mark.append, True)
+    request.headers.set("x-eager-mark", mark_id)
+    return request
+
+
+@app.get("/async/eager/:key")
+async def async_eager(request: Request):
+    key = request.path_params["key"]
+    # still unset in a first step that runs as the handler is handed over
+    eager = not eager_marks.pop(request.headers.get("x-eager-mark"))
+    # a cache hit returns without suspending, and never gets scheduled on the loop
+    if key in eager_cache:
+        return f"cached {eager_cache[key]} {eager}"
+    await asyncio.sleep(0.01)
+    eager_cache[key] = key
+    return f"computed {key} {eager}"
+
+
+if __name__ == "__main__":
+    app.start(port=8083, _check_port=False)
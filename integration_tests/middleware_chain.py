@@ -0,0 +1,42 @@
+"""
+An app whose routes run behind a chain of `ROBYN_MIDDLEWARE_CHAIN` before and after middlewares,
+to benchmark the cost of a middleware against the number of middlewares.
+"""
+
+import os
+
+from robyn import Request, Response, Robyn
+
+app = Robyn(__file__)
+
+MIDDLEWARE_CHAIN = int(os.getenv("ROBYN_MIDDLEWARE_CHAIN", "0"))
+
+
+def add_middlewares(index: int) -> None:
+    @app.before_request()
+    def before_request(request: Request):
+        request.headers.set(f"before-{index}", "1")
+        return request
+
+    @app.after_request()
+    def after_request(response: Response):
+        response.headers.set(f"after-{index}", "1")
+        return response
+
+
+for index in range(MIDDLEWARE_CHAIN):
+    add_middlewares(index)
+
+
+@app.get("/sync/chain")
+def sync_chain(request: Request):
+    return str(sum(1 for index in range(MIDDLEWARE_CHAIN) if request.headers.get(f"before-{index}") == "1"))
+
+
+@app.get("/async/chain")
+async def async_chain(request: Request):
+    return str(sum(1 for index in range(MIDDLEWARE_CHAIN) if request.headers.get(f"before-{index}") == "1"))
+
+
+if __name__ == "__main__":
+    app.start(port=8082, _check_port=False)
@@ -0,0 +1,43 @@
+import os
+
+import pytest
+import requests
+
+from integration_tests.conftest import kill_process, start_server
+
+BASE_URL = "http://127.0.0.1:8085"
+
+
+@pytest.fixture(scope="module")
+def allow_cors_session():
+    os.environ["ROBYN_ALLOW_CORS"] = "true"
+    process = start_server("127.0.0.1", 8085, app_file="cors_routes.py")
+    yield
+    kill_process(process)
+    del os.environ["ROBYN_ALLOW_CORS"]
+
+
+@pytest.mark.benchmark
+def test_allow_cors_allowed_origin(allow_cors_session):
+    r = requests.get(f"{BASE_URL}/sync/str", headers={"Origin": "http://robyn.test"})
+    assert r.status_code == 200
+    assert r.headers.get("Access-Control-Allow-Origin") == "http://robyn.test"
+    assert r.headers.get("Access-Control-Allow-Credentials") == "true"
+    assert r.text == "sync str get"
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("method", ["get", "post", "options"])
+def test_allow_cors_disallowed_origin(method: str, allow_cors_session):
+    # the handler does not run, whatever the method of the request
+    r = requests.request(method, f"{BASE_URL}/sync/str", headers={"Origin": "http://evil.test"})
+    assert r.status_code == 403
+    assert "Access-Control-Allow-Origin" not in r.headers
+    assert r.text == ""
+
+
+@pytest.mark.benchmark
+def test_allow_cors_without_origin(allow_cors_session):
+    r = requests.get(f"{BASE_URL}/sync/str")
+    assert r.status_code == 200
+    assert r.text == "sync str get"
@@ -49,12 +49,14 @@ def test_allow_cors():
     app = Robyn(__file__)
     ALLOW_CORS(app, ["*"])
 
-    headers = Headers({})
-    headers.set("Access-Control-Allow-Origin", "*")
-    headers.set(
-        "Access-Control-Allow-Methods",
-        "GET, POST, PUT, DELETE, PATCH, HEAD, OPTIONS",
-    )
-    headers.set("Access-Control-Allow-Headers", "Content-Type, Authorization")
-    headers.set("Access-Control-Allow-Credentials", "true")
-    assert app.response_headers.get_headers() == headers.get_headers()
+    assert app.cors == {
+        "origins": ["*"],
+        "methods": ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"],
+        "headers": ["Content-Type", "Authorization"],
+        "expose_headers": [],
+        "allow_credentials": True,
+        "max_age": 3600,
+        "reject_disallowed": True,
+    }
+    # CORS is handled in Rust rather than with global response headers
+    assert app.response_headers.get_headers() == Headers({}).get_headers()
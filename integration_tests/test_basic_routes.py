@@ -64,6 +64,21 @@ def test_json_get(route: str, expected_json: dict, session):
         assert res.json()[key] == expected_json[key]
 
 
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    "route, expected_json",
+    [
+        ("/sync/json/list", [1, "two", {"three": 3.0}, None]),
+        ("/async/json/dataclass", {"name": "batman", "powers": ["money"]}),
+        ("/sync/json/typed_dict", {"name": "joker", "nemesis": {"name": "batman", "powers": ["money"]}}),
+    ],
+)
+def test_json_serialized_get(route: str, expected_json, session):
+    res = get(route)
+    assert res.headers["Content-Type"] == "application/json"
+    assert res.json() == expected_json
+
+
 @pytest.mark.benchmark
 @pytest.mark.parametrize(
     "route, expected_json",
@@ -97,3 +112,16 @@ def test_http_request_info_get(route: str, expected_json: dict, session):
     for key in expected_json.keys():
         assert key in res.json()
         assert res.json()[key] == expected_json[key]
+
+
+@pytest.mark.benchmark
+def test_global_response_header_override(session):
+    res = get("/sync/global_response_header/override", should_check_response=False)
+    assert res.status_code == 200
+    assert res.headers["server"] == "custom"
+
+
+@pytest.mark.benchmark
+def test_global_response_header_in_after_middleware(session):
+    res = get("/sync/global_response_header/after_middleware")
+    assert res.headers["server"] == "robyn after"
@@ -1,6 +1,6 @@
 import pytest
 
-from integration_tests.helpers.http_methods_helpers import get
+from integration_tests.helpers.http_methods_helpers import get, post
 
 BASE_URL = "http://127.0.0.1:8080"
 
@@ -19,3 +19,20 @@ def test_binary_output(route: str, text: str, session):
     r = get(route)
     assert r.headers.get("Content-Type") == "application/octet-stream"
     assert r.text == text
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("route", ["/sync/octet/memoryview", "/async/octet/bytearray", "/sync/octet/readonly_view"])
+def test_buffer_output(route: str, session):
+    r = get(route)
+    assert r.headers.get("Content-Type") == "application/octet-stream"
+    assert r.content == b"robyn" * 20000
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("route", ["/sync/raw_body", "/async/raw_body"])
+def test_raw_body(route: str, session):
+    body = bytes(range(256)) * 512
+    r = post(route, data=body)
+    assert r.headers.get("Content-Type") == "application/octet-stream"
+    assert r.content == body
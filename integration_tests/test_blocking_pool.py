@@ -0,0 +1,38 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from integration_tests.helpers.http_methods_helpers import get
+
+
+@pytest.mark.benchmark
+def test_blocking_pool_keeps_worker_free(session):
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        slow_requests = [executor.submit(get, "/sync/blocking_pool/slow") for _ in range(2)]
+        time.sleep(0.3)
+
+        start = time.perf_counter()
+        stats = get("/sync/blocking_pool/stats").json()
+        # the slow handlers run on the pool, the worker still answers the other routes
+        assert time.perf_counter() - start < 0.5
+        assert stats["size"] == 1
+        assert stats["active"] == 1
+        assert stats["queue_depth"] == 1
+
+        for slow_request in slow_requests:
+            assert slow_request.result().text == "slow"
+
+    stats = get("/sync/blocking_pool/stats").json()
+    assert stats["active"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["completed"] >= 2
+    assert stats["max_wait_time"] > 0.5
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("route", ["/sync/blocking_pool/stream", "/sync/blocking_pool/stream/async_middleware"])
+def test_blocking_pool_async_stream(route: str, session):
+    r = get(route)
+    assert r.headers.get("Content-Type") == "text/csv"
+    assert r.text == "0,pool\n1,pool\n2,pool\n"
@@ -0,0 +1,16 @@
+import pytest
+
+from integration_tests.helpers.http_methods_helpers import post
+
+
+@pytest.mark.benchmark
+def test_body_stream(session):
+    body = b"robyn" * 200_000
+    r = post("/async/body_stream", data=body)
+    assert r.text == str(len(body))
+
+
+def test_body_stream_is_not_buffered(session):
+    body = bytes(range(256)) * 64
+    r = post("/async/body_stream/request", data=body)
+    assert r.content == body
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from integration_tests.helpers.http_methods_helpers import post
+
+VALID_BODY = {
+    "name": {"first": "bruce", "second": "wayne", "initial": {"is_present": True}},
+    "description": "the dark knight",
+    "price": 10,
+    "tax": 0.5,
+}
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("route", ["/sync/body_validation", "/async/body_validation"])
+def test_valid_body(route: str, session):
+    res = post(route, json.dumps(VALID_BODY))
+    assert res.json() == {"first": "bruce", "is_present": True, "price": 10.0}
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("route", ["/sync/body_validation", "/async/body_validation"])
+def test_invalid_body(route: str, session):
+    body = {**VALID_BODY, "name": {"first": "bruce", "initial": {"is_present": "yes"}}, "price": "free"}
+    res = post(route, json.dumps(body), expected_status_code=422)
+    errors = res.json()["detail"]
+    assert [error["loc"] for error in errors] == [
+        ["body", "name", "second"],
+        ["body", "name", "initial", "is_present"],
+        ["body", "price"],
+    ]
+
+
+@pytest.mark.benchmark
+def test_invalid_json_body(session):
+    res = post("/sync/body_validation", '{"name": ', expected_status_code=422)
+    assert res.json()["detail"][0]["type"] == "json_invalid"
@@ -0,0 +1,114 @@
+import os
+
+import pytest
+import requests
+
+from integration_tests.conftest import kill_process, start_server
+
+BASE_URL = "http://127.0.0.1:8084"
+COMPRESSIBLE_BODY = "robyn compresses this body " * 100
+BUILD_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "build")
+
+
+@pytest.fixture(scope="module")
+def compression_session():
+    process = start_server("127.0.0.1", 8084, app_file="compressed_routes.py")
+    yield
+    kill_process(process)
+
+
+def get(endpoint: str, headers: dict) -> requests.Response:
+    return requests.get(f"{BASE_URL}{endpoint}", headers=headers)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("type_route", ["sync", "async"])
+def test_compression(type_route: str, compression_session):
+    r = get(f"/{type_route}/compression", headers={"Accept-Encoding": "gzip"})
+    assert r.headers.get("Content-Encoding") == "gzip"
+    assert "Accept-Encoding" in r.headers.get("Vary")
+    assert int(r.headers.get("Content-Length")) < len(COMPRESSIBLE_BODY)
+    assert r.text == COMPRESSIBLE_BODY
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("accept_encoding", ["gzip", "br", "zstd"])
+def test_large_body_compression(accept_encoding: str, compression_session):
+    # compressed on a blocking thread instead of the worker
+    r = get("/sync/compression/large", headers={"Accept-Encoding": accept_encoding})
+    assert r.headers.get("Content-Encoding") == accept_encoding
+    assert int(r.headers.get("Content-Length")) < len(COMPRESSIBLE_BODY)
+    if accept_encoding == "gzip":
+        assert r.text == COMPRESSIBLE_BODY * 30
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    "accept_encoding, content_encoding",
+    [
+        ("br", "br"),
+        ("zstd", "zstd"),
+        ("br;q=0.5, zstd;q=0.8", "zstd"),
+        ("br, gzip", "gzip"),
+        ("*", "gzip"),
+        ("gzip;q=0, br", "br"),
+        ("identity", None),
+        ("deflate", None),
+    ],
+)
+def test_compression_negotiation(accept_encoding: str, content_encoding: str, compression_session):
+    r = get("/sync/compression", headers={"Accept-Encoding": accept_encoding})
+    assert r.headers.get("Content-Encoding") == content_encoding
+
+
+@pytest.mark.benchmark
+def test_small_body_not_compressed(compression_session):
+    r = get("/sync/str", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in r.headers
+    assert r.text == "sync str get"
+
+
+@pytest.mark.benchmark
+def test_compressed_content_type_not_compressed(compression_session):
+    r = get("/sync/compression/image", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in r.headers
+    assert r.text == COMPRESSIBLE_BODY
+
+
+@pytest.mark.benchmark
+def test_stream_compression(compression_session):
+    r = get("/sync/compression/stream", headers={"Accept-Encoding": "gzip"})
+    assert r.headers.get("Content-Encoding") == "gzip"
+    assert r.headers.get("Transfer-Encoding") == "chunked"
+    assert r.text == COMPRESSIBLE_BODY * 3
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    "accept_encoding, content_encoding",
+    [("gzip", "gzip"), ("br", "br"), ("identity", None)],
+)
+def test_const_route_compression(accept_encoding: str, content_encoding: str, compression_session):
+    r = get("/sync/compression/const", headers={"Accept-Encoding": accept_encoding})
+    assert r.headers.get("Content-Encoding") == content_encoding
+    # every variant, the identity one included, varies on the header, and only once
+    assert r.headers.get("Vary").lower().count("accept-encoding") == 1
+    if content_encoding != "br":
+        assert r.text == COMPRESSIBLE_BODY
+
+
+@pytest.mark.benchmark
+def test_precompressed_static_file(compression_session):
+    with open(os.path.join(BUILD_DIRECTORY, "precompressed.txt")) as f:
+        content = f.read()
+
+    r = get("/test_dir/precompressed.txt", headers={"Accept-Encoding": "br, gzip"})
+    assert r.status_code == 200
+    assert r.headers.get("Content-Encoding") == "gzip"
+    assert r.headers.get("Content-Type").startswith("text/plain")
+    assert r.text == content
+
+    r = get("/test_dir/precompressed.txt", headers={"Accept-Encoding": "identity"})
+    assert r.status_code == 200
+    assert "Content-Encoding" not in r.headers
+    assert r.text == content
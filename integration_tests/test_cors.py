@@ -0,0 +1,53 @@
+import pytest
+import requests
+
+from integration_tests.conftest import kill_process, start_server
+
+BASE_URL = "http://127.0.0.1:8085"
+
+
+@pytest.fixture(scope="module")
+def cors_session():
+    process = start_server("127.0.0.1", 8085, app_file="cors_routes.py")
+    yield
+    kill_process(process)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("origin", ["http://robyn.test", "http://other.test"])
+def test_cors_preflight(origin: str, cors_session):
+    r = requests.options(
+        f"{BASE_URL}/sync/str",
+        headers={"Origin": origin, "Access-Control-Request-Method": "POST", "Access-Control-Request-Headers": "Content-Type"},
+    )
+    assert r.status_code == 204
+    assert r.headers.get("Access-Control-Allow-Origin") == origin
+    assert r.headers.get("Access-Control-Allow-Methods") == "GET, POST, PUT, DELETE, PATCH, HEAD, OPTIONS"
+    assert r.headers.get("Access-Control-Allow-Headers") == "Content-Type, Authorization"
+    assert r.headers.get("Access-Control-Max-Age") == "600"
+    assert "Origin" in r.headers.get("Vary")
+    assert r.text == ""
+
+
+@pytest.mark.benchmark
+def test_cors_preflight_disallowed_origin(cors_session):
+    r = requests.options(f"{BASE_URL}/sync/str", headers={"Origin": "http://evil.test", "Access-Control-Request-Method": "POST"})
+    assert r.status_code == 403
+    assert "Access-Control-Allow-Origin" not in r.headers
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("origin", ["http://robyn.test", "http://other.test"])
+def test_cors_origin_reflection(origin: str, cors_session):
+    r = requests.get(f"{BASE_URL}/sync/str", headers={"Origin": origin})
+    assert r.headers.get("Access-Control-Allow-Origin") == origin
+    assert r.headers.get("Access-Control-Expose-Headers") == "X-Robyn"
+    assert "Origin" in r.headers.get("Vary")
+    assert r.text == "sync str get"
+
+
+@pytest.mark.benchmark
+def test_cors_disallowed_origin(cors_session):
+    r = requests.get(f"{BASE_URL}/sync/str", headers={"Origin": "http://evil.test"})
+    assert "Access-Control-Allow-Origin" not in r.headers
+    assert "Origin" in r.headers.get("Vary")
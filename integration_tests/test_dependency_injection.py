@@ -17,6 +17,14 @@ def test_router_dependency_injection(benchmark):
     assert r.text == "ROUTER DEPENDENCY"
 
 
+@pytest.mark.benchmark
+@pytest.mark.parametrize("function_type", ["sync", "async"])
+def test_dependencies_only_injection(benchmark, function_type):
+    r = get(f"/{function_type}/dependencies_only_di")
+    assert r.status_code == 200
+    assert r.text == "GLOBAL DEPENDENCY ROUTER DEPENDENCY"
+
+
 @pytest.mark.benchmark
 def test_subrouter_global_dependency_injection(benchmark):
     r = get("/di_subrouter/subrouter_global_di")
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+import requests
+
+from integration_tests.conftest import kill_process, start_server
+
+BASE_URL = "http://127.0.0.1:8083"
+
+# asyncio can only start a task eagerly from Python 3.12, earlier versions schedule every handler
+EAGER = sys.version_info >= (3, 12)
+
+
+@pytest.fixture(scope="module")
+def worker_loop_session():
+    # on the loop of its worker, the first step of a handler runs as soon as it is handed over
+    os.environ["ROBYN_LOOP_PER_WORKER"] = "true"
+    process = start_server("127.0.0.1", 8083, app_file="loop_per_worker.py")
+    yield
+    kill_process(process)
+    del os.environ["ROBYN_LOOP_PER_WORKER"]
+
+
+@pytest.mark.benchmark
+def test_async_handler_that_awaits(worker_loop_session):
+    # the handler runs up to its first await before the loop goes on with anything else
+    assert requests.get(f"{BASE_URL}/async/eager/awaits").text == f"computed awaits {EAGER}"
+
+
+@pytest.mark.benchmark
+def test_async_handler_that_returns_without_awaiting(worker_loop_session):
+    requests.get(f"{BASE_URL}/async/eager/returns")
+    # the second request hits the cache of the handler and completes in its first step
+    assert requests.get(f"{BASE_URL}/async/eager/returns").text == f"cached returns {EAGER}"
@@ -0,0 +1,28 @@
+import pytest
+
+from integration_tests.helpers.http_methods_helpers import get
+
+
+@pytest.mark.benchmark
+def test_etag_not_modified(session):
+    r = get("/sync/etag")
+    etag = r.headers.get("ETag")
+    assert etag is not None
+    assert get("/sync/etag").headers.get("ETag") == etag
+
+    r = get("/sync/etag", expected_status_code=304, headers={"If-None-Match": etag})
+    assert r.headers.get("ETag") == etag
+    assert r.content == b""
+
+    r = get("/sync/etag", headers={"If-None-Match": '"stale"'})
+    assert r.json() == {"items": list(range(100))}
+
+
+def test_etag_from_handler(session):
+    r = get("/sync/etag/custom")
+    assert r.headers.get("ETag") == '"v1"'
+    get("/sync/etag/custom", expected_status_code=304, headers={"If-None-Match": 'W/"v1"'})
+
+
+def test_etag_is_opt_in(session):
+    assert get("/sync/octet").headers.get("ETag") is None
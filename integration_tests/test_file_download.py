@@ -10,3 +10,21 @@ def test_file_download(function_type: str, session):
     assert r.headers.get("Content-Disposition") == "attachment; filename=test.txt"
 
     assert r.text == "This is a test file for the downloading purpose"
+
+
+@pytest.mark.parametrize("function_type", ["sync", "async"])
+def test_file_download_range(function_type: str, session):
+    r = get(f"/{function_type}/file/download", expected_status_code=206, headers={"Range": "bytes=0-3"})
+    assert r.headers.get("Content-Range") == "bytes 0-3/47"
+    assert r.text == "This"
+
+
+@pytest.mark.parametrize("function_type", ["sync", "async"])
+def test_file_download_conditional(function_type: str, session):
+    etag = get(f"/{function_type}/file/download").headers.get("ETag")
+    last_modified = get(f"/{function_type}/file/download").headers.get("Last-Modified")
+
+    r = get(f"/{function_type}/file/download", expected_status_code=304, headers={"If-None-Match": etag})
+    assert r.text == ""
+    r = get(f"/{function_type}/file/download", expected_status_code=304, headers={"If-Modified-Since": last_modified})
+    assert r.text == ""
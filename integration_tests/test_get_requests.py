@@ -54,6 +54,18 @@ def test_queries(function_type: str, session):
     assert r.json() == {}
 
 
+@pytest.mark.benchmark
+def test_queries_decoded_and_typed(session):
+    r = get("/sync/queries?q=hello+world%21&name=J%C3%B6rg")
+    assert r.json() == {"q": ["hello world!"], "name": ["Jörg"]}
+
+    r = get("/sync/queries/typed?page=3&debug=true&tags=a,b&tags=c&q=a%20b")
+    assert r.json() == {"page": 3, "debug": True, "tags": ["a", "b", "c"], "q": "a b"}
+
+    r = get("/sync/queries/typed")
+    assert r.json() == {"page": 1, "debug": False, "tags": [], "q": None}
+
+
 @pytest.mark.benchmark
 def test_trailing_slash(session):
     r = requests.get("http://localhost:8080/trailing")  # `integration_tests#get` strips the trailing slash, tests always pass!`
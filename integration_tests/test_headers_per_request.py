@@ -0,0 +1,19 @@
+import pytest
+
+from integration_tests.helpers.http_methods_helpers import get
+
+HEADER_COUNTS = [10, 30, 100]
+# actix refuses the requests with more than 96 headers
+MAX_REQUEST_HEADERS = 90
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", HEADER_COUNTS)
+def test_headers_per_request(count: int, session):
+    request_count = min(count, MAX_REQUEST_HEADERS)
+    headers = {f"X-Request-{index}": f"value-{index}" for index in range(request_count)}
+    r = get(f"/sync/headers/{count}", headers=headers)
+    # along with the headers that requests adds itself
+    assert int(r.text) >= request_count
+    for index in range(count):
+        assert r.headers.get(f"X-Response-{index}") == f"value-{index}"
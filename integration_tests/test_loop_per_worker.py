@@ -0,0 +1,45 @@
+import os
+
+import pytest
+import requests
+
+from integration_tests.conftest import kill_process, start_server
+
+BASE_URL = "http://127.0.0.1:8083"
+
+
+@pytest.fixture(scope="module", params=["false", "true"], ids=["shared_loop", "loop_per_worker"])
+def loop_per_worker(request):
+    os.environ["ROBYN_LOOP_PER_WORKER"] = request.param
+    process = start_server("127.0.0.1", 8083, app_file="loop_per_worker.py", args=["--workers", "2"])
+    yield request.param == "true"
+    kill_process(process)
+    del os.environ["ROBYN_LOOP_PER_WORKER"]
+
+
+@pytest.fixture
+def client(loop_per_worker: bool):
+    # a keep-alive connection, served by a single worker
+    with requests.Session() as client:
+        yield client
+
+
+def test_async_handler_runs_on_the_worker(loop_per_worker: bool, client: requests.Session):
+    sync_thread = client.get(f"{BASE_URL}/sync/thread").text
+    async_thread = client.get(f"{BASE_URL}/async/thread").text
+    # the worker runs its loop itself, the shared loop runs on the main thread
+    assert (async_thread == sync_thread) == loop_per_worker
+
+
+@pytest.mark.benchmark
+def test_async_sleep_latency(benchmark, client: requests.Session):
+    r = benchmark(client.get, f"{BASE_URL}/async/sleep")
+    assert r.status_code == 200
+    assert r.text == "slept"
+
+
+@pytest.mark.benchmark
+def test_async_timer_latency(benchmark, client: requests.Session):
+    r = benchmark(client.get, f"{BASE_URL}/async/timer")
+    assert r.status_code == 200
+    assert r.text == "slept"
@@ -0,0 +1,27 @@
+import os
+
+import pytest
+import requests
+
+from integration_tests.conftest import kill_process, start_server
+
+BASE_URL = "http://127.0.0.1:8082"
+
+
+@pytest.fixture(scope="module", params=[0, 1, 2, 3, 4, 5])
+def middleware_chain(request):
+    os.environ["ROBYN_MIDDLEWARE_CHAIN"] = str(request.param)
+    process = start_server("127.0.0.1", 8082, app_file="middleware_chain.py")
+    yield request.param
+    kill_process(process)
+    del os.environ["ROBYN_MIDDLEWARE_CHAIN"]
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("function_type", ["sync", "async"])
+def test_middleware_chain(function_type: str, middleware_chain: int):
+    r = requests.get(f"{BASE_URL}/{function_type}/chain")
+    assert r.status_code == 200
+    assert r.text == str(middleware_chain)
+    for index in range(middleware_chain):
+        assert r.headers.get(f"after-{index}") == "1"
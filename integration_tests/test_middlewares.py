@@ -28,3 +28,11 @@ def test_global_middleware(session):
 def test_response_in_before_middleware(session):
     r = get("/sync/middlewares/401", should_check_response=False)
     assert r.status_code == 401
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("id, after", [("special", "special_path"), ("other", None)])
+def test_middleware_on_path_of_route_with_params(id: str, after: str, session):
+    r = get(f"/sync/middlewares/path/{id}")
+    assert r.headers.get("after") == after
+    assert r.text == id
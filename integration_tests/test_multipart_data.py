@@ -15,3 +15,20 @@ def test_form_data(function_type: str, session):
 def test_multipart_file(function_type: str, session):
     res = multipart_post(f"/{function_type}/multipart-file", files={"hello": "world"})
     assert "hello" in res.text
+
+
+@pytest.mark.benchmark
+def test_multipart_uploads(session):
+    small_file = b"x" * 10
+    large_file = b"x" * (2 * 1024 * 1024)
+    res = multipart_post(
+        "/sync/multipart-uploads",
+        files=[
+            ("first", ("report.csv", small_file, "text/csv")),
+            ("second", ("report.csv", large_file, "text/csv")),
+        ],
+    )
+    assert res.json()["uploads"] == [
+        {"name": "first", "filename": "report.csv", "content_type": "text/csv", "size": len(small_file), "spooled": False, "valid": True},
+        {"name": "second", "filename": "report.csv", "content_type": "text/csv", "size": len(large_file), "spooled": True, "valid": True},
+    ]
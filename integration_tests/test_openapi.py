@@ -30,6 +30,7 @@ def test_docs_handler():
     # provided we are excluding headers for /docs and /openapi.json
     html_response = get("/docs", should_check_response=False)
     assert html_response.status_code == 200
+    assert "server" not in html_response.headers
 
 
 @pytest.mark.benchmark
@@ -0,0 +1,51 @@
+import uuid
+
+import pytest
+
+from integration_tests.helpers.http_methods_helpers import get, post
+
+
+@pytest.mark.benchmark
+def test_rate_limit(session):
+    headers = {"X-Api-Key": str(uuid.uuid4())}
+    for _ in range(2):
+        r = get("/sync/rate_limit", headers=headers)
+        assert r.text == "not limited"
+
+    r = get("/sync/rate_limit", headers=headers, expected_status_code=429, should_check_response=False)
+    assert r.status_code == 429
+    assert r.text == "Too Many Requests"
+    assert 1 <= int(r.headers.get("Retry-After")) <= 30
+
+
+@pytest.mark.benchmark
+def test_rate_limit_burst(session):
+    headers = {"X-Api-Key": str(uuid.uuid4())}
+    for _ in range(3):
+        r = post("/async/rate_limit", headers=headers)
+        assert r.text == "not limited"
+
+    r = post("/async/rate_limit", headers=headers, expected_status_code=429, should_check_response=False)
+    assert r.status_code == 429
+    assert int(r.headers.get("Retry-After")) <= 60
+
+
+@pytest.mark.benchmark
+def test_rate_limit_per_key(session):
+    limited = {"X-Api-Key": str(uuid.uuid4())}
+    for _ in range(2):
+        get("/sync/rate_limit", headers=limited)
+    get("/sync/rate_limit", headers=limited, expected_status_code=429, should_check_response=False)
+
+    r = get("/sync/rate_limit", headers={"X-Api-Key": str(uuid.uuid4())})
+    assert r.text == "not limited"
+
+
+@pytest.mark.benchmark
+def test_rate_limit_other_routes(session):
+    headers = {"X-Api-Key": str(uuid.uuid4())}
+    for _ in range(3):
+        get("/sync/rate_limit", headers=headers, should_check_response=False)
+
+    r = get("/sync/str", headers=headers)
+    assert r.status_code == 200
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from integration_tests.helpers.http_methods_helpers import post
@@ -16,3 +18,16 @@ from integration_tests.helpers.http_methods_helpers import post
 def test_request(route, body, expected_result):
     res = post(route, body)
     assert res.text == expected_result
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    "body, expected_type",
+    [
+        ('{"list": [1, 2.5, "three"], "nested": {"flag": true, "empty": null}}', "dict"),
+        ('[{"id": 1}, {"id": 2}]', "list"),
+    ],
+)
+def test_request_json_native_types(body, expected_type):
+    res = post("/sync/request_json/nested", body)
+    assert res.json() == {"type": expected_type, "json": json.loads(body)}
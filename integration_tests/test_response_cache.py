@@ -0,0 +1,15 @@
+from integration_tests.helpers.http_methods_helpers import get
+
+
+def test_response_cache(session):
+    first = get("/sync/cache/items/1?page=2").text
+    assert get("/sync/cache/items/1?page=2").text == first
+    # query params that are not part of the key are ignored
+    assert get("/sync/cache/items/1?page=2&utm=robyn").text == first
+
+    assert get("/sync/cache/items/1?page=3").text != first
+    assert get("/sync/cache/items/2?page=2").text != first
+    assert get("/sync/cache/items/1?page=2", headers={"Accept": "text/csv"}).text != first
+
+    stats = get("/sync/cache/stats").json()
+    assert stats == {"hits": 2, "misses": 4}
@@ -0,0 +1,20 @@
+import pytest
+
+from integration_tests.helpers.http_methods_helpers import get
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("type_route", ["sync", "async"])
+def test_stream_generator(type_route: str, session):
+    r = get(f"/{type_route}/stream")
+    assert r.headers.get("Content-Type") == "application/octet-stream"
+    assert r.headers.get("Transfer-Encoding") == "chunked"
+    assert r.text == "".join(f"{type_route} chunk {i}\n" for i in range(3))
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("type_route", ["sync", "async"])
+def test_streaming_response(type_route: str, session):
+    r = get(f"/{type_route}/stream/response", expected_status_code=201)
+    assert r.headers.get("Content-Type") == "text/csv"
+    assert r.text == "0,robyn\n1,robyn\n2,robyn\n"
@@ -4,7 +4,7 @@ import os
 import socket
 from abc import ABC
 from pathlib import Path
-from typing import Callable, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
 
 import multiprocess as mp  # type: ignore
 
@@ -19,14 +19,29 @@ from robyn.logger import Colors, logger
 from robyn.openapi import OpenAPI
 from robyn.processpool import run_processes
 from robyn.reloader import compile_rust_files
-from robyn.responses import html, serve_file, serve_html
-from robyn.robyn import FunctionInfo, Headers, HttpMethod, Request, Response, WebSocketConnector, get_version
+from robyn.responses import StreamingResponse, html, serve_file, serve_html
+from robyn.robyn import (
+    BlockingPool,
+    BodyStream,
+    Cache,
+    FunctionInfo,
+    Headers,
+    HttpMethod,
+    RateLimit,
+    Request,
+    Response,
+    UploadFile,
+    WebSocketConnector,
+    get_version,
+)
 from robyn.router import MiddlewareRouter, MiddlewareType, Router, WebSocketRouter
 from robyn.types import Directory
 from robyn.ws import WebSocket
 
 __version__ = get_version()
 
+SUPPORTED_COMPRESSION_ALGORITHMS = ("br", "zstd", "gzip")
+
 
 config = Config()
 
@@ -75,6 +90,11 @@ class BaseRobyn(ABC):
         self.request_headers: Headers = Headers({})
         self.response_headers: Headers = Headers({})
         self.excluded_response_headers_paths: Optional[List[str]] = None
+        self.etag = False
+        self.compression: Optional[Dict[str, Any]] = None
+        self.cors: Optional[Dict[str, Any]] = None
+        self.global_rate_limit: Optional[RateLimit] = None
+        self.global_blocking_pool: Optional[BlockingPool] = None
         self.directories: List[Directory] = []
         self.event_handlers: dict = {}
         self.exception_handler: Optional[Callable] = None
@@ -115,6 +135,10 @@ class BaseRobyn(ABC):
         auth_required: bool = False,
         openapi_name: str = "",
         openapi_tags: Union[List[str], None] = None,
+        cache: Optional[Cache] = None,
+        etag: bool = False,
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
     ):
         """
         Connect a URI to a handler
@@ -124,6 +148,10 @@ class BaseRobyn(ABC):
         :param handler function: represents the sync or async function passed as a handler for the route
         :param is_const bool: represents if the handler is a const function or not
         :param auth_required bool: represents if the route needs authentication or not
+        :param cache Optional[Cache]: caches the responses of the route
+        :param etag bool: adds an ETag to the responses of the route and answers conditional requests
+        :param rate_limit Optional[RateLimit]: limits the requests to the route
+        :param blocking_pool Optional[BlockingPool]: runs the sync handler on the pool instead of the server worker
         """
 
         """ We will add the status code here only
@@ -157,6 +185,10 @@ class BaseRobyn(ABC):
             openapi_tags=list_openapi_tags,
             exception_handler=self.exception_handler,
             injected_dependencies=injected_dependencies,
+            cache=cache,
+            etag=etag,
+            rate_limit=rate_limit,
+            blocking_pool=blocking_pool,
         )
 
         logger.info("Added route %s %s", route_type, endpoint)
@@ -228,11 +260,97 @@ class BaseRobyn(ABC):
 
     def exclude_response_headers_for(self, excluded_response_headers_paths: Optional[List[str]]):
         """
-        To exclude response headers from certain routes
+        To exclude the global response headers from certain routes, the headers set by the handlers are kept
         @param exclude_paths: the paths to exclude response headers from
         """
         self.excluded_response_headers_paths = excluded_response_headers_paths
 
+    def enable_etag(self, enabled: bool = True):
+        """
+        Adds an ETag, hashed from the body unless the handler set one, to the GET responses of every route
+        and answers the conditional requests with a bodyless 304 Not Modified.
+        Use the etag argument of the route decorators to enable them for a single route.
+
+        @param enabled: whether the ETags are enabled
+        """
+        self.etag = enabled
+
+    def enable_compression(self, min_size: int = 1024, algorithms: Sequence[str] = ("br", "zstd", "gzip"), level: Optional[int] = None):
+        """
+        Compresses the responses of every route with the first of the algorithms accepted by the client,
+        negotiated on the Accept-Encoding header. Bodies smaller than min_size and already compressed
+        content types (images, video, audio, archives) are sent as is, streamed bodies are compressed chunk by chunk.
+        Bodies of 64 KiB and more are compressed on a blocking thread, the smaller ones and the chunks on the server worker.
+
+        @param min_size: the size in bytes under which a body is not compressed
+        @param algorithms: the supported algorithms, out of "br", "zstd" and "gzip", in order of preference
+        @param level: the compression level, each algorithm uses a fast default if None
+        """
+        unsupported = [algorithm for algorithm in algorithms if algorithm not in SUPPORTED_COMPRESSION_ALGORITHMS]
+        if unsupported or not algorithms:
+            raise ValueError(f"Unsupported compression algorithms {unsupported}, expected some of {SUPPORTED_COMPRESSION_ALGORITHMS}")
+        self.compression = {"min_size": min_size, "algorithms": list(algorithms), "level": level}
+
+    def configure_cors(
+        self,
+        origins: Union[List[str], str] = "*",
+        methods: List[str] = ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"],
+        headers: List[str] = ["Content-Type", "Authorization"],
+        expose_headers: List[str] = [],
+        allow_credentials: bool = False,
+        max_age: Optional[int] = None,
+        reject_disallowed: bool = False,
+    ):
+        """
+        Handles CORS in Rust, without calling Python: the preflight requests are answered with a 204
+        and the responses to an allowed origin get the Access-Control-Allow-* headers.
+        With several origins the one of the request is reflected, along with a Vary: Origin header.
+
+        @param origins: the allowed origins, or "*" for all of them
+        @param methods: the methods allowed in the preflight responses
+        @param headers: the request headers allowed in the preflight responses, "*" reflects the requested ones
+        @param expose_headers: the response headers readable by the browser scripts
+        @param allow_credentials: whether the requests can include cookies and authorization headers
+        @param max_age: for how many seconds the browsers can cache the preflight responses
+        @param reject_disallowed: answers every request from a disallowed origin with a 403, instead of serving it without the CORS headers
+        """
+        if isinstance(origins, str):
+            origins = [origins]
+        self.cors = {
+            "origins": list(origins),
+            "methods": list(methods),
+            "headers": list(headers),
+            "expose_headers": list(expose_headers),
+            "allow_credentials": allow_credentials,
+            "max_age": max_age,
+            "reject_disallowed": reject_disallowed,
+        }
+
+    def rate_limit(self, rate: int, per: float = 1.0, burst: Optional[int] = None, key: str = "ip"):
+        """
+        Limits the requests to every route in Rust, before any Python runs: the requests over the limit
+        get a 429 Too Many Requests with a Retry-After header. The counters are shared by the processes of the server.
+        Use the rate_limit argument of the route decorators, e.g. rate_limit=RateLimit(rate=10, per=60), to limit a single route.
+
+        @param rate: the number of requests allowed every `per` seconds
+        @param per: the period of the rate, in seconds
+        @param burst: the number of requests allowed at once, rate if None
+        @param key: what the requests are counted by, "ip" or a header, e.g. "header:X-Api-Key"
+        """
+        self.global_rate_limit = RateLimit(rate=rate, per=per, burst=burst, key=key)
+
+    def blocking_pool(self, size: int) -> BlockingPool:
+        """
+        Runs the sync handlers, along with their sync middlewares, on a pool of at most `size` threads
+        instead of the server workers, so that a slow sync handler does not stall the other requests.
+        Use the blocking_pool argument of the route decorators, e.g. blocking_pool=BlockingPool(size=4), to give a route its own pool.
+
+        @param size: the number of handlers that run at once, the others wait for a thread in a queue
+        @return: the pool, whose queue_depth, wait_time and max_wait_time attributes tell how busy it is
+        """
+        self.global_blocking_pool = BlockingPool(size)
+        return self.global_blocking_pool
+
     def add_web_socket(self, endpoint: str, ws: WebSocket) -> None:
         self.web_socket_router.add_route(endpoint, ws)
 
@@ -293,6 +411,10 @@ class BaseRobyn(ABC):
         auth_required: bool = False,
         openapi_name: str = "",
         openapi_tags: List[str] = ["get"],
+        cache: Optional[Cache] = None,
+        etag: bool = False,
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
     ):
         """
         The @app.get decorator to add a route with the GET method
@@ -302,10 +424,14 @@ class BaseRobyn(ABC):
         :param auth_required bool: represents if the route needs authentication or not
         :param openapi_name: str -- the name of the endpoint in the openapi spec
         :param openapi_tags: List[str] -- for grouping of endpoints in the openapi spec
+        :param cache: Optional[Cache] -- caches the responses per path, query params and headers, e.g. Cache(ttl=30)
+        :param etag: bool -- adds an ETag to the responses and answers conditional requests with a 304
+        :param rate_limit: Optional[RateLimit] -- limits the requests to the route, e.g. RateLimit(rate=10, per=60)
+        :param blocking_pool: Optional[BlockingPool] -- runs the sync handler on a bounded thread pool, e.g. BlockingPool(size=4)
         """
 
         def inner(handler):
-            return self.add_route(HttpMethod.GET, endpoint, handler, const, auth_required, openapi_name, openapi_tags)
+            return self.add_route(HttpMethod.GET, endpoint, handler, const, auth_required, openapi_name, openapi_tags, cache, etag, rate_limit, blocking_pool)
 
         return inner
 
@@ -315,6 +441,8 @@ class BaseRobyn(ABC):
         auth_required: bool = False,
         openapi_name: str = "",
         openapi_tags: List[str] = ["post"],
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
     ):
         """
         The @app.post decorator to add a route with POST method
@@ -323,10 +451,21 @@ class BaseRobyn(ABC):
         :param auth_required bool: represents if the route needs authentication or not
         :param openapi_name: str -- the name of the endpoint in the openapi spec
         :param openapi_tags: List[str] -- for grouping of endpoints in the openapi spec
+        :param rate_limit: Optional[RateLimit] -- limits the requests to the route, e.g. RateLimit(rate=10, per=60)
+        :param blocking_pool: Optional[BlockingPool] -- runs the sync handler on a bounded thread pool, e.g. BlockingPool(size=4)
         """
 
         def inner(handler):
-            return self.add_route(HttpMethod.POST, endpoint, handler, auth_required=auth_required, openapi_name=openapi_name, openapi_tags=openapi_tags)
+            return self.add_route(
+                HttpMethod.POST,
+                endpoint,
+                handler,
+                auth_required=auth_required,
+                openapi_name=openapi_name,
+                openapi_tags=openapi_tags,
+                rate_limit=rate_limit,
+                blocking_pool=blocking_pool,
+            )
 
         return inner
 
@@ -336,6 +475,8 @@ class BaseRobyn(ABC):
         auth_required: bool = False,
         openapi_name: str = "",
         openapi_tags: List[str] = ["put"],
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
     ):
         """
         The @app.put decorator to add a get route with PUT method
@@ -344,10 +485,21 @@ class BaseRobyn(ABC):
         :param auth_required bool: represents if the route needs authentication or not
         :param openapi_name: str -- the name of the endpoint in the openapi spec
         :param openapi_tags: List[str] -- for grouping of endpoints in the openapi spec
+        :param rate_limit: Optional[RateLimit] -- limits the requests to the route, e.g. RateLimit(rate=10, per=60)
+        :param blocking_pool: Optional[BlockingPool] -- runs the sync handler on a bounded thread pool, e.g. BlockingPool(size=4)
         """
 
         def inner(handler):
-            return self.add_route(HttpMethod.PUT, endpoint, handler, auth_required=auth_required, openapi_name=openapi_name, openapi_tags=openapi_tags)
+            return self.add_route(
+                HttpMethod.PUT,
+                endpoint,
+                handler,
+                auth_required=auth_required,
+                openapi_name=openapi_name,
+                openapi_tags=openapi_tags,
+                rate_limit=rate_limit,
+                blocking_pool=blocking_pool,
+            )
 
         return inner
 
@@ -357,6 +509,8 @@ class BaseRobyn(ABC):
         auth_required: bool = False,
         openapi_name: str = "",
         openapi_tags: List[str] = ["delete"],
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
     ):
         """
         The @app.delete decorator to add a route with DELETE method
@@ -365,10 +519,21 @@ class BaseRobyn(ABC):
         :param auth_required bool: represents if the route needs authentication or not
         :param openapi_name: str -- the name of the endpoint in the openapi spec
         :param openapi_tags: List[str] -- for grouping of endpoints in the openapi spec
+        :param rate_limit: Optional[RateLimit] -- limits the requests to the route, e.g. RateLimit(rate=10, per=60)
+        :param blocking_pool: Optional[BlockingPool] -- runs the sync handler on a bounded thread pool, e.g. BlockingPool(size=4)
         """
 
         def inner(handler):
-            return self.add_route(HttpMethod.DELETE, endpoint, handler, auth_required=auth_required, openapi_name=openapi_name, openapi_tags=openapi_tags)
+            return self.add_route(
+                HttpMethod.DELETE,
+                endpoint,
+                handler,
+                auth_required=auth_required,
+                openapi_name=openapi_name,
+                openapi_tags=openapi_tags,
+                rate_limit=rate_limit,
+                blocking_pool=blocking_pool,
+            )
 
         return inner
 
@@ -378,6 +543,8 @@ class BaseRobyn(ABC):
         auth_required: bool = False,
         openapi_name: str = "",
         openapi_tags: List[str] = ["patch"],
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
     ):
         """
         The @app.patch decorator to add a route with PATCH method
@@ -386,10 +553,21 @@ class BaseRobyn(ABC):
         :param auth_required bool: represents if the route needs authentication or not
         :param openapi_name: str -- the name of the endpoint in the openapi spec
         :param openapi_tags: List[str] -- for grouping of endpoints in the openapi spec
+        :param rate_limit: Optional[RateLimit] -- limits the requests to the route, e.g. RateLimit(rate=10, per=60)
+        :param blocking_pool: Optional[BlockingPool] -- runs the sync handler on a bounded thread pool, e.g. BlockingPool(size=4)
         """
 
         def inner(handler):
-            return self.add_route(HttpMethod.PATCH, endpoint, handler, auth_required=auth_required, openapi_name=openapi_name, openapi_tags=openapi_tags)
+            return self.add_route(
+                HttpMethod.PATCH,
+                endpoint,
+                handler,
+                auth_required=auth_required,
+                openapi_name=openapi_name,
+                openapi_tags=openapi_tags,
+                rate_limit=rate_limit,
+                blocking_pool=blocking_pool,
+            )
 
         return inner
 
@@ -399,6 +577,8 @@ class BaseRobyn(ABC):
         auth_required: bool = False,
         openapi_name: str = "",
         openapi_tags: List[str] = ["head"],
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
     ):
         """
         The @app.head decorator to add a route with HEAD method
@@ -407,10 +587,21 @@ class BaseRobyn(ABC):
         :param auth_required bool: represents if the route needs authentication or not
         :param openapi_name: str -- the name of the endpoint in the openapi spec
         :param openapi_tags: List[str] -- for grouping of endpoints in the openapi spec
+        :param rate_limit: Optional[RateLimit] -- limits the requests to the route, e.g. RateLimit(rate=10, per=60)
+        :param blocking_pool: Optional[BlockingPool] -- runs the sync handler on a bounded thread pool, e.g. BlockingPool(size=4)
         """
 
         def inner(handler):
-            return self.add_route(HttpMethod.HEAD, endpoint, handler, auth_required=auth_required, openapi_name=openapi_name, openapi_tags=openapi_tags)
+            return self.add_route(
+                HttpMethod.HEAD,
+                endpoint,
+                handler,
+                auth_required=auth_required,
+                openapi_name=openapi_name,
+                openapi_tags=openapi_tags,
+                rate_limit=rate_limit,
+                blocking_pool=blocking_pool,
+            )
 
         return inner
 
@@ -420,6 +611,8 @@ class BaseRobyn(ABC):
         auth_required: bool = False,
         openapi_name: str = "",
         openapi_tags: List[str] = ["options"],
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
     ):
         """
         The @app.options decorator to add a route with OPTIONS method
@@ -428,10 +621,21 @@ class BaseRobyn(ABC):
         :param auth_required bool: represents if the route needs authentication or not
         :param openapi_name: str -- the name of the endpoint in the openapi spec
         :param openapi_tags: List[str] -- for grouping of endpoints in the openapi spec
+        :param rate_limit: Optional[RateLimit] -- limits the requests to the route, e.g. RateLimit(rate=10, per=60)
+        :param blocking_pool: Optional[BlockingPool] -- runs the sync handler on a bounded thread pool, e.g. BlockingPool(size=4)
         """
 
         def inner(handler):
-            return self.add_route(HttpMethod.OPTIONS, endpoint, handler, auth_required=auth_required, openapi_name=openapi_name, openapi_tags=openapi_tags)
+            return self.add_route(
+                HttpMethod.OPTIONS,
+                endpoint,
+                handler,
+                auth_required=auth_required,
+                openapi_name=openapi_name,
+                openapi_tags=openapi_tags,
+                rate_limit=rate_limit,
+                blocking_pool=blocking_pool,
+            )
 
         return inner
 
@@ -441,6 +645,8 @@ class BaseRobyn(ABC):
         auth_required: bool = False,
         openapi_name: str = "",
         openapi_tags: List[str] = ["connect"],
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
     ):
         """
         The @app.connect decorator to add a route with CONNECT method
@@ -449,10 +655,21 @@ class BaseRobyn(ABC):
         :param auth_required bool: represents if the route needs authentication or not
         :param openapi_name: str -- the name of the endpoint in the openapi spec
         :param openapi_tags: List[str] -- for grouping of endpoints in the openapi spec
+        :param rate_limit: Optional[RateLimit] -- limits the requests to the route, e.g. RateLimit(rate=10, per=60)
+        :param blocking_pool: Optional[BlockingPool] -- runs the sync handler on a bounded thread pool, e.g. BlockingPool(size=4)
         """
 
         def inner(handler):
-            return self.add_route(HttpMethod.CONNECT, endpoint, handler, auth_required=auth_required, openapi_name=openapi_name, openapi_tags=openapi_tags)
+            return self.add_route(
+                HttpMethod.CONNECT,
+                endpoint,
+                handler,
+                auth_required=auth_required,
+                openapi_name=openapi_name,
+                openapi_tags=openapi_tags,
+                rate_limit=rate_limit,
+                blocking_pool=blocking_pool,
+            )
 
         return inner
 
@@ -462,6 +679,8 @@ class BaseRobyn(ABC):
         auth_required: bool = False,
         openapi_name: str = "",
         openapi_tags: List[str] = ["trace"],
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
     ):
         """
         The @app.trace decorator to add a route with TRACE method
@@ -470,10 +689,21 @@ class BaseRobyn(ABC):
         :param auth_required bool: represents if the route needs authentication or not
         :param openapi_name: str -- the name of the endpoint in the openapi spec
         :param openapi_tags: List[str] -- for grouping of endpoints in the openapi spec
+        :param rate_limit: Optional[RateLimit] -- limits the requests to the route, e.g. RateLimit(rate=10, per=60)
+        :param blocking_pool: Optional[BlockingPool] -- runs the sync handler on a bounded thread pool, e.g. BlockingPool(size=4)
         """
 
         def inner(handler):
-            return self.add_route(HttpMethod.TRACE, endpoint, handler, auth_required=auth_required, openapi_name=openapi_name, openapi_tags=openapi_tags)
+            return self.add_route(
+                HttpMethod.TRACE,
+                endpoint,
+                handler,
+                auth_required=auth_required,
+                openapi_name=openapi_name,
+                openapi_tags=openapi_tags,
+                rate_limit=rate_limit,
+                blocking_pool=blocking_pool,
+            )
 
         return inner
 
@@ -557,6 +787,11 @@ class Robyn(BaseRobyn):
             self.response_headers,
             self.excluded_response_headers_paths,
             open_browser,
+            self.etag,
+            self.compression,
+            self.cors,
+            self.global_rate_limit,
+            self.global_blocking_pool,
         )
 
 
@@ -568,29 +803,155 @@ class SubRouter(BaseRobyn):
     def __add_prefix(self, endpoint: str):
         return f"{self.prefix}{endpoint}"
 
-    def get(self, endpoint: str, const: bool = False, auth_required: bool = False, openapi_name: str = "", openapi_tags: List[str] = ["get"]):
-        return super().get(endpoint=self.__add_prefix(endpoint), const=const, auth_required=auth_required, openapi_name=openapi_name, openapi_tags=openapi_tags)
+    def get(
+        self,
+        endpoint: str,
+        const: bool = False,
+        auth_required: bool = False,
+        openapi_name: str = "",
+        openapi_tags: List[str] = ["get"],
+        cache: Optional[Cache] = None,
+        etag: bool = False,
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
+    ):
+        return super().get(
+            endpoint=self.__add_prefix(endpoint),
+            const=const,
+            auth_required=auth_required,
+            openapi_name=openapi_name,
+            openapi_tags=openapi_tags,
+            cache=cache,
+            etag=etag,
+            rate_limit=rate_limit,
+            blocking_pool=blocking_pool,
+        )
 
-    def post(self, endpoint: str, auth_required: bool = False, openapi_name: str = "", openapi_tags: List[str] = ["post"]):
-        return super().post(endpoint=self.__add_prefix(endpoint), auth_required=auth_required, openapi_name=openapi_name, openapi_tags=openapi_tags)
+    def post(
+        self,
+        endpoint: str,
+        auth_required: bool = False,
+        openapi_name: str = "",
+        openapi_tags: List[str] = ["post"],
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
+    ):
+        return super().post(
+            endpoint=self.__add_prefix(endpoint),
+            auth_required=auth_required,
+            openapi_name=openapi_name,
+            openapi_tags=openapi_tags,
+            rate_limit=rate_limit,
+            blocking_pool=blocking_pool,
+        )
 
-    def put(self, endpoint: str, auth_required: bool = False, openapi_name: str = "", openapi_tags: List[str] = ["put"]):
-        return super().put(endpoint=self.__add_prefix(endpoint), auth_required=auth_required, openapi_name=openapi_name, openapi_tags=openapi_tags)
+    def put(
+        self,
+        endpoint: str,
+        auth_required: bool = False,
+        openapi_name: str = "",
+        openapi_tags: List[str] = ["put"],
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
+    ):
+        return super().put(
+            endpoint=self.__add_prefix(endpoint),
+            auth_required=auth_required,
+            openapi_name=openapi_name,
+            openapi_tags=openapi_tags,
+            rate_limit=rate_limit,
+            blocking_pool=blocking_pool,
+        )
 
-    def delete(self, endpoint: str, auth_required: bool = False, openapi_name: str = "", openapi_tags: List[str] = ["delete"]):
-        return super().delete(endpoint=self.__add_prefix(endpoint), auth_required=auth_required, openapi_name=openapi_name, openapi_tags=openapi_tags)
+    def delete(
+        self,
+        endpoint: str,
+        auth_required: bool = False,
+        openapi_name: str = "",
+        openapi_tags: List[str] = ["delete"],
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
+    ):
+        return super().delete(
+            endpoint=self.__add_prefix(endpoint),
+            auth_required=auth_required,
+            openapi_name=openapi_name,
+            openapi_tags=openapi_tags,
+            rate_limit=rate_limit,
+            blocking_pool=blocking_pool,
+        )
 
-    def patch(self, endpoint: str, auth_required: bool = False, openapi_name: str = "", openapi_tags: List[str] = ["patch"]):
-        return super().patch(endpoint=self.__add_prefix(endpoint), auth_required=auth_required, openapi_name=openapi_name, openapi_tags=openapi_tags)
+    def patch(
+        self,
+        endpoint: str,
+        auth_required: bool = False,
+        openapi_name: str = "",
+        openapi_tags: List[str] = ["patch"],
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
+    ):
+        return super().patch(
+            endpoint=self.__add_prefix(endpoint),
+            auth_required=auth_required,
+            openapi_name=openapi_name,
+            openapi_tags=openapi_tags,
+            rate_limit=rate_limit,
+            blocking_pool=blocking_pool,
+        )
 
-    def head(self, endpoint: str, auth_required: bool = False, openapi_name: str = "", openapi_tags: List[str] = ["head"]):
-        return super().head(endpoint=self.__add_prefix(endpoint), auth_required=auth_required, openapi_name=openapi_name, openapi_tags=openapi_tags)
+    def head(
+        self,
+        endpoint: str,
+        auth_required: bool = False,
+        openapi_name: str = "",
+        openapi_tags: List[str] = ["head"],
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
+    ):
+        return super().head(
+            endpoint=self.__add_prefix(endpoint),
+            auth_required=auth_required,
+            openapi_name=openapi_name,
+            openapi_tags=openapi_tags,
+            rate_limit=rate_limit,
+            blocking_pool=blocking_pool,
+        )
 
-    def trace(self, endpoint: str, auth_required: bool = False, openapi_name: str = "", openapi_tags: List[str] = ["trace"]):
-        return super().trace(endpoint=self.__add_prefix(endpoint), auth_required=auth_required, openapi_name=openapi_name, openapi_tags=openapi_tags)
+    def trace(
+        self,
+        endpoint: str,
+        auth_required: bool = False,
+        openapi_name: str = "",
+        openapi_tags: List[str] = ["trace"],
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
+    ):
+        return super().trace(
+            endpoint=self.__add_prefix(endpoint),
+            auth_required=auth_required,
+            openapi_name=openapi_name,
+            openapi_tags=openapi_tags,
+            rate_limit=rate_limit,
+            blocking_pool=blocking_pool,
+        )
 
-    def options(self, endpoint: str, auth_required: bool = False, openapi_name: str = "", openapi_tags: List[str] = ["options"]):
-        return super().options(endpoint=self.__add_prefix(endpoint), auth_required=auth_required, openapi_name=openapi_name, openapi_tags=openapi_tags)
+    def options(
+        self,
+        endpoint: str,
+        auth_required: bool = False,
+        openapi_name: str = "",
+        openapi_tags: List[str] = ["options"],
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
+    ):
+        return super().options(
+            endpoint=self.__add_prefix(endpoint),
+            auth_required=auth_required,
+            openapi_name=openapi_name,
+            openapi_tags=openapi_tags,
+            rate_limit=rate_limit,
+            blocking_pool=blocking_pool,
+        )
 
 
 def ALLOW_CORS(app: Robyn, origins: Union[List[str], str]):
@@ -601,55 +962,25 @@ def ALLOW_CORS(app: Robyn, origins: Union[List[str], str]):
         app: Robyn application instance
         origins: List of allowed origins or "*" for all origins
     """
-    # Handle string input for origins
-    if isinstance(origins, str):
-        origins = [origins]
-
-    @app.before_request()
-    def cors_middleware(request):
-        origin = request.headers.get("Origin")
-
-        # If specific origins are set, validate the request origin
-        if origin and "*" not in origins and origin not in origins:
-            return Response(status_code=403, description="", headers={})
-
-        # Handle preflight requests
-        if request.method == "OPTIONS":
-            return Response(
-                status_code=204,
-                headers={
-                    "Access-Control-Allow-Origin": origin if origin else (origins[0] if origins else "*"),
-                    "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, PATCH, HEAD, OPTIONS",
-                    "Access-Control-Allow-Headers": "Content-Type, Authorization",
-                    "Access-Control-Allow-Credentials": "true",
-                    "Access-Control-Max-Age": "3600",
-                },
-                description="",
-            )
-
-        return request
-
-    # Set default CORS headers for all responses
-    if len(origins) == 1:
-        app.set_response_header("Access-Control-Allow-Origin", origins[0])
-    else:
-        # For multiple origins, we'll handle it dynamically in the response
-        app.set_response_header("Access-Control-Allow-Origin", "*")
-
-    app.set_response_header("Access-Control-Allow-Methods", "GET, POST, PUT, DELETE, PATCH, HEAD, OPTIONS")
-    app.set_response_header("Access-Control-Allow-Headers", "Content-Type, Authorization")
-    app.set_response_header("Access-Control-Allow-Credentials", "true")
+    # as it always did, the requests from a disallowed origin get a 403
+    app.configure_cors(origins=origins, allow_credentials=True, max_age=3600, reject_disallowed=True)
 
 
 __all__ = [
     "Robyn",
     "Request",
     "Response",
+    "BodyStream",
+    "UploadFile",
+    "BlockingPool",
+    "Cache",
+    "RateLimit",
     "status_codes",
     "jsonify",
     "serve_file",
     "serve_html",
     "html",
+    "StreamingResponse",
     "ALLOW_CORS",
     "SubRouter",
     "AuthenticationHandler",
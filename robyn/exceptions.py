@@ -16,6 +16,21 @@ class HTTPException(Exception):
         return f"{class_name}(status_code={self.status_code}, detail={self.detail})"
 
 
+class RequestValidationError(HTTPException):
+    """
+    Raised when the request body does not match the annotation of a handler parameter.
+    The handler is not called and the client gets a 422 with the errors.
+    """
+
+    def __init__(self, errors: list) -> None:
+        super().__init__(422)
+        self.errors = errors
+
+    def __repr__(self) -> str:
+        class_name = self.__class__.__name__
+        return f"{class_name}(errors={self.errors})"
+
+
 class WebSocketException(Exception):
     def __init__(self, code: int, reason: str | None = None) -> None:
         self.code = code
@@ -29,4 +44,4 @@ class WebSocketException(Exception):
         return f"{class_name}(code={self.code}, reason={self.reason})"
 
 
-__all__ = ["HTTPException", "WebSocketException"]
+__all__ = ["HTTPException", "RequestValidationError", "WebSocketException"]
@@ -1,13 +1,47 @@
+import dataclasses
+from typing import Any
+
 import orjson
 
 
-def jsonify(input_dict: dict) -> str:
+def _is_model(obj: Any) -> bool:
+    # pydantic v2 models have model_dump, v1 models dict along with __fields__
+    return hasattr(obj, "model_dump") or (hasattr(obj, "__fields__") and hasattr(obj, "dict"))
+
+
+def _default(obj: Any) -> Any:
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    if _is_model(obj):
+        return obj.dict()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def is_jsonable(res: Any) -> bool:
+    """
+    Whether a return value is serialized to a JSON response: dicts (TypedDicts included), lists,
+    dataclass instances and pydantic style models.
+    """
+    if isinstance(res, type):
+        return False
+    return isinstance(res, (dict, list)) or dataclasses.is_dataclass(res) or _is_model(res)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    This function serializes the input straight to JSON bytes, in a single pass
+
+    Attributes:
+        obj Any: a dict, list, dataclass instance or pydantic style model, possibly nested
+    """
+    return orjson.dumps(obj, default=_default)
+
+
+def jsonify(input_dict: Any) -> str:
     """
     This function serializes input dict to a json string
 
     Attributes:
         input_dict dict: response of the function
     """
-    output_binary = orjson.dumps(input_dict)
-    output_str = output_binary.decode("utf-8")
-    return output_str
+    return dumps(input_dict).decode("utf-8")
@@ -1,18 +1,23 @@
 import asyncio
+import mmap
 import signal
 import sys
 import webbrowser
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
+import multiprocess  # type: ignore
 from multiprocess import Process  # type: ignore
 
 from robyn.events import Events
 from robyn.logger import logger
-from robyn.robyn import FunctionInfo, Headers, Server, SocketHeld
+from robyn.robyn import BlockingPool, FunctionInfo, Headers, RateLimit, Server, SocketHeld
 from robyn.router import GlobalMiddleware, Route, RouteMiddleware
 from robyn.types import Directory
 from robyn.ws import WebSocket
 
+# 64k buckets of 16 bytes, shared by the processes forked for the server
+RATE_LIMIT_STORE_SIZE = 1 << 20
+
 
 def run_processes(
     url: str,
@@ -29,6 +34,11 @@ def run_processes(
     response_headers: Headers,
     excluded_response_headers_paths: Optional[List[str]],
     open_browser: bool,
+    etag: bool = False,
+    compression: Optional[Dict[str, Any]] = None,
+    cors: Optional[Dict[str, Any]] = None,
+    rate_limit: Optional[RateLimit] = None,
+    blocking_pool: Optional[BlockingPool] = None,
 ) -> List[Process]:
     socket = SocketHeld(url, port)
 
@@ -45,6 +55,11 @@ def run_processes(
         processes,
         response_headers,
         excluded_response_headers_paths,
+        etag,
+        compression,
+        cors,
+        rate_limit,
+        blocking_pool,
     )
 
     def terminating_signal_handler(_sig, _frame):
@@ -79,6 +94,11 @@ def init_processpool(
     processes: int,
     response_headers: Headers,
     excluded_response_headers_paths: Optional[List[str]],
+    etag: bool = False,
+    compression: Optional[Dict[str, Any]] = None,
+    cors: Optional[Dict[str, Any]] = None,
+    rate_limit: Optional[RateLimit] = None,
+    blocking_pool: Optional[BlockingPool] = None,
 ) -> List[Process]:
     process_pool: List = []
     if sys.platform.startswith("win32") or processes == 1:
@@ -94,10 +114,21 @@ def init_processpool(
             workers,
             response_headers,
             excluded_response_headers_paths,
+            etag,
+            compression,
+            cors,
+            rate_limit,
+            blocking_pool=blocking_pool,
         )
 
         return process_pool
 
+    # the counters of the rate limits live in an anonymous mapping inherited by the forked processes
+    rate_limit_store = None
+    is_rate_limited = rate_limit is not None or any(route.function.rate_limit is not None for route in routes)
+    if is_rate_limited and multiprocess.get_start_method() == "fork":
+        rate_limit_store = mmap.mmap(-1, RATE_LIMIT_STORE_SIZE)
+
     for _ in range(processes):
         copied_socket = socket.try_clone()
         process = Process(
@@ -114,6 +145,12 @@ def init_processpool(
                 workers,
                 response_headers,
                 excluded_response_headers_paths,
+                etag,
+                compression,
+                cors,
+                rate_limit,
+                rate_limit_store,
+                blocking_pool,
             ),
         )
         process.start()
@@ -150,6 +187,12 @@ def spawn_process(
     workers: int,
     response_headers: Headers,
     excluded_response_headers_paths: Optional[List[str]],
+    etag: bool = False,
+    compression: Optional[Dict[str, Any]] = None,
+    cors: Optional[Dict[str, Any]] = None,
+    rate_limit: Optional[RateLimit] = None,
+    rate_limit_store: Optional[mmap.mmap] = None,
+    blocking_pool: Optional[BlockingPool] = None,
 ):
     """
     This function is called by the main process handler to create a server runtime.
@@ -164,6 +207,12 @@ def spawn_process(
     :param socket SocketHeld: This is the main tcp socket, which is being shared across multiple processes.
     :param process_name string: This is the name given to the process to identify the process
     :param workers int: This is the name given to the process to identify the process
+    :param etag bool: Whether every response gets an ETag and conditional requests are answered with a 304
+    :param compression Dict: The arguments of Server.set_compression, None if the responses are not compressed
+    :param cors Dict: The arguments of Server.set_cors, None if CORS is not handled
+    :param rate_limit RateLimit: The limit of the requests to every route, None if they are not limited
+    :param rate_limit_store mmap: The memory shared by the processes for the counters of the rate limits, None if they are per process
+    :param blocking_pool BlockingPool: The pool the sync handlers run on, None if they run on the server workers
     """
 
     loop = initialize_event_loop()
@@ -181,6 +230,23 @@ def spawn_process(
 
     server.set_response_headers_exclude_paths(excluded_response_headers_paths)
 
+    server.set_etag(etag)
+
+    if compression is not None:
+        server.set_compression(**compression)
+
+    if cors is not None:
+        server.set_cors(**cors)
+
+    if rate_limit is not None:
+        server.set_rate_limit(rate_limit)
+
+    if rate_limit_store is not None:
+        server.set_rate_limit_store(rate_limit_store)
+
+    if blocking_pool is not None:
+        server.set_blocking_pool(blocking_pool)
+
     for route in routes:
         route_type, endpoint, function, is_const, auth_required, openapi_name, openapi_tags = route
         server.add_route(route_type, endpoint, function, is_const)
@@ -1,6 +1,6 @@
 import mimetypes
 import os
-from typing import Optional
+from typing import AsyncIterable, Iterable, Optional, Union
 
 from robyn.robyn import Headers, Response
 
@@ -18,6 +18,34 @@ class FileResponse:
         self.headers = headers or Headers({"Content-Disposition": "attachment"})
 
 
+class StreamingResponse:
+    def __init__(
+        self,
+        content: Union[Iterable, AsyncIterable],
+        status_code: Optional[int] = None,
+        headers: Optional[Headers] = None,
+        media_type: Optional[str] = None,
+    ):
+        """
+        A response whose body is sent chunk by chunk, with chunked transfer encoding,
+        as the (async) iterable yields str or bytes. The chunks of sync iterables are pulled
+        on a blocking thread, so a slow generator does not hold up the server worker.
+        A const route can't return a streaming response.
+
+        :param content Union[Iterable, AsyncIterable]: the chunks of the body, e.g. a generator
+        :param status_code Optional[int]: status code of the response, defaults to 200
+        :param headers Optional[Headers]: headers of the response
+        :param media_type Optional[str]: Content-Type of the response, defaults to application/octet-stream
+        """
+        self.content = content
+        self.status_code = status_code or 200
+        self.headers = headers or Headers({})
+        if media_type is not None:
+            self.headers.set("Content-Type", media_type)
+        elif not self.headers.contains("Content-Type"):
+            self.headers.set("Content-Type", "application/octet-stream")
+
+
 def html(html: str) -> Response:
     """
     This function will help in serving a simple html string
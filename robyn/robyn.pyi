@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Callable, Optional, Union
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, Union
 
 def get_version() -> str:
     pass
@@ -62,6 +62,11 @@ class FunctionInfo:
         number_of_params (int): The number of parameters the function has
         args (dict): The arguments of the function
         kwargs (dict): The keyword arguments of the function
+        stream_body (bool): Whether the request body is handed to the function as a stream
+        cache (Optional[Cache]): The cache of the responses of the function
+        etag (bool): Whether the responses get an ETag and conditional requests are answered with a 304
+        rate_limit (Optional[RateLimit]): The limit of the requests to the function
+        blocking_pool (Optional[BlockingPool]): The pool the function runs on if it is sync
     """
 
     handler: Callable
@@ -69,6 +74,11 @@ class FunctionInfo:
     number_of_params: int
     args: dict
     kwargs: dict
+    stream_body: bool = False
+    cache: Optional[Cache] = None
+    etag: bool = False
+    rate_limit: Optional[RateLimit] = None
+    blocking_pool: Optional[BlockingPool] = None
 
 @dataclass
 class Url:
@@ -93,10 +103,17 @@ class QueryParams:
     """
     The query params object passed to the route handler.
 
-    Attributes:
-        queries (dict[str, list[str]]): The query parameters of the request. e.g. /user?id=123 -> {"id": "123"}
+    The query string is percent-decoded (with `+` as a space) and only parsed the first time a parameter is read.
+    e.g. /user?id=123&name=J%C3%B6rg+Doe -> {"id": ["123"], "name": ["Jörg Doe"]}
     """
 
+    def __init__(self, query_string: Optional[str] = None) -> None:
+        """
+        Args:
+            query_string (Optional[str]): The raw query string to parse, e.g. "id=123&tag=a"
+        """
+        pass
+
     def set(self, key: str, value: str) -> None:
         """
         Sets the value of the query parameter with the given key.
@@ -154,6 +171,40 @@ class QueryParams:
         """
         pass
 
+    def get_int(self, key: str, default: Optional[int] = None) -> Optional[int]:
+        """
+        Gets the last value of the query parameter with the given key as an integer.
+        Raises a ValueError if the value is not an integer.
+
+        Args:
+            key (str): The key of the query parameter
+            default (Optional[int]): The default value if the key does not exist
+        """
+        pass
+
+    def get_bool(self, key: str, default: Optional[bool] = None) -> Optional[bool]:
+        """
+        Gets the last value of the query parameter with the given key as a boolean.
+        true, 1, yes, on and an empty value are True, false, 0, no and off are False,
+        anything else raises a ValueError.
+
+        Args:
+            key (str): The key of the query parameter
+            default (Optional[bool]): The default value if the key does not exist
+        """
+        pass
+
+    def get_list(self, key: str, separator: str = ",") -> list[str]:
+        """
+        Gets all the values of the query parameter with the given key, each split on the separator.
+        e.g. ?tag=a,b&tag=c -> ["a", "b", "c"]
+
+        Args:
+            key (str): The key of the query parameter
+            separator (str): The separator of the items in a value, an empty string to not split them
+        """
+        pass
+
     def extend(self, other: QueryParams) -> None:
         """
         Extends the query params with the other query params.
@@ -242,6 +293,135 @@ class Headers:
         """
         pass
 
+class Cache:
+    """
+    Caches the successful responses of a route for ttl seconds. Responses are keyed by method, path,
+    the query_params (all of the query string if None) and the vary request headers.
+    The least recently used responses are evicted past max_entries. A hit is served without calling the handler.
+
+    The cache lives in each process, its counters only count the requests of the current process.
+
+    Attributes:
+        ttl (float): The time to live of a response in seconds
+        max_entries (int): The maximum number of cached responses
+        vary (list[str]): The request headers the responses depend on
+        query_params (Optional[list[str]]): The query params the responses depend on
+        hits (int): The number of requests served from the cache
+        misses (int): The number of requests not found in the cache
+    """
+
+    ttl: float
+    max_entries: int
+    vary: list[str]
+    query_params: Optional[list[str]]
+    hits: int
+    misses: int
+
+    def __init__(self, ttl: float, max_entries: int = 10000, vary: list[str] = [], query_params: Optional[list[str]] = None) -> None:
+        pass
+
+    def clear(self) -> None:
+        """
+        Removes every cached response.
+        """
+        pass
+
+    def __len__(self) -> int:
+        pass
+
+class RateLimit:
+    """
+    Limits the requests to rate every per seconds, with bursts of up to burst requests.
+    The requests are counted per client IP, or per value of a header with key="header:X-Api-Key".
+    The requests over the limit get a 429 with a Retry-After header without calling Python.
+
+    The counters are shared by the processes forked for the server.
+
+    Attributes:
+        rate (int): The number of requests allowed every per seconds
+        per (float): The period of the rate in seconds
+        burst (int): The number of requests allowed at once
+        key (str): What the requests are counted by, "ip" or "header:<name>"
+    """
+
+    rate: int
+    per: float
+    burst: int
+    key: str
+
+    def __init__(self, rate: int, per: float = 1.0, burst: Optional[int] = None, key: str = "ip") -> None:
+        pass
+
+class BlockingPool:
+    """
+    Runs the sync handlers on at most size threads at once, instead of the server workers,
+    so that a slow sync handler does not stall the other requests of its worker.
+    The handlers wait for a free thread in a queue. The threads are shared by the workers of a process.
+
+    Attributes:
+        size (int): The number of handlers that run at once
+        queue_depth (int): The number of handlers waiting for a thread
+        active (int): The number of handlers running
+        completed (int): The number of handlers that ran on the pool
+        wait_time (float): The average time, in seconds, the handlers waited for a thread
+        max_wait_time (float): The longest time, in seconds, a handler waited for a thread
+    """
+
+    size: int
+    queue_depth: int
+    active: int
+    completed: int
+    wait_time: float
+    max_wait_time: float
+
+    def __init__(self, size: int) -> None:
+        pass
+
+class BodyStream:
+    """
+    The request body as an async iterator of bytes chunks.
+
+    A route receives it instead of a buffered body when one of its handler parameters is annotated with BodyStream.
+    e.g. async def upload(body: BodyStream): async for chunk in body: ...
+    """
+
+    def __aiter__(self) -> BodyStream:
+        pass
+
+    async def __anext__(self) -> bytes:
+        pass
+
+class UploadFile:
+    """
+    A file received in a multipart request. Small files are kept in memory,
+    larger ones are spooled to a temporary file that only lives as long as the request.
+
+    Attributes:
+        name (str): The name of the form field
+        filename (str): The name of the file
+        content_type (Optional[str]): The content type of the file
+        size (int): The size of the file in bytes
+        path (Optional[str]): The temporary file the upload was spooled to, None if it is kept in memory
+    """
+
+    name: str
+    filename: str
+    content_type: Optional[str]
+    size: int
+    path: Optional[str]
+
+    def read(self) -> bytes:
+        """
+        Reads the whole file in memory.
+        """
+        pass
+
+    def save(self, destination: str) -> None:
+        """
+        Copies the file to the destination, without loading it in memory if it was spooled to disk.
+        """
+        pass
+
 @dataclass
 class Request:
     """
@@ -252,10 +432,13 @@ class Request:
         headers Headers: The headers of the request. e.g. Headers({"Content-Type": "application/json"})
         path_params (dict[str, str]): The parameters of the request. e.g. /user/:id -> {"id": "123"}
         body (Union[str, bytes]): The body of the request. If the request is a JSON, it will be a dict.
+        raw_body (memoryview): A read only view over the request body, without copying it.
+        body_stream (Optional[BodyStream]): The body as an async iterator of chunks, only set for routes streaming their body.
         method (str): The method of the request. e.g. GET, POST, PUT etc.
         url (Url): The url of the request. e.g. https://localhost/user
         form_data (dict[str, str]): The form data of the request. e.g. {"name": "John"}
         files (dict[str, bytes]): The files of the request. e.g. {"file": b"file"}
+        uploads (list[UploadFile]): Every uploaded file, in the order they were received, without reading them in memory.
         ip_addr (Optional[str]): The IP Address of the client
         identity (Optional[Identity]): The identity of the client
     """
@@ -264,16 +447,20 @@ class Request:
     headers: Headers
     path_params: dict[str, str]
     body: Union[str, bytes]
+    raw_body: memoryview
+    body_stream: Optional[BodyStream]
     method: str
     url: Url
     form_data: dict[str, str]
     files: dict[str, bytes]
+    uploads: list[UploadFile]
     ip_addr: Optional[str]
     identity: Optional[Identity]
 
-    def json(self) -> dict:
+    def json(self) -> Any:
         """
-        If the body is a valid JSON this will return the parsed JSON data.
+        If the body is a valid JSON this will return the parsed JSON data, decoded into
+        native dicts, lists, strings, ints, floats, bools and None. The body is parsed once and cached.
         Otherwise, this will throw a ValueError.
         """
         pass
@@ -287,15 +474,17 @@ class Response:
         status_code (int): The status code of the response. e.g. 200, 404, 500 etc.
         response_type (Optional[str]): The response type of the response. e.g. text, json, html, file etc.
         headers (Union[Headers, dict]): The headers of the response or Headers directly. e.g. {"Content-Type": "application/json"}
-        description (Union[str, bytes]): The body of the response. If the response is a JSON, it will be a dict.
+        description (Union[str, bytes, bytearray, memoryview]): The body of the response. Any object supporting the buffer protocol is accepted, large `bytes` are sent without being copied.
         file_path (Optional[str]): The file path of the response. e.g. /home/user/file.txt
+        stream (Optional[Union[Iterator, AsyncIterator]]): Yields the chunks of a streamed body. The description is ignored when set.
     """
 
     status_code: int
     headers: Union[Headers, dict]
-    description: Union[str, bytes]
+    description: Union[str, bytes, bytearray, memoryview]
     response_type: Optional[str] = None
     file_path: Optional[str] = None
+    stream: Optional[Union[Iterator, AsyncIterator]] = None
 
     def set_cookie(self, key: str, value: str) -> None:
         """
@@ -329,6 +518,27 @@ class Server:
         pass
     def set_response_headers_exclude_paths(self, excluded_response_headers_paths: Optional[list[str]] = None):
         pass
+    def set_etag(self, enabled: bool) -> None:
+        pass
+    def set_compression(self, min_size: int, algorithms: list[str], level: Optional[int] = None) -> None:
+        pass
+    def set_cors(
+        self,
+        origins: list[str],
+        methods: list[str],
+        headers: list[str],
+        expose_headers: list[str] = [],
+        allow_credentials: bool = False,
+        max_age: Optional[int] = None,
+        reject_disallowed: bool = False,
+    ) -> None:
+        pass
+    def set_rate_limit(self, rate_limit: RateLimit) -> None:
+        pass
+    def set_blocking_pool(self, blocking_pool: BlockingPool) -> None:
+        pass
+    def set_rate_limit_store(self, buffer: Any) -> None:
+        pass
 
     def add_route(
         self,
@@ -4,17 +4,34 @@ from abc import ABC, abstractmethod
 from asyncio import iscoroutinefunction
 from functools import wraps
 from inspect import signature
+from operator import attrgetter
 from types import CoroutineType
-from typing import Callable, Dict, List, NamedTuple, Optional, Union
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple, Union
 
 from robyn import status_codes
 from robyn.authentication import AuthenticationHandler, AuthenticationNotConfiguredError
 from robyn.dependency_injection import DependencyMap
-from robyn.jsonify import jsonify
+from robyn.exceptions import RequestValidationError
+from robyn.jsonify import dumps, is_jsonable
 from robyn.openapi import OpenAPI
-from robyn.responses import FileResponse
-from robyn.robyn import FunctionInfo, Headers, HttpMethod, Identity, MiddlewareType, QueryParams, Request, Response, Url
+from robyn.responses import FileResponse, StreamingResponse
+from robyn.robyn import (
+    BlockingPool,
+    BodyStream,
+    Cache,
+    FunctionInfo,
+    Headers,
+    HttpMethod,
+    Identity,
+    MiddlewareType,
+    QueryParams,
+    RateLimit,
+    Request,
+    Response,
+    Url,
+)
 from robyn.types import Body, Files, FormData, IPAddress, Method, PathParams
+from robyn.validation import compile_body_decoder, is_body_model
 from robyn.ws import WebSocket
 
 _logger = logging.getLogger(__name__)
@@ -45,6 +62,65 @@ class GlobalMiddleware(NamedTuple):
     function: FunctionInfo
 
 
+# A getter receives the request and the kwargs the handler was called with
+ParamBinder = Tuple[str, Callable[[Request, dict], Any]]
+
+# Type annotations and the request attribute they resolve to
+REQUEST_ATTRIBUTE_TYPES = [
+    (QueryParams, "query_params"),
+    (Headers, "headers"),
+    (PathParams, "path_params"),
+    (Body, "body"),
+    (Method, "method"),
+    (Url, "url"),
+    (FormData, "form_data"),
+    (Files, "files"),
+    (IPAddress, "ip_addr"),
+    (Identity, "identity"),
+    (BodyStream, "body_stream"),
+]
+
+REQUEST_ATTRIBUTE_NAMES = {"query_params", "headers", "path_params", "body", "method", "url", "ip_addr", "identity", "form_data", "files"}
+
+REQUEST_ALIASES = {"r", "req", "request"}
+
+
+def _get_request(request: Request, _kwargs: dict) -> Request:
+    return request
+
+
+def _get_request_attribute(attribute: str) -> Callable[[Request, dict], Any]:
+    get_attribute = attrgetter(attribute)
+
+    def getter(request: Request, _kwargs: dict) -> Any:
+        return get_attribute(request)
+
+    return getter
+
+
+def _get_validated_body(annotation: Any) -> Callable[[Request, dict], Any]:
+    decode = compile_body_decoder(annotation)
+
+    def getter(request: Request, _kwargs: dict) -> Any:
+        return decode(request)
+
+    return getter
+
+
+def _get_dependency(name: str, default: Any) -> Callable[[Request, dict], Any]:
+    def getter(_request: Request, kwargs: dict) -> Any:
+        return kwargs.get(name, default)
+
+    return getter
+
+
+def _get_kwarg(name: str) -> Callable[[Request, dict], Any]:
+    def getter(_request: Request, kwargs: dict) -> Any:
+        return kwargs[name]
+
+    return getter
+
+
 class BaseRouter(ABC):
     @abstractmethod
     def add_route(*args) -> Union[Callable, CoroutineType, WebSocket]: ...
@@ -73,16 +149,17 @@ class Router(BaseRouter):
 
     def _format_response(
         self,
-        res: Union[Dict, Response, bytes, tuple, str],
+        res: Union[Dict, List, Response, bytes, bytearray, memoryview, tuple, str, Any],
     ) -> Response:
         if isinstance(res, Response):
             return res
 
-        if isinstance(res, dict):
+        # dicts, lists, dataclasses and models are serialized once, straight to bytes
+        if is_jsonable(res):
             return Response(
                 status_code=status_codes.HTTP_200_OK,
                 headers=Headers({"Content-Type": "application/json"}),
-                description=jsonify(res),
+                description=dumps(res),
             )
 
         if isinstance(res, FileResponse):
@@ -94,7 +171,19 @@ class Router(BaseRouter):
             response.file_path = res.file_path
             return response
 
-        if isinstance(res, bytes):
+        if isinstance(res, StreamingResponse):
+            response = Response(
+                status_code=res.status_code,
+                headers=res.headers,
+                description="",
+            )
+            response.stream = res.content
+            return response
+
+        if inspect.isgenerator(res) or inspect.isasyncgen(res):
+            return self._format_response(StreamingResponse(res))
+
+        if isinstance(res, (bytes, bytearray, memoryview)):
             return Response(
                 status_code=status_codes.HTTP_200_OK,
                 headers=Headers({"Content-Type": "application/octet-stream"}),
@@ -110,6 +199,64 @@ class Router(BaseRouter):
             description=str(res).encode("utf-8"),
         )
 
+    def _format_validation_error(self, err: RequestValidationError) -> Response:
+        return Response(
+            status_code=err.status_code,
+            headers=Headers({"Content-Type": "application/json"}),
+            description=dumps({"detail": err.errors}),
+        )
+
+    def _build_params_binder(self, params: Dict[str, inspect.Parameter], injected_dependencies: dict) -> Tuple[List[ParamBinder], Set[str]]:
+        """
+        Resolves once, at registration time, where every handler parameter comes from.
+        A parameter is matched on its type annotation first and on its name otherwise.
+        Parameters annotated with a Body subclass, a dataclass or a TypedDict get the body
+        decoded by a validator compiled here, the invalid bodies being answered with a 422.
+
+        :param params dict: the parameters of the handler
+        :param injected_dependencies dict: the global and router dependencies of the handler
+
+        Returns the (param name, getter) pairs and the names that could not be resolved.
+        The names that could not be resolved are looked up in the call kwargs.
+        """
+        params_binder: List[ParamBinder] = []
+        unresolved_params: Set[str] = set()
+
+        for param_name, param in params.items():
+            annotation = param.annotation
+            attribute: Optional[str] = None
+
+            if annotation is Request:
+                params_binder.append((param_name, _get_request))
+                continue
+
+            for annotation_type, type_attribute in REQUEST_ATTRIBUTE_TYPES:
+                if annotation is annotation_type:
+                    attribute = type_attribute
+                    break
+            else:
+                # dependencies may be annotated with a dataclass too, the Body subclasses are always the body
+                if is_body_model(annotation) and (issubclass(annotation, Body) or param_name not in injected_dependencies):
+                    params_binder.append((param_name, _get_validated_body(annotation)))
+                    continue
+                if inspect.isclass(annotation) and issubclass(annotation, QueryParams):
+                    attribute = "query_params"
+
+            if attribute is None and param_name in REQUEST_ATTRIBUTE_NAMES:
+                attribute = param_name
+
+            if attribute is not None:
+                params_binder.append((param_name, _get_request_attribute(attribute)))
+            elif param_name in REQUEST_ALIASES:
+                params_binder.append((param_name, _get_request))
+            elif param_name in injected_dependencies:
+                params_binder.append((param_name, _get_dependency(param_name, injected_dependencies[param_name])))
+            else:
+                unresolved_params.add(param_name)
+                params_binder.append((param_name, _get_kwarg(param_name)))
+
+        return params_binder, unresolved_params
+
     def add_route(  # type: ignore
         self,
         route_type: HttpMethod,
@@ -121,74 +268,33 @@ class Router(BaseRouter):
         openapi_tags: List[str],
         exception_handler: Optional[Callable],
         injected_dependencies: dict,
+        cache: Optional[Cache] = None,
+        etag: bool = False,
+        rate_limit: Optional[RateLimit] = None,
+        blocking_pool: Optional[BlockingPool] = None,
     ) -> Union[Callable, CoroutineType]:
-        def wrapped_handler(*args, **kwargs):
-            # In the execute functions the request is passed into *args
-            request = next(filter(lambda it: isinstance(it, Request), args), None)
+        if is_const and (inspect.isgeneratorfunction(handler) or inspect.isasyncgenfunction(handler)):
+            # a const response is computed once, its iterator would be consumed by the first client
+            raise ValueError(f"The const route {endpoint} can't stream its response")
 
-            handler_params = signature(handler).parameters
+        params = dict(signature(handler).parameters)
+        number_of_params = len(params)
+        params_binder, unresolved_params = self._build_params_binder(params, injected_dependencies)
+        # annotating a parameter with BodyStream opts the route into streaming its body
+        stream_body = any(param.annotation is BodyStream for param in params.values())
+
+        def wrapped_handler(*args, **kwargs):
+            # In the execute functions the request is passed as the first positional argument
+            request = args[0] if args and isinstance(args[0], Request) else None
 
-            if not request or (len(handler_params) == 1 and next(iter(handler_params)) is Request):
+            if request is None:
                 return handler(*args, **kwargs)
 
-            type_mapping = {
-                "request": Request,
-                "query_params": QueryParams,
-                "headers": Headers,
-                "path_params": PathParams,
-                "body": Body,
-                "method": Method,
-                "url": Url,
-                "form_data": FormData,
-                "files": Files,
-                "ip_addr": IPAddress,
-                "identity": Identity,
-            }
-
-            type_filtered_params = {}
-
-            for handler_param in iter(handler_params):
-                for type_name in type_mapping:
-                    handler_param_type = handler_params[handler_param].annotation
-                    handler_param_name = handler_params[handler_param].name
-                    if handler_param_type is Request:
-                        type_filtered_params[handler_param_name] = request
-                    elif handler_param_type is type_mapping[type_name]:
-                        type_filtered_params[handler_param_name] = getattr(request, type_name)
-                    elif inspect.isclass(handler_param_type):
-                        if issubclass(handler_param_type, Body):
-                            type_filtered_params[handler_param_name] = getattr(request, "body")
-                        elif issubclass(handler_param_type, QueryParams):
-                            type_filtered_params[handler_param_name] = getattr(request, "query_params")
-
-            request_components = {
-                "r": request,
-                "req": request,
-                "request": request,
-                "query_params": request.query_params,
-                "headers": request.headers,
-                "path_params": request.path_params,
-                "body": request.body,
-                "method": request.method,
-                "url": request.url,
-                "ip_addr": request.ip_addr,
-                "identity": request.identity,
-                "form_data": request.form_data,
-                "files": request.files,
-                "router_dependencies": injected_dependencies["router_dependencies"],
-                "global_dependencies": injected_dependencies["global_dependencies"],
-                **kwargs,
-            }
-
-            name_filtered_params = {k: v for k, v in request_components.items() if k in handler_params and k not in type_filtered_params}
-
-            filtered_params = dict(**type_filtered_params, **name_filtered_params)
-
-            if len(filtered_params) != len(handler_params):
-                invalid_args = set(handler_params) - set(filtered_params)
+            if unresolved_params and not unresolved_params.issubset(kwargs):
+                invalid_args = unresolved_params - set(kwargs)
                 raise SyntaxError(f"Unexpected request params found: {invalid_args}")
 
-            return handler(**filtered_params)
+            return handler(**{param_name: getter(request, kwargs) for param_name, getter in params_binder})
 
         @wraps(handler)
         async def async_inner_handler(*args, **kwargs):
@@ -196,6 +302,8 @@ class Router(BaseRouter):
                 response = self._format_response(
                     await wrapped_handler(*args, **kwargs),
                 )
+            except RequestValidationError as err:
+                response = self._format_validation_error(err)
             except Exception as err:
                 if exception_handler is None:
                     raise
@@ -210,6 +318,8 @@ class Router(BaseRouter):
                 response = self._format_response(
                     wrapped_handler(*args, **kwargs),
                 )
+            except RequestValidationError as err:
+                response = self._format_validation_error(err)
             except Exception as err:
                 if exception_handler is None:
                     raise
@@ -218,10 +328,6 @@ class Router(BaseRouter):
                 )
             return response
 
-        number_of_params = len(signature(handler).parameters)
-        # these are the arguments
-        params = dict(inspect.signature(handler).parameters)
-
         new_injected_dependencies = {}
         for dependency in injected_dependencies:
             if dependency in params:
@@ -236,6 +342,11 @@ class Router(BaseRouter):
                 number_of_params,
                 params,
                 new_injected_dependencies,
+                stream_body=stream_body,
+                cache=cache,
+                etag=etag,
+                rate_limit=rate_limit,
+                blocking_pool=blocking_pool,
             )
             self.routes.append(Route(route_type, endpoint, function, is_const, auth_required, openapi_name, openapi_tags))
             return async_inner_handler
@@ -246,6 +357,11 @@ class Router(BaseRouter):
                 number_of_params,
                 params,
                 new_injected_dependencies,
+                stream_body=stream_body,
+                cache=cache,
+                etag=etag,
+                rate_limit=rate_limit,
+                blocking_pool=blocking_pool,
             )
             self.routes.append(Route(route_type, endpoint, function, is_const, auth_required, openapi_name, openapi_tags))
             return inner_handler
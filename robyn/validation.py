@@ -0,0 +1,260 @@
+import dataclasses
+import inspect
+import types
+from typing import Any, Callable, Dict, List, Literal, Tuple, Union, get_args, get_origin, get_type_hints
+
+from robyn.exceptions import RequestValidationError
+from robyn.robyn import Request
+from robyn.types import Body
+
+# A decoder receives the parsed JSON value, its location in the body and the list collecting the errors
+Decoder = Callable[[Any, Tuple[Union[str, int], ...], List[dict]], Any]
+
+_MISSING = object()
+
+_UNION_TYPES = (Union, getattr(types, "UnionType", Union))
+
+
+def _error(errors: List[dict], loc: Tuple[Union[str, int], ...], msg: str, error_type: str) -> None:
+    errors.append({"loc": list(loc), "msg": msg, "type": error_type})
+
+
+def _is_typeddict(annotation: Any) -> bool:
+    return inspect.isclass(annotation) and issubclass(annotation, dict) and hasattr(annotation, "__total__")
+
+
+def is_body_model(annotation: Any) -> bool:
+    """
+    Whether a handler parameter annotated with the type gets the request body decoded and validated:
+    Body subclasses, dataclasses and TypedDicts.
+    """
+    if not inspect.isclass(annotation):
+        return False
+    return (issubclass(annotation, Body) and annotation is not Body) or dataclasses.is_dataclass(annotation) or _is_typeddict(annotation)
+
+
+def _type_hints(cls: type) -> Dict[str, Any]:
+    try:
+        return get_type_hints(cls)
+    except (NameError, TypeError):
+        # forward references to names that can not be resolved, e.g. classes defined in a function
+        hints: Dict[str, Any] = {}
+        for base in reversed(cls.__mro__):
+            hints.update(getattr(base, "__annotations__", {}))
+        return hints
+
+
+def _is_optional(annotation: Any) -> bool:
+    return get_origin(annotation) in _UNION_TYPES and type(None) in get_args(annotation)
+
+
+def _compile_scalar(expected: type, name: str) -> Decoder:
+    def decode(value: Any, loc: Tuple[Union[str, int], ...], errors: List[dict]) -> Any:
+        # bools are ints in Python but not in JSON
+        if isinstance(value, expected) and not (isinstance(value, bool) and expected is not bool):
+            return value
+        _error(errors, loc, f"Input should be a valid {name}", f"{name}_type")
+        return None
+
+    return decode
+
+
+def _decode_float(value: Any, loc: Tuple[Union[str, int], ...], errors: List[dict]) -> Any:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    _error(errors, loc, "Input should be a valid number", "float_type")
+    return None
+
+
+def _decode_none(value: Any, loc: Tuple[Union[str, int], ...], errors: List[dict]) -> Any:
+    if value is not None:
+        _error(errors, loc, "Input should be null", "none_required")
+    return None
+
+
+def _decode_any(value: Any, _loc: Tuple[Union[str, int], ...], _errors: List[dict]) -> Any:
+    return value
+
+
+SCALAR_DECODERS: Dict[Any, Decoder] = {
+    Any: _decode_any,
+    object: _decode_any,
+    inspect.Parameter.empty: _decode_any,
+    type(None): _decode_none,
+    None: _decode_none,
+    str: _compile_scalar(str, "string"),
+    int: _compile_scalar(int, "integer"),
+    bool: _compile_scalar(bool, "boolean"),
+    float: _decode_float,
+}
+
+
+def _compile_list(item_decoder: Decoder) -> Decoder:
+    def decode(value: Any, loc: Tuple[Union[str, int], ...], errors: List[dict]) -> Any:
+        if not isinstance(value, list):
+            _error(errors, loc, "Input should be a valid list", "list_type")
+            return None
+        return [item_decoder(item, (*loc, index), errors) for index, item in enumerate(value)]
+
+    return decode
+
+
+def _compile_dict(value_decoder: Decoder) -> Decoder:
+    def decode(value: Any, loc: Tuple[Union[str, int], ...], errors: List[dict]) -> Any:
+        if not isinstance(value, dict):
+            _error(errors, loc, "Input should be a valid object", "dict_type")
+            return None
+        return {key: value_decoder(item, (*loc, key), errors) for key, item in value.items()}
+
+    return decode
+
+
+def _compile_union(decoders: List[Decoder], accepts_none: bool) -> Decoder:
+    def decode(value: Any, loc: Tuple[Union[str, int], ...], errors: List[dict]) -> Any:
+        if value is None and accepts_none:
+            return None
+        for decoder in decoders:
+            member_errors: List[dict] = []
+            result = decoder(value, loc, member_errors)
+            if not member_errors:
+                return result
+        _error(errors, loc, "Input does not match any of the allowed types", "union_type")
+        return None
+
+    return decode
+
+
+def _compile_literal(allowed: Tuple[Any, ...]) -> Decoder:
+    def decode(value: Any, loc: Tuple[Union[str, int], ...], errors: List[dict]) -> Any:
+        if value not in allowed:
+            _error(errors, loc, f"Input should be one of {list(allowed)}", "literal_error")
+        return value
+
+    return decode
+
+
+def _compile_model(cls: type, memo: Dict[Any, Decoder]) -> Decoder:
+    hints = _type_hints(cls)
+    # (name, decoder, default, default factory, required)
+    fields: List[Tuple[str, Decoder, Any, Any, bool]] = []
+
+    if dataclasses.is_dataclass(cls):
+        for field in dataclasses.fields(cls):
+            if not field.init:
+                continue
+            annotation = hints.get(field.name, Any)
+            has_default = field.default is not dataclasses.MISSING or field.default_factory is not dataclasses.MISSING
+            default = field.default if field.default is not dataclasses.MISSING else _MISSING
+            factory = field.default_factory if field.default_factory is not dataclasses.MISSING else None
+            if not has_default and _is_optional(annotation):
+                default = None
+            required = default is _MISSING and factory is None
+            fields.append((field.name, _compile(annotation, memo), default, factory, required))
+
+        def build(values: Dict[str, Any]) -> Any:
+            return cls(**values)
+
+    elif _is_typeddict(cls):
+        required_keys = getattr(cls, "__required_keys__", set(hints) if cls.__total__ else set())  # type: ignore
+        for name, annotation in hints.items():
+            fields.append((name, _compile(annotation, memo), _MISSING, None, name in required_keys))
+
+        def build(values: Dict[str, Any]) -> Any:
+            return values
+
+    else:
+        for name, annotation in hints.items():
+            default = getattr(cls, name, _MISSING)
+            if default is _MISSING and _is_optional(annotation):
+                default = None
+            fields.append((name, _compile(annotation, memo), default, None, default is _MISSING))
+
+        def build(values: Dict[str, Any]) -> Any:
+            # Body subclasses are plain annotated classes, their instances get the fields as attributes
+            instance = cls.__new__(cls)
+            instance.__dict__.update(values)
+            return instance
+
+    def decode(value: Any, loc: Tuple[Union[str, int], ...], errors: List[dict]) -> Any:
+        if not isinstance(value, dict):
+            _error(errors, loc, "Input should be a valid object", "dict_type")
+            return None
+
+        values: Dict[str, Any] = {}
+        errors_before = len(errors)
+        for name, decoder, default, factory, required in fields:
+            item = value.get(name, _MISSING)
+            if item is not _MISSING:
+                values[name] = decoder(item, (*loc, name), errors)
+            elif factory is not None:
+                values[name] = factory()
+            elif default is not _MISSING:
+                values[name] = default
+            elif required:
+                _error(errors, (*loc, name), "Field required", "missing")
+
+        if len(errors) > errors_before:
+            return None
+        return build(values)
+
+    return decode
+
+
+def _compile(annotation: Any, memo: Dict[Any, Decoder]) -> Decoder:
+    if annotation in SCALAR_DECODERS:
+        return SCALAR_DECODERS[annotation]
+
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+
+    if origin in _UNION_TYPES:
+        members = [arg for arg in args if arg is not type(None)]
+        return _compile_union([_compile(member, memo) for member in members], len(members) < len(args))
+    if origin is Literal:
+        return _compile_literal(args)
+    if annotation is list or origin in (list, List):
+        return _compile_list(_compile(args[0], memo) if args else _decode_any)
+    if annotation is dict or origin in (dict, Dict):
+        return _compile_dict(_compile(args[1], memo) if len(args) == 2 else _decode_any)
+
+    if is_body_model(annotation):
+        if annotation in memo:
+            # a model referencing itself, resolved once it is compiled
+            return lambda value, loc, errors: memo[annotation](value, loc, errors)
+        memo[annotation] = _decode_any
+        memo[annotation] = _compile_model(annotation, memo)
+        return memo[annotation]
+
+    if inspect.isclass(annotation):
+        return _compile_scalar(annotation, annotation.__name__)
+
+    return _decode_any
+
+
+def compile_body_decoder(annotation: Any) -> Callable[[Request], Any]:
+    """
+    Compiles, once per route, the decoder of the request body into an instance of the annotation.
+
+    The body is parsed as JSON and checked against the annotated fields. Missing fields, wrong types
+    and invalid JSON raise a RequestValidationError listing every error, answered with a 422.
+
+    :param annotation type: a Body subclass, a dataclass or a TypedDict, whose fields may nest them
+    """
+    decode = _compile(annotation, {})
+
+    def decoder(request: Request) -> Any:
+        try:
+            value = request.json()
+        except ValueError as error:
+            raise RequestValidationError([{"loc": ["body"], "msg": f"Invalid JSON: {error}", "type": "json_invalid"}])
+
+        errors: List[dict] = []
+        result = decode(value, ("body",), errors)
+        if errors:
+            raise RequestValidationError(errors)
+        return result
+
+    return decoder
+
+
+__all__ = ["compile_body_decoder", "is_body_model"]
@@ -0,0 +1,61 @@
+import asyncio
+import select
+import selectors
+from typing import Callable
+
+
+class WorkerEventLoop(asyncio.SelectorEventLoop):
+    """
+    The event loop of an actix worker (`ROBYN_LOOP_PER_WORKER`).
+
+    It has no thread of its own: the worker runs it a step at a time, in between the requests it serves.
+    `wake` is called with the delay until every callback scheduled on the loop is due, and the selector
+    of the loop becomes readable when it has I/O to process, so the worker knows when to run a step.
+    """
+
+    def __init__(self, wake: Callable[[float], None]) -> None:
+        self._wake = wake
+        selector = selectors.DefaultSelector()
+        super().__init__(selector)
+        self._selector_fd = selector.fileno()
+        # level triggered, unlike the watch the worker keeps on the selector
+        self._io_poll = select.poll()
+        self._io_poll.register(self._selector_fd, select.POLLIN)
+
+    def call_soon(self, callback, *args, context=None):
+        handle = super().call_soon(callback, *args, context=context)
+        self._wake(0.0)
+        return handle
+
+    def call_at(self, when, callback, *args, context=None):
+        handle = super().call_at(when, callback, *args, context=context)
+        self._wake(when - self.time())
+        return handle
+
+    def fileno(self) -> int:
+        return self._selector_fd
+
+    def run_once(self) -> bool:
+        """
+        Runs one iteration of the loop, without waiting for anything.
+        Returns whether the loop still has I/O to process.
+        """
+        self.stop()
+        self.run_forever()
+        return bool(self._io_poll.poll(0))
+
+    def run_now(self, callback, *, context=None) -> None:
+        """Schedules the callback and runs it right away, after the callbacks that were ready before it."""
+        self.call_soon(callback, context=context)
+        if not self.is_running():
+            self.run_once()
+
+    def shutdown(self) -> None:
+        """Cancels the tasks left on the loop, waits for them to finish and closes the loop."""
+        tasks = asyncio.all_tasks(self)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            self.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.run_until_complete(self.shutdown_asyncgens())
+        self.close()
@@ -0,0 +1,359 @@
+//! Compression of the response bodies, negotiated on the request `Accept-Encoding`.
+mod precompressed;
+
+use std::io::{self, Write};
+
+use actix_web::{
+    http::header::{self, HeaderMap},
+    web::{Bytes, BytesMut},
+    HttpRequest,
+};
+use flate2::{write::GzEncoder, Compression};
+use pyo3::{exceptions::PyValueError, prelude::*};
+
+use crate::types::response::Response;
+
+pub use precompressed::{precompressed_files_service, PrecompressedFiles};
+
+/// Content types that are already compressed and would not shrink any further.
+const COMPRESSED_CONTENT_TYPES: [&str; 12] = [
+    "image/png",
+    "image/jpeg",
+    "image/gif",
+    "image/webp",
+    "image/avif",
+    "video/",
+    "audio/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "application/zstd",
+    "application/x-7z-compressed",
+];
+
+/// Bodies of at least this size are compressed on a blocking thread, so that a slow algorithm
+/// (e.g. brotli) does not hold up the other connections of the worker.
+const BLOCKING_COMPRESSION_MIN_SIZE: usize = 64 * 1024;
+
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum ContentEncoding {
+    Brotli,
+    Zstd,
+    Gzip,
+}
+
+impl ContentEncoding {
+    pub fn from_name(name: &str) -> Option<Self> {
+        match name {
+            "br" => Some(Self::Brotli),
+            "zstd" => Some(Self::Zstd),
+            "gzip" => Some(Self::Gzip),
+            _ => None,
+        }
+    }
+
+    pub fn name(&self) -> &'static str {
+        match self {
+            Self::Brotli => "br",
+            Self::Zstd => "zstd",
+            Self::Gzip => "gzip",
+        }
+    }
+
+    pub fn header(&self) -> header::ContentEncoding {
+        match self {
+            Self::Brotli => header::ContentEncoding::Brotli,
+            Self::Zstd => header::ContentEncoding::Zstd,
+            Self::Gzip => header::ContentEncoding::Gzip,
+        }
+    }
+
+    /// The extension of the precompressed sidecar files
+    pub fn extension(&self) -> &'static str {
+        match self {
+            Self::Brotli => "br",
+            Self::Zstd => "zst",
+            Self::Gzip => "gz",
+        }
+    }
+
+    /// Favours speed over ratio, as the bodies are compressed on every request.
+    fn default_level(&self) -> u32 {
+        match self {
+            Self::Brotli => 4,
+            Self::Zstd => 3,
+            Self::Gzip => 6,
+        }
+    }
+
+    fn clamp_level(&self, level: u32) -> u32 {
+        match self {
+            Self::Brotli => level.min(11),
+            Self::Zstd => level.clamp(1, 22),
+            Self::Gzip => level.min(9),
+        }
+    }
+}
+
+#[derive(Debug, Clone)]
+pub struct CompressionConfig {
+    pub min_size: usize,
+    /// In order of preference
+    pub algorithms: Vec<ContentEncoding>,
+    pub level: Option<u32>,
+}
+
+impl CompressionConfig {
+    pub fn new(min_size: usize, algorithms: Vec<String>, level: Option<u32>) -> PyResult<Self> {
+        let algorithms = algorithms
+            .iter()
+            .map(|name| {
+                ContentEncoding::from_name(name).ok_or_else(|| {
+                    PyValueError::new_err(format!(
+                        "Unsupported compression algorithm `{name}`, expected one of br, zstd or gzip"
+                    ))
+                })
+            })
+            .collect::<PyResult<Vec<_>>>()?;
+
+        Ok(Self {
+            min_size,
+            algorithms,
+            level,
+        })
+    }
+
+    fn level(&self, encoding: ContentEncoding) -> u32 {
+        match self.level {
+            Some(level) => encoding.clamp_level(level),
+            None => encoding.default_level(),
+        }
+    }
+
+    /// Whether the body of the response is worth compressing.
+    pub fn is_compressible(&self, response: &Response) -> bool {
+        if response.file_path.is_some()
+            || matches!(response.status_code, 204 | 304)
+            || response.status_code < 200
+            || response.headers.contains("content-encoding".to_string())
+            || (response.stream.is_none() && response.description.len() < self.min_size)
+        {
+            return false;
+        }
+        match response.headers.get("content-type".to_string()) {
+            Some(content_type) => {
+                let content_type = content_type.to_lowercase();
+                !COMPRESSED_CONTENT_TYPES
+                    .iter()
+                    .any(|compressed| content_type.starts_with(compressed))
+            }
+            None => true,
+        }
+    }
+
+    /// Compresses the body of the response, or sets up the compression of its stream.
+    pub async fn compress(&self, response: &mut Response, req: &HttpRequest) {
+        if !self.is_compressible(response) {
+            return;
+        }
+
+        // the response depends on the header whether it is compressed or not
+        vary_on_accept_encoding(response);
+
+        let Some(encoding) = negotiate(req.headers(), &self.algorithms) else {
+            return;
+        };
+        if response.stream.is_some() || response.description.len() < BLOCKING_COMPRESSION_MIN_SIZE {
+            self.encode(response, encoding);
+            return;
+        }
+
+        let (body, level) = (response.description.clone(), self.level(encoding));
+        match tokio::task::spawn_blocking(move || compress_body(&body, encoding, level)).await {
+            Ok(Ok(compressed)) => set_encoded_body(response, encoding, compressed),
+            Ok(Err(e)) => log::error!("Failed to compress the response body: {}", e),
+            Err(e) => log::error!("The compression task failed: {}", e),
+        }
+    }
+
+    /// Encodes a compressible response, leaving it untouched if the compression fails.
+    pub fn encode(&self, response: &mut Response, encoding: ContentEncoding) {
+        let level = self.level(encoding);
+
+        if let Some(stream) = response.stream.as_mut() {
+            stream.encoding = Some((encoding, level));
+            set_content_encoding(response, encoding);
+            return;
+        }
+
+        match compress_body(&response.description, encoding, level) {
+            Ok(compressed) => set_encoded_body(response, encoding, compressed),
+            Err(e) => log::error!("Failed to compress the response body: {}", e),
+        }
+    }
+}
+
+fn compress_body(body: &[u8], encoding: ContentEncoding, level: u32) -> io::Result<Bytes> {
+    let mut encoder = Encoder::new(encoding, level)?;
+    encoder.write(body)?;
+    encoder.finish()
+}
+
+fn set_encoded_body(response: &mut Response, encoding: ContentEncoding, body: Bytes) {
+    response.description = body;
+    set_content_encoding(response, encoding);
+}
+
+fn set_content_encoding(response: &mut Response, encoding: ContentEncoding) {
+    response
+        .headers
+        .set("content-encoding".to_string(), encoding.name().to_string());
+    response.headers.remove("content-length");
+    // the compressed body is a different representation of the resource
+    if let Some(etag) = response.headers.get("etag".to_string()) {
+        if !etag.starts_with("W/") {
+            response
+                .headers
+                .set("etag".to_string(), format!("W/{etag}"));
+        }
+    }
+}
+
+/// Picks among `encodings` the one the client prefers, their order breaking the ties.
+pub fn negotiate(headers: &HeaderMap, encodings: &[ContentEncoding]) -> Option<ContentEncoding> {
+    let mut accepted: Vec<(&str, f32)> = Vec::new();
+    for value in headers.get_all(header::ACCEPT_ENCODING) {
+        let Ok(value) = value.to_str() else {
+            continue;
+        };
+        for item in value.split(',') {
+            let mut parts = item.split(';');
+            let name = parts.next().unwrap_or_default().trim();
+            let quality = parts
+                .find_map(|param| param.trim().strip_prefix("q="))
+                .and_then(|quality| quality.trim().parse::<f32>().ok())
+                .unwrap_or(1.0);
+            accepted.push((name, quality));
+        }
+    }
+
+    let quality_of = |encoding: ContentEncoding| {
+        accepted
+            .iter()
+            .find(|(name, _)| name.eq_ignore_ascii_case(encoding.name()))
+            .or_else(|| accepted.iter().find(|(name, _)| *name == "*"))
+            .map(|(_, quality)| *quality)
+            .unwrap_or(0.0)
+    };
+
+    let mut best: Option<(ContentEncoding, f32)> = None;
+    for &encoding in encodings {
+        let quality = quality_of(encoding);
+        if quality > 0.0 && best.map_or(true, |(_, best_quality)| quality > best_quality) {
+            best = Some((encoding, quality));
+        }
+    }
+    best.map(|(encoding, _)| encoding)
+}
+
+/// Collects the output of the encoders.
+pub struct Writer {
+    buffer: BytesMut,
+}
+
+impl Writer {
+    fn new() -> Self {
+        Self {
+            buffer: BytesMut::new(),
+        }
+    }
+
+    fn take(&mut self) -> Bytes {
+        self.buffer.split().freeze()
+    }
+}
+
+impl Write for Writer {
+    fn write(&mut self, data: &[u8]) -> io::Result<usize> {
+        self.buffer.extend_from_slice(data);
+        Ok(data.len())
+    }
+
+    fn flush(&mut self) -> io::Result<()> {
+        Ok(())
+    }
+}
+
+pub enum Encoder {
+    Brotli(Box<brotli::CompressorWriter<Writer>>),
+    Zstd(zstd::stream::write::Encoder<'static, Writer>),
+    Gzip(GzEncoder<Writer>),
+}
+
+impl Encoder {
+    pub fn new(encoding: ContentEncoding, level: u32) -> io::Result<Self> {
+        Ok(match encoding {
+            ContentEncoding::Brotli => Self::Brotli(Box::new(brotli::CompressorWriter::new(
+                Writer::new(),
+                32 * 1024,
+                level,
+                22,
+            ))),
+            ContentEncoding::Zstd => Self::Zstd(zstd::stream::write::Encoder::new(
+                Writer::new(),
+                level as i32,
+            )?),
+            ContentEncoding::Gzip => {
+                Self::Gzip(GzEncoder::new(Writer::new(), Compression::new(level)))
+            }
+        })
+    }
+
+    pub fn write(&mut self, data: &[u8]) -> io::Result<()> {
+        match self {
+            Self::Brotli(encoder) => encoder.write_all(data),
+            Self::Zstd(encoder) => encoder.write_all(data),
+            Self::Gzip(encoder) => encoder.write_all(data),
+        }
+    }
+
+    /// Writes a chunk of a stream, flushing it so that it can be sent right away.
+    pub fn write_chunk(&mut self, data: &[u8]) -> io::Result<Bytes> {
+        self.write(data)?;
+        match self {
+            Self::Brotli(encoder) => {
+                encoder.flush()?;
+                Ok(encoder.get_mut().take())
+            }
+            Self::Zstd(encoder) => {
+                encoder.flush()?;
+                Ok(encoder.get_mut().take())
+            }
+            Self::Gzip(encoder) => {
+                encoder.flush()?;
+                Ok(encoder.get_mut().take())
+            }
+        }
+    }
+
+    pub fn finish(self) -> io::Result<Bytes> {
+        match self {
+            Self::Brotli(encoder) => Ok(encoder.into_inner().take()),
+            Self::Zstd(encoder) => Ok(encoder.finish()?.take()),
+            Self::Gzip(encoder) => Ok(encoder.finish()?.take()),
+        }
+    }
+}
+
+/// Marks the response as depending on the `Accept-Encoding` request header, unless it already is.
+pub fn vary_on_accept_encoding(response: &mut Response) {
+    let varies = response.headers.values("vary").any(|vary| {
+        vary.split(',')
+            .any(|name| name.trim().eq_ignore_ascii_case("accept-encoding"))
+    });
+    if !varies {
+        response
+            .headers
+            .append("vary".to_string(), "Accept-Encoding".to_string());
+    }
+}
@@ -0,0 +1,170 @@
+use std::{
+    collections::HashMap,
+    fs,
+    path::{PathBuf, MAIN_SEPARATOR},
+    sync::Arc,
+};
+
+use actix_files::{file_extension_to_mime, NamedFile};
+use actix_web::{
+    guard,
+    http::header::{self, HeaderMap, HeaderValue},
+    web, HttpRequest, HttpResponse, Resource,
+};
+use log::debug;
+
+use super::{negotiate, ContentEncoding};
+
+/// The sidecars looked for next to the static files, in order of preference.
+const SIDECAR_ENCODINGS: [ContentEncoding; 3] = [
+    ContentEncoding::Brotli,
+    ContentEncoding::Zstd,
+    ContentEncoding::Gzip,
+];
+
+/// The `.br`, `.zst` and `.gz` sidecars found next to the files of a served directory.
+///
+/// The directory is scanned once at startup, the files added later are served uncompressed.
+pub struct PrecompressedFiles {
+    route: String,
+    directory: PathBuf,
+    index_file: Option<String>,
+    // keyed by the path of the original file relative to the directory
+    files: HashMap<String, Vec<ContentEncoding>>,
+}
+
+impl PrecompressedFiles {
+    pub fn scan(route: &str, directory_path: &str, index_file: Option<String>) -> Self {
+        let directory = PathBuf::from(directory_path);
+        let mut files: HashMap<String, Vec<ContentEncoding>> = HashMap::new();
+
+        let mut pending = vec![directory.clone()];
+        while let Some(current) = pending.pop() {
+            let Ok(entries) = fs::read_dir(&current) else {
+                continue;
+            };
+            for entry in entries.flatten() {
+                let path = entry.path();
+                // symlinks to directories are not followed, to not loop forever
+                if entry.file_type().is_ok_and(|file_type| file_type.is_dir()) {
+                    pending.push(path);
+                    continue;
+                }
+
+                let Some(encoding) = path.extension().and_then(|extension| {
+                    SIDECAR_ENCODINGS
+                        .into_iter()
+                        .find(|encoding| extension == encoding.extension())
+                }) else {
+                    continue;
+                };
+                let original = path.with_extension("");
+                if !original.is_file() {
+                    continue;
+                }
+                if let Some(relative) = original
+                    .strip_prefix(&directory)
+                    .ok()
+                    .and_then(|relative| relative.to_str())
+                {
+                    files
+                        .entry(relative.replace(MAIN_SEPARATOR, "/"))
+                        .or_default()
+                        .push(encoding);
+                }
+            }
+        }
+
+        for encodings in files.values_mut() {
+            encodings.sort_by_key(|encoding| {
+                SIDECAR_ENCODINGS
+                    .iter()
+                    .position(|sidecar_encoding| sidecar_encoding == encoding)
+            });
+        }
+
+        Self {
+            route: route.trim_end_matches('/').to_string(),
+            directory,
+            index_file,
+            files,
+        }
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.files.is_empty()
+    }
+
+    /// The original file and the encoding of its sidecar to serve, if the client accepts one.
+    ///
+    /// The path is matched as is, the files whose name needs to be percent-encoded
+    /// are served uncompressed by `Files`.
+    fn find(&self, path: &str, headers: &HeaderMap) -> Option<(PathBuf, ContentEncoding)> {
+        let relative = path.strip_prefix(self.route.as_str())?;
+        // the directory itself is redirected to its trailing slash by `Files`
+        if !relative.starts_with('/') {
+            return None;
+        }
+        let relative = relative.trim_start_matches('/');
+        let relative = match &self.index_file {
+            Some(index_file) if relative.is_empty() || relative.ends_with('/') => {
+                format!("{relative}{index_file}")
+            }
+            _ => relative.to_string(),
+        };
+
+        let encoding = negotiate(headers, self.files.get(&relative)?)?;
+        Some((self.directory.join(relative), encoding))
+    }
+
+    async fn serve(&self, req: &HttpRequest) -> HttpResponse {
+        let Some((original, encoding)) = self.find(req.path(), req.headers()) else {
+            return HttpResponse::NotFound().finish();
+        };
+
+        let mut sidecar = original.clone().into_os_string();
+        sidecar.push(".");
+        sidecar.push(encoding.extension());
+
+        match NamedFile::open_async(&sidecar).await {
+            Ok(file) => {
+                let content_type = file_extension_to_mime(
+                    original
+                        .extension()
+                        .and_then(|extension| extension.to_str())
+                        .unwrap_or_default(),
+                );
+                let mut response = file
+                    .set_content_type(content_type)
+                    .set_content_encoding(encoding.header())
+                    .disable_content_disposition()
+                    .into_response(req);
+                response
+                    .headers_mut()
+                    .append(header::VARY, HeaderValue::from_static("accept-encoding"));
+                response
+            }
+            Err(e) => {
+                debug!("Failed to open the sidecar {:?}: {}", sidecar, e);
+                HttpResponse::NotFound().finish()
+            }
+        }
+    }
+}
+
+/// Serves the precompressed sidecars of a directory, the other requests fall through to `Files`.
+pub fn precompressed_files_service(files: Arc<PrecompressedFiles>) -> Resource {
+    let guard_files = files.clone();
+
+    web::resource(format!("{}/{{tail:.*}}", files.route))
+        .guard(guard::Any(guard::Get()).or(guard::Head()))
+        .guard(guard::fn_guard(move |ctx| {
+            guard_files
+                .find(ctx.head().uri.path(), &ctx.head().headers)
+                .is_some()
+        }))
+        .to(move |req: HttpRequest| {
+            let files = files.clone();
+            async move { files.serve(&req).await }
+        })
+}
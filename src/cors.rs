@@ -0,0 +1,190 @@
+use actix_web::{
+    http::{header, Method},
+    web::Bytes,
+    HttpRequest,
+};
+
+use crate::types::{headers::Headers, response::Response};
+
+/// Cross-origin resource sharing, answered from Rust without calling Python.
+///
+/// Preflight requests get a bodyless 204, the other requests from an allowed origin
+/// get the `Access-Control-Allow-*` headers on their response. The other requests from
+/// a disallowed origin are served without them, or get a 403 with `reject_disallowed`.
+#[derive(Debug, Clone)]
+pub struct CorsConfig {
+    any_origin: bool,
+    origins: Vec<String>,
+    allow_methods: String,
+    allow_headers: String,
+    expose_headers: Option<String>,
+    allow_credentials: bool,
+    max_age: Option<u64>,
+    reject_disallowed: bool,
+}
+
+impl CorsConfig {
+    pub fn new(
+        origins: Vec<String>,
+        methods: Vec<String>,
+        headers: Vec<String>,
+        expose_headers: Vec<String>,
+        allow_credentials: bool,
+        max_age: Option<u64>,
+        reject_disallowed: bool,
+    ) -> Self {
+        Self {
+            any_origin: origins.iter().any(|origin| origin == "*"),
+            // browsers send the origin without a trailing slash
+            origins: origins
+                .iter()
+                .map(|origin| origin.trim_end_matches('/').to_string())
+                .collect(),
+            allow_methods: methods.join(", "),
+            allow_headers: headers.join(", "),
+            expose_headers: (!expose_headers.is_empty()).then(|| expose_headers.join(", ")),
+            allow_credentials,
+            max_age,
+            reject_disallowed,
+        }
+    }
+
+    fn is_allowed(&self, origin: &str) -> bool {
+        self.any_origin || self.origins.iter().any(|allowed| allowed == origin)
+    }
+
+    /// The wildcard can not be used along with credentials, the origin is reflected instead.
+    fn allow_origin(&self, origin: &str) -> String {
+        if self.any_origin && !self.allow_credentials {
+            "*".to_string()
+        } else {
+            origin.to_string()
+        }
+    }
+
+    fn is_reflected(&self) -> bool {
+        !self.any_origin || self.allow_credentials
+    }
+
+    /// The response to a preflight request, None if the request is not one.
+    pub fn preflight(&self, req: &HttpRequest) -> Option<Response> {
+        if *req.method() != Method::OPTIONS
+            || !req
+                .headers()
+                .contains_key(header::ACCESS_CONTROL_REQUEST_METHOD)
+        {
+            return None;
+        }
+        let origin = req.headers().get(header::ORIGIN)?.to_str().ok()?;
+
+        let mut headers = Headers::new(None);
+        headers.set(
+            "vary".to_string(),
+            "Origin, Access-Control-Request-Method, Access-Control-Request-Headers".to_string(),
+        );
+        if !self.is_allowed(origin) {
+            return Some(forbidden(headers));
+        }
+
+        headers.set(
+            "access-control-allow-origin".to_string(),
+            self.allow_origin(origin),
+        );
+        headers.set(
+            "access-control-allow-methods".to_string(),
+            self.allow_methods.clone(),
+        );
+        let allow_headers = match req.headers().get(header::ACCESS_CONTROL_REQUEST_HEADERS) {
+            // the wildcard is not honoured by the browsers along with credentials
+            Some(request_headers) if self.allow_headers == "*" => {
+                request_headers.to_str().unwrap_or_default().to_string()
+            }
+            _ => self.allow_headers.clone(),
+        };
+        if !allow_headers.is_empty() {
+            headers.set("access-control-allow-headers".to_string(), allow_headers);
+        }
+        if self.allow_credentials {
+            headers.set(
+                "access-control-allow-credentials".to_string(),
+                "true".to_string(),
+            );
+        }
+        if let Some(max_age) = self.max_age {
+            headers.set("access-control-max-age".to_string(), max_age.to_string());
+        }
+
+        Some(Response {
+            status_code: 204,
+            response_type: "text".to_string(),
+            headers,
+            description: Bytes::new(),
+            file_path: None,
+            stream: None,
+        })
+    }
+
+    /// The 403 response to a request from a disallowed origin, None if the request is allowed
+    /// or if the disallowed origins are served without the CORS headers.
+    pub fn reject(&self, req: &HttpRequest) -> Option<Response> {
+        if !self.reject_disallowed {
+            return None;
+        }
+        let origin = req.headers().get(header::ORIGIN)?;
+        if origin.to_str().is_ok_and(|origin| self.is_allowed(origin)) {
+            return None;
+        }
+
+        let mut headers = Headers::new(None);
+        headers.set("vary".to_string(), "Origin".to_string());
+        Some(forbidden(headers))
+    }
+
+    /// Adds the CORS headers to the response of a request from an allowed origin.
+    pub fn apply(&self, req: &HttpRequest, response: &mut Response) {
+        if self.is_reflected() {
+            response
+                .headers
+                .append("vary".to_string(), "Origin".to_string());
+        }
+
+        let Some(origin) = req
+            .headers()
+            .get(header::ORIGIN)
+            .and_then(|origin| origin.to_str().ok())
+        else {
+            return;
+        };
+        if !self.is_allowed(origin) {
+            return;
+        }
+
+        response.headers.set(
+            "access-control-allow-origin".to_string(),
+            self.allow_origin(origin),
+        );
+        if self.allow_credentials {
+            response.headers.set(
+                "access-control-allow-credentials".to_string(),
+                "true".to_string(),
+            );
+        }
+        if let Some(expose_headers) = &self.expose_headers {
+            response.headers.set(
+                "access-control-expose-headers".to_string(),
+                expose_headers.clone(),
+            );
+        }
+    }
+}
+
+fn forbidden(headers: Headers) -> Response {
+    Response {
+        status_code: 403,
+        response_type: "text".to_string(),
+        headers,
+        description: Bytes::new(),
+        file_path: None,
+        stream: None,
+    }
+}
@@ -0,0 +1,142 @@
+use futures::channel::oneshot;
+use futures::Future;
+use pyo3::{exceptions::PyRuntimeError, prelude::*, sync::GILOnceCell, types::PyDict};
+use pyo3_asyncio::TaskLocals;
+
+#[cfg(unix)]
+use crate::executors::worker_loop::is_current as is_worker_loop;
+
+type TaskSender = oneshot::Sender<PyResult<PyObject>>;
+
+/// `asyncio.Task` if it can start its coroutine eagerly, i.e. on Python 3.12 and above.
+static EAGER_TASK: GILOnceCell<Option<PyObject>> = GILOnceCell::new();
+
+fn eager_task(py: Python) -> PyResult<Option<&PyAny>> {
+    let task = EAGER_TASK.get_or_try_init(py, || -> PyResult<Option<PyObject>> {
+        if py.version_info() < (3, 12) {
+            return Ok(None);
+        }
+        Ok(Some(py.import("asyncio")?.getattr("Task")?.into()))
+    })?;
+    Ok(task.as_ref().map(|task| task.as_ref(py)))
+}
+
+/// Converts a coroutine into a Rust future, like `pyo3_asyncio::tokio::into_future`,
+/// but starts it eagerly, the way `asyncio.eager_task_factory` does.
+///
+/// The coroutine is run up to its first suspension in the callback that hands it over to the
+/// event loop. A coroutine that returns without suspending, e.g. an early return on a
+/// validation failure or a cache hit, sends its result back from there: no task is scheduled
+/// and the loop does not go through two more iterations to step it and to call its done
+/// callback. Only a coroutine that really awaits goes on as a task.
+///
+/// On the loop of the current worker (`ROBYN_LOOP_PER_WORKER`), the callback runs right away,
+/// on the caller's thread. The shared loop runs on the main thread, so the callback goes
+/// through `call_soon_threadsafe` and runs once that loop wakes up. Python versions before
+/// 3.12 can't start a task eagerly, and schedule it in the callback as `into_future` does.
+pub fn into_eager_future(
+    awaitable: &PyAny,
+) -> PyResult<impl Future<Output = PyResult<PyObject>> + Send> {
+    let py = awaitable.py();
+    let locals = pyo3_asyncio::tokio::get_current_locals(py)?;
+    let (tx, rx) = oneshot::channel();
+
+    let kwargs = PyDict::new(py);
+    kwargs.set_item("context", locals.context(py))?;
+    let event_loop = locals.event_loop(py);
+    let start = EagerStart {
+        awaitable: awaitable.into(),
+        locals: locals.clone(),
+        tx: Some(tx),
+    };
+    if is_worker_loop(event_loop) {
+        event_loop.call_method("run_now", (start,), Some(kwargs))?;
+    } else {
+        event_loop.call_method("call_soon_threadsafe", (start,), Some(kwargs))?;
+    }
+
+    Ok(async move {
+        rx.await.unwrap_or_else(|_| {
+            Err(PyRuntimeError::new_err(
+                "The event loop dropped the task of the coroutine",
+            ))
+        })
+    })
+}
+
+#[cfg(not(unix))]
+fn is_worker_loop(_event_loop: &PyAny) -> bool {
+    false
+}
+
+fn task_result(task: &PyAny) -> PyResult<PyObject> {
+    task.call_method0("result").map(|result| result.into())
+}
+
+/// Starts the coroutine on the event loop, called by the loop itself.
+#[pyclass]
+struct EagerStart {
+    awaitable: PyObject,
+    locals: TaskLocals,
+    tx: Option<TaskSender>,
+}
+
+#[pymethods]
+impl EagerStart {
+    fn __call__(&mut self, py: Python) -> PyResult<()> {
+        let tx = match self.tx.take() {
+            Some(tx) => tx,
+            None => return Ok(()),
+        };
+
+        let task = match self.start(py) {
+            Ok(task) => task,
+            Err(e) => {
+                let _ = tx.send(Err(e));
+                return Ok(());
+            }
+        };
+
+        if task.call_method0("done")?.is_true()? {
+            let _ = tx.send(task_result(task));
+        } else {
+            task.call_method1("add_done_callback", (TaskCompleter { tx: Some(tx) },))?;
+        }
+        Ok(())
+    }
+}
+
+impl EagerStart {
+    fn start<'a>(&self, py: Python<'a>) -> PyResult<&'a PyAny> {
+        let awaitable = self.awaitable.as_ref(py);
+        let asyncio = py.import("asyncio")?;
+        let is_coroutine = asyncio
+            .call_method1("iscoroutine", (awaitable,))?
+            .is_true()?;
+        match eager_task(py)? {
+            Some(task) if is_coroutine => {
+                let kwargs = PyDict::new(py);
+                kwargs.set_item("loop", self.locals.event_loop(py))?;
+                kwargs.set_item("context", self.locals.context(py))?;
+                kwargs.set_item("eager_start", true)?;
+                task.call((awaitable,), Some(kwargs))
+            }
+            _ => asyncio.call_method1("ensure_future", (awaitable,)),
+        }
+    }
+}
+
+/// Sends the result of a task that suspended back to Rust once it is done.
+#[pyclass]
+struct TaskCompleter {
+    tx: Option<TaskSender>,
+}
+
+#[pymethods]
+impl TaskCompleter {
+    fn __call__(&mut self, task: &PyAny) {
+        if let Some(tx) = self.tx.take() {
+            let _ = tx.send(task_result(task));
+        }
+    }
+}
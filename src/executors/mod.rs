@@ -1,17 +1,27 @@
 #[deny(clippy::if_same_then_else)]
 /// This is the module that has all the executor functions
 /// i.e. the functions that have the responsibility of parsing and executing functions.
+pub mod eager_task;
 pub mod web_socket_executors;
+#[cfg(unix)]
+pub mod worker_loop;
 
 use std::sync::Arc;
 
 use anyhow::Result;
-use log::debug;
+use log::{debug, error};
 use pyo3::prelude::*;
 use pyo3_asyncio::TaskLocals;
 
+use crate::executors::eager_task::into_eager_future;
+use crate::routers::pipeline::RoutePipeline;
 use crate::types::{
-    function_info::FunctionInfo, request::Request, response::Response, MiddlewareReturn,
+    blocking_pool::BlockingPool,
+    function_info::FunctionInfo,
+    headers::GlobalResponseHeaders,
+    request::{PyRequest, Request},
+    response::Response,
+    MiddlewareReturn,
 };
 
 #[inline]
@@ -25,27 +35,27 @@ where
 {
     let handler = function.handler.as_ref(py);
     let kwargs = function.kwargs.as_ref(py);
+
+    // handlers that take nothing but (optionally) injected dependencies
+    // never see the request, so we do not pay for converting it
+    if !function.consumes_input {
+        return match function.number_of_params {
+            0 => handler.call0(),
+            _ => handler.call((), Some(kwargs)),
+        };
+    }
+
     let function_args = function_args.to_object(py);
     debug!("Function args: {:?}", function_args);
 
     match function.number_of_params {
-        0 => handler.call0(),
-        1 => {
-            if kwargs.get_item("global_dependencies")?.is_some()
-                || kwargs.get_item("router_dependencies")?.is_some()
-            // these are reserved keywords
-            {
-                handler.call((), Some(kwargs))
-            } else {
-                handler.call1((function_args,))
-            }
-        }
+        1 => handler.call1((function_args,)),
         _ => handler.call((function_args,), Some(kwargs)),
     }
 }
 
 // Execute the middleware function
-// type T can be either Request (before middleware) or Response (after middleware)
+// type T can be either PyRequest (before middleware) or Response (after middleware)
 // Return type can either be a Request or a Response, we wrap it inside an enum for easier handling
 #[inline]
 pub async fn execute_middleware_function<T>(
@@ -53,19 +63,22 @@ pub async fn execute_middleware_function<T>(
     function: &FunctionInfo,
 ) -> Result<MiddlewareReturn>
 where
-    T: for<'a> FromPyObject<'a> + ToPyObject,
+    T: ToPyObject,
 {
     if function.is_async {
-        let output: Py<PyAny> = Python::with_gil(|py| {
-            pyo3_asyncio::tokio::into_future(get_function_output(function, py, input)?)
-        })?
-        .await?;
+        let output: Py<PyAny> =
+            Python::with_gil(|py| into_eager_future(get_function_output(function, py, input)?))?
+                .await?;
 
         Python::with_gil(|py| -> Result<MiddlewareReturn> {
             let output_response = output.extract::<Response>(py);
             match output_response {
                 Ok(o) => Ok(MiddlewareReturn::Response(o)),
-                Err(_) => Ok(MiddlewareReturn::Request(output.extract::<Request>(py)?)),
+                Err(_) => Ok(MiddlewareReturn::Request(
+                    output
+                        .extract::<PyRef<PyRequest>>(py)?
+                        .to_shared_request(py)?,
+                )),
             }
         })
     } else {
@@ -74,7 +87,11 @@ where
             debug!("Middleware output: {:?}", output);
             match output.extract::<Response>() {
                 Ok(o) => Ok(MiddlewareReturn::Response(o)),
-                Err(_) => Ok(MiddlewareReturn::Request(output.extract::<Request>()?)),
+                Err(_) => Ok(MiddlewareReturn::Request(
+                    output
+                        .extract::<PyRef<PyRequest>>()?
+                        .to_shared_request(py)?,
+                )),
             }
         })
     }
@@ -82,13 +99,29 @@ where
 
 #[inline]
 pub async fn execute_http_function(
-    request: &Request,
+    request: &Arc<Request>,
     function: &FunctionInfo,
+    blocking_pool: Option<(&BlockingPool, &TaskLocals)>,
 ) -> PyResult<Response> {
+    if let (false, Some((blocking_pool, task_locals))) = (function.is_async, blocking_pool) {
+        let (request, function) = (
+            PyRequest::from_request(Arc::clone(request)),
+            function.clone(),
+        );
+        return blocking_pool
+            .run(task_locals.clone(), move || {
+                Python::with_gil(|py| -> PyResult<Response> {
+                    get_function_output(&function, py, &request)?.extract()
+                })
+            })
+            .await?;
+    }
+
+    let request = PyRequest::from_request(Arc::clone(request));
     if function.is_async {
         let output = Python::with_gil(|py| {
-            let function_output = get_function_output(function, py, request)?;
-            pyo3_asyncio::tokio::into_future(function_output)
+            let function_output = get_function_output(function, py, &request)?;
+            into_eager_future(function_output)
         })?
         .await?;
 
@@ -96,7 +129,163 @@ pub async fn execute_http_function(
     };
 
     Python::with_gil(|py| -> PyResult<Response> {
-        get_function_output(function, py, request)?.extract()
+        get_function_output(function, py, &request)?.extract()
+    })
+}
+
+/// What the synchronous pipeline of a route ended with.
+pub enum SyncPipelineReturn {
+    /// A before middleware answered, or a middleware failed, and the response is sent as is
+    Aborted(Response),
+    Completed(Response),
+}
+
+/// The response of a synchronous pipeline, only extracted to Rust when needed.
+enum PipelineResponse {
+    Rust(Response),
+    Python(PyObject),
+}
+
+/// Runs the before middlewares, the handler and the after middlewares of a route whose
+/// functions are all synchronous, under a single acquisition of the GIL.
+///
+/// The request is converted to Python once and handed from one function to the next
+/// as a Python object, and so is the response. Only the final response is extracted
+/// back to Rust, along with the handler response if it is cached or if the global response
+/// headers are added to it before the after middlewares.
+/// Errors are handled the same way as when the functions are executed one by one.
+pub fn execute_sync_pipeline(
+    request: &Arc<Request>,
+    pipeline: &RoutePipeline,
+    cache_key: Option<String>,
+    global_response_headers: Option<&GlobalResponseHeaders>,
+    endpoint: &str,
+) -> SyncPipelineReturn {
+    let (before_middlewares, after_middlewares) =
+        (&pipeline.before_middlewares, &pipeline.after_middlewares);
+    let function = pipeline.function();
+    let cache = pipeline.cache().zip(cache_key);
+    let request = PyRequest::from_request(Arc::clone(request));
+
+    Python::with_gil(|py| {
+        let mut request_object: Option<PyObject> = None;
+        for before_middleware in before_middlewares {
+            let output = match &request_object {
+                Some(input) => get_function_output(before_middleware, py, input),
+                None => get_function_output(before_middleware, py, &request),
+            };
+            let e = match output {
+                Ok(output) if output.is_instance_of::<PyRequest>() => {
+                    request_object = Some(output.into());
+                    continue;
+                }
+                // If a before middleware returns a response, we abort the request and return the response
+                Ok(output) => match output.extract::<Response>() {
+                    Ok(response) => return SyncPipelineReturn::Aborted(response),
+                    Err(e) => e,
+                },
+                Err(e) => e,
+            };
+            error!(
+                "Error while executing before middleware function for endpoint `{}`: {}",
+                endpoint,
+                get_traceback(&e)
+            );
+            return SyncPipelineReturn::Aborted(Response::internal_server_error(None));
+        }
+
+        let cached_response = cache.as_ref().and_then(|(cache, key)| cache.get(key));
+        let response = match (cached_response, function) {
+            (Some(cached_response), _) => Ok(PipelineResponse::Rust(cached_response)),
+            // the paths without a route still go through the middlewares
+            (None, None) => Ok(PipelineResponse::Rust(Response::not_found(None))),
+            (None, Some(function)) => match &request_object {
+                Some(input) => get_function_output(function, py, input),
+                None => get_function_output(function, py, &request),
+            }
+            .and_then(|output| {
+                if cache.is_none()
+                    && global_response_headers.is_none()
+                    && !after_middlewares.is_empty()
+                {
+                    return Ok(PipelineResponse::Python(output.into()));
+                }
+                let response: Response = output.extract()?;
+                if let Some((cache, key)) = cache {
+                    cache.insert(key, &response);
+                }
+                Ok(PipelineResponse::Rust(response))
+            }),
+        };
+        let response = response.unwrap_or_else(|e| {
+            error!(
+                "Error while executing route function for endpoint `{}`: {}",
+                endpoint,
+                get_traceback(&e)
+            );
+            PipelineResponse::Rust(Response::internal_server_error(None))
+        });
+
+        let mut response_object = match response {
+            PipelineResponse::Rust(response) if after_middlewares.is_empty() => {
+                return SyncPipelineReturn::Completed(response);
+            }
+            PipelineResponse::Rust(mut response) => {
+                if let Some(global_response_headers) = global_response_headers {
+                    global_response_headers.extend_into(&mut response.headers);
+                }
+                response.to_object(py)
+            }
+            PipelineResponse::Python(response_object) => response_object,
+        };
+
+        for after_middleware in after_middlewares {
+            match get_function_output(after_middleware, py, &response_object) {
+                Ok(output) if output.is_instance_of::<PyRequest>() => {
+                    error!("After middleware returned a request");
+                }
+                Ok(output) => {
+                    response_object = output.into();
+                    continue;
+                }
+                Err(e) => error!(
+                    "Error while executing after middleware function for endpoint `{}`: {}",
+                    endpoint,
+                    get_traceback(&e)
+                ),
+            }
+            let headers = response_object
+                .extract::<Response>(py)
+                .map(|response| response.headers)
+                .ok();
+            return SyncPipelineReturn::Aborted(Response::internal_server_error(headers.as_ref()));
+        }
+
+        match response_object.extract::<Response>(py) {
+            Ok(response) => SyncPipelineReturn::Completed(response),
+            Err(e) => {
+                error!(
+                    "Error while executing after middleware function for endpoint `{}`: {}",
+                    endpoint,
+                    get_traceback(&e)
+                );
+                SyncPipelineReturn::Aborted(Response::internal_server_error(None))
+            }
+        }
+    })
+}
+
+pub fn get_traceback(error: &PyErr) -> String {
+    Python::with_gil(|py| -> String {
+        if let Some(traceback) = error.traceback(py) {
+            let msg = match traceback.format() {
+                Ok(msg) => format!("\n{msg} {error}"),
+                Err(e) => e.to_string(),
+            };
+            return msg;
+        };
+
+        error.value(py).to_string()
     })
 }
 
@@ -0,0 +1,209 @@
+//! The event loops of the actix workers (`ROBYN_LOOP_PER_WORKER`).
+//!
+//! A worker does not hand its coroutines over to a loop running on another thread: it owns a
+//! `robyn.worker_loop.WorkerEventLoop` and runs it a step at a time, from a task spawned on its
+//! own runtime, whenever the loop has callbacks due or I/O to process.
+
+use std::cmp::Reverse;
+use std::collections::BinaryHeap;
+use std::os::unix::io::{AsRawFd, RawFd};
+use std::sync::Arc;
+use std::time::Duration;
+
+use log::{debug, error};
+use once_cell::sync::Lazy;
+use once_cell::unsync::OnceCell;
+use parking_lot::{const_mutex, Condvar, Mutex};
+use pyo3::prelude::*;
+use pyo3_asyncio::TaskLocals;
+use tokio::io::unix::AsyncFd;
+use tokio::io::Interest;
+use tokio::sync::{watch, Notify};
+use tokio::time::{sleep_until, Instant};
+
+thread_local! {
+    static WORKER_LOOP: OnceCell<TaskLocals> = OnceCell::new();
+}
+
+/// Set once the server stops, to stop the loops of all the workers.
+static STOP: Lazy<watch::Sender<bool>> = Lazy::new(|| watch::channel(false).0);
+static OPEN_LOOPS: Mutex<usize> = const_mutex(0);
+static LOOP_CLOSED: Condvar = Condvar::new();
+
+/// The task locals of the event loop of the current worker, started on first use.
+///
+/// Must be called on the worker thread, from within its actix runtime.
+pub fn task_locals() -> PyResult<TaskLocals> {
+    WORKER_LOOP.with(|task_locals| {
+        task_locals
+            .get_or_try_init(|| Python::with_gil(start))
+            .cloned()
+    })
+}
+
+/// Whether `event_loop` is the loop of the current worker, i.e. it can be run on this thread.
+pub fn is_current(event_loop: &PyAny) -> bool {
+    WORKER_LOOP.with(|task_locals| {
+        task_locals
+            .get()
+            .is_some_and(|task_locals| task_locals.event_loop(event_loop.py()).is(event_loop))
+    })
+}
+
+/// Stops the loops of all the workers, and waits for them to close, up to `timeout`.
+pub fn stop_all(timeout: Duration) {
+    STOP.send_replace(true);
+
+    let mut open_loops = OPEN_LOOPS.lock();
+    let deadline = std::time::Instant::now() + timeout;
+    while *open_loops > 0 {
+        if LOOP_CLOSED
+            .wait_until(&mut open_loops, deadline)
+            .timed_out()
+        {
+            error!("{} worker event loops did not close in time", *open_loops);
+            return;
+        }
+    }
+}
+
+fn start(py: Python) -> PyResult<TaskLocals> {
+    let wakeups = Arc::new(Wakeups::default());
+    let event_loop: PyObject = py
+        .import("robyn.worker_loop")?
+        .getattr("WorkerEventLoop")?
+        .call1((LoopWaker {
+            wakeups: wakeups.clone(),
+        },))?
+        .into();
+    py.import("asyncio")?
+        .call_method1("set_event_loop", (event_loop.as_ref(py),))?;
+    let selector = AsyncFd::with_interest(
+        SelectorFd(event_loop.call_method0(py, "fileno")?.extract(py)?),
+        Interest::READABLE,
+    )?;
+    let task_locals = TaskLocals::new(event_loop.as_ref(py)).copy_context(py)?;
+
+    *OPEN_LOOPS.lock() += 1;
+    actix_web::rt::spawn(drive(
+        LoopGuard {
+            event_loop,
+            selector: Some(selector),
+        },
+        wakeups,
+        STOP.subscribe(),
+    ));
+    Ok(task_locals)
+}
+
+/// Runs a step of the loop whenever it has something to do, until the server stops.
+async fn drive(event_loop: LoopGuard, wakeups: Arc<Wakeups>, mut stop: watch::Receiver<bool>) {
+    let selector = match &event_loop.selector {
+        Some(selector) => selector,
+        None => return,
+    };
+    while !*stop.borrow() {
+        let deadline = wakeups.next_deadline();
+        tokio::select! {
+            _ = wakeups.notify.notified() => {}
+            readable = selector.readable() => match readable {
+                // the watch is edge triggered, a step that leaves I/O behind asks for another one
+                Ok(mut guard) => guard.clear_ready(),
+                Err(e) => {
+                    error!("Failed to watch the selector of the worker event loop: {}", e);
+                    break;
+                }
+            },
+            _ = sleep_until(deadline.unwrap_or_else(Instant::now)), if deadline.is_some() => {}
+            _ = stop.changed() => break,
+        }
+
+        wakeups.remove_due(Instant::now());
+        let io_pending = Python::with_gil(|py| {
+            event_loop
+                .event_loop
+                .call_method0(py, "run_once")
+                .and_then(|io_pending| io_pending.extract::<bool>(py))
+        });
+        match io_pending {
+            Ok(true) => wakeups.notify.notify_one(),
+            Ok(false) => {}
+            Err(e) => error!("The worker event loop failed to run: {}", e),
+        }
+    }
+}
+
+/// Closes the loop of a worker once its driver is done, whether it stopped or was dropped.
+struct LoopGuard {
+    event_loop: PyObject,
+    selector: Option<AsyncFd<SelectorFd>>,
+}
+
+impl Drop for LoopGuard {
+    fn drop(&mut self) {
+        debug!("Closing the event loop of a worker");
+        // the selector is closed with the loop, it has to be unwatched first
+        self.selector.take();
+        if let Err(e) = Python::with_gil(|py| self.event_loop.call_method0(py, "shutdown")) {
+            error!("Failed to close the event loop of a worker: {}", e);
+        }
+        *OPEN_LOOPS.lock() -= 1;
+        LOOP_CLOSED.notify_all();
+    }
+}
+
+struct SelectorFd(RawFd);
+
+impl AsRawFd for SelectorFd {
+    fn as_raw_fd(&self) -> RawFd {
+        self.0
+    }
+}
+
+/// When the loop wants to run next, as told by its `wake` callback.
+#[derive(Default)]
+struct Wakeups {
+    notify: Notify,
+    deadlines: Mutex<BinaryHeap<Reverse<Instant>>>,
+}
+
+impl Wakeups {
+    fn next_deadline(&self) -> Option<Instant> {
+        self.deadlines
+            .lock()
+            .peek()
+            .map(|Reverse(deadline)| *deadline)
+    }
+
+    fn remove_due(&self, now: Instant) {
+        let mut deadlines = self.deadlines.lock();
+        while deadlines
+            .peek()
+            .is_some_and(|Reverse(deadline)| *deadline <= now)
+        {
+            deadlines.pop();
+        }
+    }
+}
+
+/// The `wake` callback of a worker event loop.
+#[pyclass]
+struct LoopWaker {
+    wakeups: Arc<Wakeups>,
+}
+
+#[pymethods]
+impl LoopWaker {
+    fn __call__(&self, delay: f64) {
+        if delay > 0.0 {
+            let deadline = Duration::try_from_secs_f64(delay)
+                .ok()
+                .and_then(|delay| Instant::now().checked_add(delay));
+            if let Some(deadline) = deadline {
+                self.wakeups.deadlines.lock().push(Reverse(deadline));
+            }
+        }
+        // also when a timer is added, so that the driver picks up its deadline
+        self.wakeups.notify.notify_one();
+    }
+}
@@ -1,8 +1,5 @@
-use std::fs::File;
-use std::io::Read;
-
+use actix_http::header::{HeaderMap, HeaderName, HeaderValue};
 use actix_web::HttpResponseBuilder;
-use anyhow::Result;
 
 use crate::types::headers::Headers;
 
@@ -10,24 +7,22 @@ use crate::types::headers::Headers;
 // probably inside the submodule of the http router
 #[inline]
 pub fn apply_hashmap_headers(response: &mut HttpResponseBuilder, headers: &Headers) {
-    for iter in headers.headers.iter() {
-        let (key, values) = iter.pair();
-        for value in values {
-            response.append_header((key.clone(), value.clone()));
-        }
+    for (key, value) in headers.iter() {
+        response.append_header((key, value));
     }
 }
 
-/// A function to read lossy files and serve it as a html response
-///
-/// # Arguments
-///
-/// * `file_path` - The file path that we want the function to read
-///
-// ideally this should be async
-pub fn read_file(file_path: &str) -> Result<Vec<u8>> {
-    let mut file = File::open(file_path)?;
-    let mut buf = vec![];
-    file.read_to_end(&mut buf)?;
-    Ok(buf)
+/// Sets the headers on an already built response, replacing the ones it had with the same name
+#[inline]
+pub fn override_hashmap_headers(response_headers: &mut HeaderMap, headers: &Headers) {
+    for (key, _) in headers.iter() {
+        if let Ok(name) = HeaderName::try_from(key) {
+            response_headers.remove(name);
+        }
+    }
+    for (key, value) in headers.iter() {
+        if let (Ok(name), Ok(value)) = (HeaderName::try_from(key), HeaderValue::try_from(value)) {
+            response_headers.append(name, value);
+        }
+    }
 }
@@ -1,3 +1,5 @@
+mod compression;
+mod cors;
 mod executors;
 mod io_helpers;
 mod routers;
@@ -12,12 +14,17 @@ use shared_socket::SocketHeld;
 // pyO3 module
 use pyo3::prelude::*;
 use types::{
+    blocking_pool::BlockingPool,
+    body_stream::BodyStream,
+    cache::Cache,
     function_info::{FunctionInfo, MiddlewareType},
     headers::Headers,
     identity::Identity,
     multimap::QueryParams,
+    rate_limit::RateLimit,
     request::PyRequest,
     response::PyResponse,
+    upload_file::UploadFile,
     HttpMethod, Url,
 };
 
@@ -42,6 +49,11 @@ pub fn robyn(_py: Python<'_>, m: &PyModule) -> PyResult<()> {
     m.add_class::<Identity>()?;
     m.add_class::<PyRequest>()?;
     m.add_class::<PyResponse>()?;
+    m.add_class::<BodyStream>()?;
+    m.add_class::<UploadFile>()?;
+    m.add_class::<BlockingPool>()?;
+    m.add_class::<Cache>()?;
+    m.add_class::<RateLimit>()?;
     m.add_class::<Url>()?;
     m.add_class::<QueryParams>()?;
     m.add_class::<MiddlewareType>()?;
@@ -2,28 +2,82 @@ use parking_lot::RwLock;
 use std::collections::HashMap;
 use std::sync::Arc;
 
+use crate::compression::{negotiate, vary_on_accept_encoding, CompressionConfig, ContentEncoding};
 use crate::executors::execute_http_function;
 use crate::types::function_info::FunctionInfo;
 use crate::types::request::Request;
 use crate::types::response::Response;
 use crate::types::HttpMethod;
+use actix_web::HttpRequest;
 use anyhow::Context;
 use log::debug;
 use matchit::Router as MatchItRouter;
+use pyo3::exceptions::PyValueError;
 use pyo3::types::PyAny;
 
 use anyhow::{Error, Result};
 
 use crate::routers::Router;
 
-type RouteMap = RwLock<MatchItRouter<Response>>;
+type RouteMap = RwLock<MatchItRouter<Arc<ConstResponse>>>;
+
+/// The response of a const route, along with its variants for each of
+/// the compression algorithms, so that they are only compressed once.
+#[derive(Debug)]
+pub struct ConstResponse {
+    response: Response,
+    encodings: Vec<ContentEncoding>,
+    compressed: Vec<Response>,
+}
+
+impl ConstResponse {
+    fn new(mut response: Response, compression: Option<&CompressionConfig>) -> Self {
+        let mut encodings = Vec::new();
+        let mut compressed = Vec::new();
+
+        if let Some(compression) = compression.filter(|compression| {
+            response.stream.is_none() && compression.is_compressible(&response)
+        }) {
+            for &encoding in &compression.algorithms {
+                let mut variant = response.clone();
+                vary_on_accept_encoding(&mut variant);
+                compression.encode(&mut variant, encoding);
+                if variant.headers.contains("content-encoding".to_string()) {
+                    encodings.push(encoding);
+                    compressed.push(variant);
+                }
+            }
+        }
+        // the identity variant is also a representation chosen by the header, shared caches must not
+        // send it to clients that accept a compressed one, or the other way around
+        if !compressed.is_empty() {
+            vary_on_accept_encoding(&mut response);
+        }
+
+        Self {
+            response,
+            encodings,
+            compressed,
+        }
+    }
+
+    /// The variant of the response in the encoding preferred by the client.
+    pub fn negotiate(&self, req: &HttpRequest) -> Response {
+        let variant = negotiate(req.headers(), &self.encodings).and_then(|encoding| {
+            let index = self.encodings.iter().position(|&e| e == encoding)?;
+            self.compressed.get(index)
+        });
+        variant.unwrap_or(&self.response).clone()
+    }
+}
 
 /// Contains the thread safe hashmaps of different routes
 pub struct ConstRouter {
     routes: HashMap<HttpMethod, Arc<RouteMap>>,
+    compression: RwLock<Option<CompressionConfig>>,
 }
 
-impl Router<Response, HttpMethod> for ConstRouter {
+impl Router<Arc<ConstResponse>, HttpMethod> for ConstRouter {
     /// Doesn't allow query params/body/etc as variables cannot be "memoized"/"const"ified
     fn add_route(
         &self,
@@ -39,22 +93,30 @@ impl Router<Response, HttpMethod> for ConstRouter {
             .clone();
 
         let route = route.to_string();
+        let compression = self.compression.read().clone();
         let event_loop =
             event_loop.context("Event loop must be provided to add a route to the const router")?;
 
         pyo3_asyncio::tokio::run_until_complete(event_loop, async move {
-            let output = execute_http_function(&Request::default(), &function)
+            let output = execute_http_function(&Arc::new(Request::default()), &function, None)
                 .await
                 .unwrap();
             debug!("This is the result of the output {:?}", output);
-            table.write().insert(route, output).unwrap();
+            if output.stream.is_some() {
+                // the iterator of the stream would be consumed by the first request
+                return Err(PyValueError::new_err(
+                    "A const route can't return a streaming response",
+                ));
+            }
+            let output = ConstResponse::new(output, compression.as_ref());
+            table.write().insert(route, Arc::new(output)).unwrap();
             Ok(())
         })?;
 
         Ok(())
     }
 
-    fn get_route(&self, route_method: &HttpMethod, route: &str) -> Option<Response> {
+    fn get_route(&self, route_method: &HttpMethod, route: &str) -> Option<Arc<ConstResponse>> {
         let table = self.routes.get(route_method)?;
         let route_map = table.read();
 
@@ -98,6 +160,14 @@ impl ConstRouter {
             HttpMethod::TRACE,
             Arc::new(RwLock::new(MatchItRouter::new())),
         );
-        Self { routes }
+        Self {
+            routes,
+            compression: RwLock::new(None),
+        }
+    }
+
+    /// Compresses the routes added from now on for each of the algorithms of the config
+    pub fn set_compression(&self, compression: Option<CompressionConfig>) {
+        *self.compression.write() = compression;
     }
 }
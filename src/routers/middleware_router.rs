@@ -1,4 +1,5 @@
 use std::collections::HashMap;
+use std::sync::atomic::{AtomicBool, Ordering};
 use std::sync::RwLock;
 
 use anyhow::{Context, Error, Result};
@@ -14,6 +15,7 @@ type RouteMap = RwLock<MatchItRouter<FunctionInfo>>;
 pub struct MiddlewareRouter {
     globals: HashMap<MiddlewareType, RwLock<Vec<FunctionInfo>>>,
     routes: HashMap<MiddlewareType, RouteMap>,
+    has_routes: AtomicBool,
 }
 
 impl Router<(FunctionInfo, HashMap<String, String>), MiddlewareType> for MiddlewareRouter {
@@ -27,6 +29,7 @@ impl Router<(FunctionInfo, HashMap<String, String>), MiddlewareType> for Middlew
         let table = self.routes.get(route_type).context("No relevant map")?;
 
         table.write().unwrap().insert(route.to_string(), function)?;
+        self.has_routes.store(true, Ordering::Relaxed);
 
         Ok(())
     }
@@ -63,7 +66,16 @@ impl MiddlewareRouter {
             MiddlewareType::AfterRequest,
             RwLock::new(MatchItRouter::new()),
         );
-        Self { globals, routes }
+        Self {
+            globals,
+            routes,
+            has_routes: AtomicBool::new(false),
+        }
+    }
+
+    /// Whether a middleware was added for a route, not only globally
+    pub fn has_routes(&self) -> bool {
+        self.has_routes.load(Ordering::Relaxed)
     }
 
     pub fn add_global_middleware(
@@ -6,6 +6,7 @@ use crate::types::function_info::FunctionInfo;
 pub mod const_router;
 pub mod http_router;
 pub mod middleware_router;
+pub mod pipeline;
 pub mod web_socket_router;
 
 pub trait Router<T, U> {
@@ -0,0 +1,258 @@
+use parking_lot::RwLock;
+use std::collections::{HashMap, HashSet};
+use std::sync::Arc;
+
+use log::warn;
+use matchit::Router as MatchItRouter;
+
+use crate::routers::const_router::{ConstResponse, ConstRouter};
+use crate::routers::http_router::HttpRouter;
+use crate::routers::middleware_router::MiddlewareRouter;
+use crate::routers::Router;
+use crate::types::blocking_pool::BlockingPool;
+use crate::types::cache::Cache;
+use crate::types::function_info::{FunctionInfo, MiddlewareType};
+use crate::types::rate_limit::RateLimit;
+use crate::types::HttpMethod;
+
+#[derive(Clone)]
+pub enum RouteHandler {
+    Const(Arc<ConstResponse>),
+    Function(FunctionInfo),
+}
+
+/// Everything that runs for the requests to a route: the before middlewares,
+/// the handler and the after middlewares, global ones first.
+pub struct RoutePipeline {
+    /// None if no route matches the path
+    pub handler: Option<RouteHandler>,
+    pub before_middlewares: Vec<FunctionInfo>,
+    pub after_middlewares: Vec<FunctionInfo>,
+    pub rate_limit: Option<RateLimit>,
+    /// The pool the synchronous functions run on, the one of the route or else the global one
+    pub blocking_pool: Option<BlockingPool>,
+    /// Whether the route middlewares depend on the request path, and not only on the route
+    middlewares_per_path: bool,
+}
+
+impl RoutePipeline {
+    pub fn function(&self) -> Option<&FunctionInfo> {
+        match &self.handler {
+            Some(RouteHandler::Function(function)) => Some(function),
+            _ => None,
+        }
+    }
+
+    /// Whether the handler of the route and every middleware are synchronous,
+    /// in which case the whole pipeline runs under a single GIL acquisition.
+    pub fn is_sync(&self) -> bool {
+        let handler_is_sync = match &self.handler {
+            Some(RouteHandler::Function(function)) => !function.is_async,
+            Some(RouteHandler::Const(_)) => false,
+            None => true,
+        };
+        handler_is_sync
+            && self
+                .before_middlewares
+                .iter()
+                .chain(&self.after_middlewares)
+                .all(|middleware| !middleware.is_async)
+    }
+
+    pub fn cache(&self) -> Option<&Cache> {
+        self.function().and_then(|function| function.cache.as_ref())
+    }
+
+    pub fn stream_body(&self) -> bool {
+        self.function().is_some_and(|function| function.stream_body)
+    }
+
+    pub fn etag(&self) -> bool {
+        self.function().is_some_and(|function| function.etag)
+    }
+}
+
+type PipelineMap = HashMap<HttpMethod, MatchItRouter<Arc<RoutePipeline>>>;
+
+/// Resolves the pipeline of every route once, so that dispatching a request is a single lookup.
+///
+/// The pipelines are compiled on the first request and again after a route or a middleware
+/// is added. The route middlewares are matched against the request path: they are resolved
+/// once for the routes without params, whose path is the route itself, and on every request
+/// for the other ones. A const route takes precedence over a function route with the same path.
+pub struct PipelineRouter {
+    router: Arc<HttpRouter>,
+    const_router: Arc<ConstRouter>,
+    middleware_router: Arc<MiddlewareRouter>,
+    routes: RwLock<Vec<(HttpMethod, String, bool, Option<RateLimit>)>>,
+    blocking_pool: RwLock<Option<BlockingPool>>,
+    pipelines: RwLock<Option<Arc<PipelineMap>>>,
+}
+
+impl PipelineRouter {
+    pub fn new(
+        router: Arc<HttpRouter>,
+        const_router: Arc<ConstRouter>,
+        middleware_router: Arc<MiddlewareRouter>,
+    ) -> Self {
+        Self {
+            router,
+            const_router,
+            middleware_router,
+            routes: RwLock::new(Vec::new()),
+            blocking_pool: RwLock::new(None),
+            pipelines: RwLock::new(None),
+        }
+    }
+
+    pub fn add_route(
+        &self,
+        route_type: &HttpMethod,
+        route: &str,
+        is_const: bool,
+        rate_limit: Option<RateLimit>,
+    ) {
+        let mut routes = self.routes.write();
+        // the const and the function routers each refuse their own duplicates, but not each other's
+        if routes
+            .iter()
+            .any(|(existing_type, existing, _, _)| existing_type == route_type && existing == route)
+        {
+            warn!(
+                "A const route and a function route are added for {:?} {}, the const route is served",
+                route_type, route
+            );
+        }
+        routes.push((route_type.clone(), route.to_string(), is_const, rate_limit));
+        drop(routes);
+        self.invalidate();
+    }
+
+    /// Runs the synchronous functions of the routes without a pool of their own on the pool
+    pub fn set_blocking_pool(&self, blocking_pool: Option<BlockingPool>) {
+        *self.blocking_pool.write() = blocking_pool;
+        self.invalidate();
+    }
+
+    /// Drops the compiled pipelines, to be called once a middleware is added
+    pub fn invalidate(&self) {
+        *self.pipelines.write() = None;
+    }
+
+    /// The pipeline for the request and the path params of its route.
+    pub fn get_pipeline(
+        &self,
+        route_type: &HttpMethod,
+        path: &str,
+    ) -> (Arc<RoutePipeline>, HashMap<String, String>) {
+        let pipelines = self.pipelines.read().clone();
+        let pipelines = match pipelines {
+            Some(pipelines) => pipelines,
+            None => self
+                .pipelines
+                .write()
+                .get_or_insert_with(|| Arc::new(self.compile()))
+                .clone(),
+        };
+
+        if let Some(matched) = pipelines
+            .get(route_type)
+            .and_then(|table| table.at(path).ok())
+        {
+            let mut route_params = HashMap::new();
+            for (key, value) in matched.params.iter() {
+                route_params.insert(key.to_string(), value.to_string());
+            }
+            let pipeline = matched.value;
+            if pipeline.middlewares_per_path {
+                let pipeline =
+                    self.pipeline(pipeline.handler.clone(), pipeline.rate_limit.clone(), path);
+                return (Arc::new(pipeline), route_params);
+            }
+            return (pipeline.clone(), route_params);
+        }
+
+        // the middlewares still run for the paths without a route
+        let route_params = self
+            .middleware_router
+            .get_route(&MiddlewareType::BeforeRequest, path)
+            .map(|(_, route_params)| route_params)
+            .unwrap_or_default();
+        (Arc::new(self.pipeline(None, None, path)), route_params)
+    }
+
+    fn compile(&self) -> PipelineMap {
+        let mut pipelines = PipelineMap::new();
+        let routes = self.routes.read();
+
+        // the const routes are inserted first, so that they are served when a function route has the same path
+        let const_routes = routes.iter().filter(|(_, _, is_const, _)| *is_const);
+        let function_routes = routes.iter().filter(|(_, _, is_const, _)| !*is_const);
+        let mut inserted = HashSet::new();
+        for (route_type, route, is_const, rate_limit) in const_routes.chain(function_routes) {
+            // the duplicates were reported when they were added
+            if !inserted.insert((route_type, route)) {
+                continue;
+            }
+            let handler = if *is_const {
+                self.const_router
+                    .get_route(route_type, route)
+                    .map(RouteHandler::Const)
+            } else {
+                self.router
+                    .get_route(route_type, route)
+                    .map(|(function, _)| RouteHandler::Function(function))
+            };
+            let Some(handler) = handler else {
+                continue;
+            };
+
+            let mut pipeline = self.pipeline(Some(handler), rate_limit.clone(), route);
+            pipeline.middlewares_per_path =
+                self.middleware_router.has_routes() && route.contains([':', '*']);
+            if let Err(e) = pipelines
+                .entry(route_type.clone())
+                .or_insert_with(MatchItRouter::new)
+                .insert(route.clone(), Arc::new(pipeline))
+            {
+                warn!("The route {:?} {} is not served: {}", route_type, route, e);
+            }
+        }
+
+        pipelines
+    }
+
+    fn pipeline(
+        &self,
+        handler: Option<RouteHandler>,
+        rate_limit: Option<RateLimit>,
+        path: &str,
+    ) -> RoutePipeline {
+        let middlewares = |middleware_type: MiddlewareType| {
+            let mut middlewares = self
+                .middleware_router
+                .get_global_middlewares(&middleware_type);
+            if let Some((function, _)) = self.middleware_router.get_route(&middleware_type, path) {
+                middlewares.push(function);
+            }
+            middlewares
+        };
+
+        let blocking_pool = match &handler {
+            Some(RouteHandler::Function(FunctionInfo {
+                blocking_pool: Some(blocking_pool),
+                ..
+            })) => Some(blocking_pool.clone()),
+            _ => self.blocking_pool.read().clone(),
+        };
+
+        RoutePipeline {
+            handler,
+            before_middlewares: middlewares(MiddlewareType::BeforeRequest),
+            after_middlewares: middlewares(MiddlewareType::AfterRequest),
+            rate_limit,
+            blocking_pool,
+            middlewares_per_path: false,
+        }
+    }
+}
@@ -1,26 +1,36 @@
+use crate::compression::{precompressed_files_service, CompressionConfig, PrecompressedFiles};
+use crate::cors::CorsConfig;
+#[cfg(unix)]
+use crate::executors::worker_loop;
 use crate::executors::{
     execute_http_function, execute_middleware_function, execute_startup_handler,
+    execute_sync_pipeline, get_traceback, SyncPipelineReturn,
 };
 
 use crate::routers::const_router::ConstRouter;
 use crate::routers::Router;
 
 use crate::routers::http_router::HttpRouter;
+use crate::routers::pipeline::{PipelineRouter, RouteHandler};
 use crate::routers::{middleware_router::MiddlewareRouter, web_socket_router::WebSocketRouter};
 use crate::shared_socket::SocketHeld;
+use crate::types::blocking_pool::BlockingPool;
 use crate::types::function_info::{FunctionInfo, MiddlewareType};
-use crate::types::headers::Headers;
-use crate::types::request::Request;
+use crate::types::headers::{GlobalResponseHeaders, Headers, SharedHeaders};
+use crate::types::rate_limit::{RateLimit, RateLimitStore, RateLimiter};
+use crate::types::request::{MultipartConfig, PyRequest, Request};
 use crate::types::response::Response;
 use crate::types::HttpMethod;
 use crate::types::MiddlewareReturn;
 use crate::websockets::start_web_socket;
 
+use std::collections::HashSet;
 use std::sync::atomic::AtomicBool;
 use std::sync::atomic::Ordering::{Relaxed, SeqCst};
 use std::sync::{Arc, RwLock};
 
 use std::process::exit;
+use std::time::Duration;
 use std::{env, thread};
 
 use actix_files::Files;
@@ -28,12 +38,17 @@ use actix_http::KeepAlive;
 use actix_web::*;
 
 // pyO3 module
-use log::{debug, error};
+use log::{debug, error, warn};
 use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
+use pyo3_asyncio::TaskLocals;
 
 const MAX_PAYLOAD_SIZE: &str = "ROBYN_MAX_PAYLOAD_SIZE";
 const DEFAULT_MAX_PAYLOAD_SIZE: usize = 1_000_000; // 1Mb
+const MULTIPART_SPOOL_SIZE: &str = "ROBYN_MULTIPART_SPOOL_SIZE";
+const MULTIPART_RAW_BODY: &str = "ROBYN_MULTIPART_RAW_BODY";
+const LOOP_PER_WORKER: &str = "ROBYN_LOOP_PER_WORKER";
+const WORKER_LOOP_SHUTDOWN_TIMEOUT: Duration = Duration::from_secs(5);
 
 static STARTED: AtomicBool = AtomicBool::new(false);
 
@@ -51,29 +66,50 @@ pub struct Server {
     const_router: Arc<ConstRouter>,
     websocket_router: Arc<WebSocketRouter>,
     middleware_router: Arc<MiddlewareRouter>,
-    global_request_headers: Arc<Headers>,
-    global_response_headers: Arc<Headers>,
+    pipeline_router: Arc<PipelineRouter>,
+    global_request_headers: Arc<SharedHeaders>,
+    global_response_headers: Arc<GlobalResponseHeaders>,
     directories: Arc<RwLock<Vec<Directory>>>,
     startup_handler: Option<Arc<FunctionInfo>>,
     shutdown_handler: Option<Arc<FunctionInfo>>,
-    excluded_response_headers_paths: Option<Vec<String>>,
+    excluded_response_headers_paths: HashSet<String>,
+    etag: bool,
+    compression: Option<CompressionConfig>,
+    cors: Option<CorsConfig>,
+    rate_limit: Option<RateLimit>,
+    rate_limit_store: Option<RateLimitStore>,
 }
 
 #[pymethods]
 impl Server {
     #[new]
     pub fn new() -> Self {
+        let router = Arc::new(HttpRouter::new());
+        let const_router = Arc::new(ConstRouter::new());
+        let middleware_router = Arc::new(MiddlewareRouter::new());
+        let pipeline_router = Arc::new(PipelineRouter::new(
+            router.clone(),
+            const_router.clone(),
+            middleware_router.clone(),
+        ));
+
         Self {
-            router: Arc::new(HttpRouter::new()),
-            const_router: Arc::new(ConstRouter::new()),
+            router,
+            const_router,
             websocket_router: Arc::new(WebSocketRouter::new()),
-            middleware_router: Arc::new(MiddlewareRouter::new()),
-            global_request_headers: Arc::new(Headers::new(None)),
-            global_response_headers: Arc::new(Headers::new(None)),
+            middleware_router,
+            pipeline_router,
+            global_request_headers: Arc::new(SharedHeaders::default()),
+            global_response_headers: Arc::new(GlobalResponseHeaders::default()),
             directories: Arc::new(RwLock::new(Vec::new())),
             startup_handler: None,
             shutdown_handler: None,
-            excluded_response_headers_paths: None,
+            excluded_response_headers_paths: HashSet::new(),
+            etag: false,
+            compression: None,
+            cors: None,
+            rate_limit: None,
+            rate_limit_store: None,
         }
     }
 
@@ -95,9 +131,7 @@ impl Server {
 
         let raw_socket = socket.try_borrow_mut()?.get_socket();
 
-        let router = self.router.clone();
-        let const_router = self.const_router.clone();
-        let middleware_router = self.middleware_router.clone();
+        let pipeline_router = self.pipeline_router.clone();
         let web_socket_router = self.websocket_router.clone();
         let global_request_headers = self.global_request_headers.clone();
         let global_response_headers = self.global_response_headers.clone();
@@ -111,6 +145,31 @@ impl Server {
         let shutdown_handler = self.shutdown_handler.clone();
 
         let excluded_response_headers_paths = self.excluded_response_headers_paths.clone();
+        let etag = self.etag;
+        let compression = self.compression.clone();
+        let cors = self.cors.clone();
+        let rate_limiter = web::Data::new(RateLimiter {
+            store: self
+                .rate_limit_store
+                .take()
+                .unwrap_or_else(RateLimitStore::local),
+            global: self.rate_limit.clone(),
+        });
+        let precompressed_files: Vec<Arc<PrecompressedFiles>> = self
+            .directories
+            .read()
+            .unwrap()
+            .iter()
+            .map(|directory| {
+                PrecompressedFiles::scan(
+                    &directory.route,
+                    &directory.directory_path,
+                    directory.index_file.clone(),
+                )
+            })
+            .filter(|files| !files.is_empty())
+            .map(Arc::new)
+            .collect();
 
         let task_locals = pyo3_asyncio::TaskLocals::new(event_loop).copy_context(py)?;
         let task_locals_copy = task_locals.clone();
@@ -125,6 +184,24 @@ impl Server {
                 ))
             })?;
 
+        let mut multipart_config = MultipartConfig::default();
+        if let Ok(spool_size) = env::var(MULTIPART_SPOOL_SIZE) {
+            multipart_config.spool_size = spool_size.trim().parse::<usize>().map_err(|e| {
+                PyValueError::new_err(format!(
+                    "Failed to parse environment variable {MULTIPART_SPOOL_SIZE} - {e}"
+                ))
+            })?;
+        }
+        if let Ok(raw_body) = env::var(MULTIPART_RAW_BODY) {
+            multipart_config.raw_body = raw_body.trim().eq_ignore_ascii_case("true");
+        }
+        let loop_per_worker = env::var(LOOP_PER_WORKER)
+            .is_ok_and(|loop_per_worker| loop_per_worker.trim().eq_ignore_ascii_case("true"));
+        if loop_per_worker && cfg!(not(unix)) {
+            warn!("{LOOP_PER_WORKER} is only supported on unix, the workers share the event loop");
+        }
+        let loop_per_worker = loop_per_worker && cfg!(unix);
+
         thread::spawn(move || {
             actix_web::rt::System::new().block_on(async move {
                 debug!("The number of workers is {}", workers);
@@ -135,9 +212,22 @@ impl Server {
                 HttpServer::new(move || {
                     let mut app = App::new();
 
-                    let task_locals = task_locals_copy.clone();
+                    // the factory runs on every worker thread
+                    let task_locals = if loop_per_worker {
+                        worker_task_locals().unwrap_or_else(|e| {
+                            error!("Failed to start the event loop of the worker: {}", e);
+                            task_locals_copy.clone()
+                        })
+                    } else {
+                        task_locals_copy.clone()
+                    };
                     let directories = directories.read().unwrap();
 
+                    // registered first, so that the requests without a sidecar fall through to `Files`
+                    for files in precompressed_files.iter() {
+                        app = app.service(precompressed_files_service(files.clone()));
+                    }
+
                     // this loop matches three types of directory serving
                     // 1. Serves a build folder. e.g. the build folder generated from yarn build
                     // 2. Shows file listing
@@ -162,12 +252,14 @@ impl Server {
                     }
 
                     app = app
-                        .app_data(web::Data::new(router.clone()))
-                        .app_data(web::Data::new(const_router.clone()))
-                        .app_data(web::Data::new(middleware_router.clone()))
+                        .app_data(web::Data::new(pipeline_router.clone()))
                         .app_data(web::Data::new(global_request_headers.clone()))
                         .app_data(web::Data::new(global_response_headers.clone()))
-                        .app_data(web::Data::new(excluded_response_headers_paths.clone()));
+                        .app_data(web::Data::new(excluded_response_headers_paths.clone()))
+                        .app_data(web::Data::new(multipart_config.clone()))
+                        .app_data(web::Data::new(compression.clone()))
+                        .app_data(web::Data::new(cors.clone()))
+                        .app_data(rate_limiter.clone());
 
                     let web_socket_map = web_socket_router.get_web_socket_map();
                     for (elem, value) in (web_socket_map.read()).iter() {
@@ -193,23 +285,30 @@ impl Server {
 
                     app.app_data(web::PayloadConfig::new(max_payload_size))
                         .default_service(web::route().to(
-                            move |router: web::Data<Arc<HttpRouter>>,
-                                  const_router: web::Data<Arc<ConstRouter>>,
-                                  middleware_router: web::Data<Arc<MiddlewareRouter>>,
+                            move |pipeline_router: web::Data<Arc<PipelineRouter>>,
                                   payload: web::Payload,
                                   global_request_headers,
                                   global_response_headers,
                                   response_headers_exclude_paths,
+                                  multipart_config,
+                                  compression,
+                                  cors,
+                                  rate_limiter,
                                   req| {
+                                let request_task_locals = task_locals.clone();
                                 pyo3_asyncio::tokio::scope_local(task_locals.clone(), async move {
                                     index(
-                                        router,
+                                        pipeline_router,
                                         payload,
-                                        const_router,
-                                        middleware_router,
                                         global_request_headers,
                                         global_response_headers,
                                         response_headers_exclude_paths,
+                                        multipart_config,
+                                        etag,
+                                        compression,
+                                        cors,
+                                        rate_limiter,
+                                        request_task_locals,
                                         req,
                                     )
                                     .await
@@ -232,6 +331,11 @@ impl Server {
         if event_loop.is_err() {
             debug!("Ctrl c handler");
 
+            if loop_per_worker {
+                // the workers need the GIL to close their loops
+                py.allow_threads(|| stop_worker_loops(WORKER_LOOP_SHUTDOWN_TIMEOUT));
+            }
+
             // executing this from the same file (and not creating a function -- like startup handler)
             // to fix an issue that arises when a new async function is spooled up.
 
@@ -288,28 +392,91 @@ impl Server {
     /// Removes a new request header to our concurrent hashmap
     /// this can be called after the server has started.
     pub fn remove_header(&self, key: &str) {
-        self.global_request_headers.headers.remove(key);
+        self.global_request_headers.remove(key);
     }
 
     /// Removes a new response header to our concurrent hashmap
     /// this can be called after the server has started.
     pub fn remove_response_header(&self, key: &str) {
-        self.global_response_headers.headers.remove(key);
+        self.global_response_headers.remove(key);
     }
 
     pub fn apply_request_headers(&mut self, headers: &Headers) {
-        self.global_request_headers = Arc::new(headers.clone());
+        self.global_request_headers = Arc::new(SharedHeaders::new(headers));
     }
 
     pub fn apply_response_headers(&mut self, headers: &Headers) {
-        self.global_response_headers = Arc::new(headers.clone());
+        self.global_response_headers = Arc::new(GlobalResponseHeaders::new(headers));
+    }
+
+    /// Adds an `ETag` to the responses of every route and answers conditional requests
+    pub fn set_etag(&mut self, enabled: bool) {
+        self.etag = enabled;
+    }
+
+    /// Compresses the responses with the first of `algorithms` accepted by the client,
+    /// to be called before adding the const routes that are compressed once when added
+    #[pyo3(signature = (min_size, algorithms, level = None))]
+    pub fn set_compression(
+        &mut self,
+        min_size: usize,
+        algorithms: Vec<String>,
+        level: Option<u32>,
+    ) -> PyResult<()> {
+        let compression = CompressionConfig::new(min_size, algorithms, level)?;
+        self.const_router.set_compression(Some(compression.clone()));
+        self.compression = Some(compression);
+        Ok(())
+    }
+
+    /// Answers the preflight requests and adds the CORS headers to the responses
+    #[pyo3(signature = (origins, methods, headers, expose_headers = vec![], allow_credentials = false, max_age = None, reject_disallowed = false))]
+    pub fn set_cors(
+        &mut self,
+        origins: Vec<String>,
+        methods: Vec<String>,
+        headers: Vec<String>,
+        expose_headers: Vec<String>,
+        allow_credentials: bool,
+        max_age: Option<u64>,
+        reject_disallowed: bool,
+    ) {
+        self.cors = Some(CorsConfig::new(
+            origins,
+            methods,
+            headers,
+            expose_headers,
+            allow_credentials,
+            max_age,
+            reject_disallowed,
+        ));
+    }
+
+    /// Runs the sync handlers of the routes without a pool of their own on the pool
+    pub fn set_blocking_pool(&self, blocking_pool: BlockingPool) {
+        self.pipeline_router.set_blocking_pool(Some(blocking_pool));
+    }
+
+    /// Limits the requests to every route, on top of the limits of the routes
+    pub fn set_rate_limit(&mut self, rate_limit: RateLimit) {
+        self.rate_limit = Some(rate_limit);
+    }
+
+    /// Keeps the buckets of the rate limits in a buffer shared with the other processes,
+    /// e.g. an anonymous `mmap` created before they were forked
+    pub fn set_rate_limit_store(&mut self, buffer: &PyAny) -> PyResult<()> {
+        self.rate_limit_store = Some(RateLimitStore::shared(buffer)?);
+        Ok(())
     }
 
     pub fn set_response_headers_exclude_paths(
         &mut self,
         excluded_response_headers_paths: Option<Vec<String>>,
     ) {
-        self.excluded_response_headers_paths = excluded_response_headers_paths;
+        self.excluded_response_headers_paths = excluded_response_headers_paths
+            .unwrap_or_default()
+            .into_iter()
+            .collect();
     }
 
     /// Add a new route to the routing tables
@@ -343,22 +510,27 @@ impl Server {
         debug!("Route added for {:?} {} ", route_type, route);
         let asyncio = py.import("asyncio").unwrap();
         let event_loop = asyncio.call_method0("get_event_loop").unwrap();
+        let rate_limit = function.rate_limit.clone();
 
         if is_const {
             match self
                 .const_router
                 .add_route(route_type, route, function, Some(event_loop))
             {
-                Ok(_) => (),
+                Ok(_) => self
+                    .pipeline_router
+                    .add_route(route_type, route, true, rate_limit),
                 Err(e) => {
-                    debug!("Error adding const route {}", e);
+                    warn!("Error adding const route {}: {}", route, e);
                 }
             }
         } else {
             match self.router.add_route(route_type, route, function, None) {
-                Ok(_) => (),
+                Ok(_) => self
+                    .pipeline_router
+                    .add_route(route_type, route, false, rate_limit),
                 Err(e) => {
-                    debug!("Error adding route {}", e);
+                    warn!("Error adding route {}: {}", route, e);
                 }
             }
         }
@@ -370,6 +542,7 @@ impl Server {
         self.middleware_router
             .add_global_middleware(middleware_type, function)
             .unwrap();
+        self.pipeline_router.invalidate();
     }
 
     /// Add a new route to the routing tables
@@ -387,6 +560,7 @@ impl Server {
         self.middleware_router
             .add_route(middleware_type, route, function, None)
             .unwrap();
+        self.pipeline_router.invalidate();
     }
 
     /// Add a new web socket route to the routing tables
@@ -421,140 +595,291 @@ impl Default for Server {
     }
 }
 
+/// The task locals of the event loop of the current actix worker, started on first use.
+///
+/// Each worker runs its own loop, a step at a time, so that the async handlers of the workers
+/// are neither funneled through the loop of the main thread nor handed over to other threads.
+#[cfg(unix)]
+fn worker_task_locals() -> PyResult<TaskLocals> {
+    worker_loop::task_locals()
+}
+
+#[cfg(not(unix))]
+fn worker_task_locals() -> PyResult<TaskLocals> {
+    Err(pyo3::exceptions::PyNotImplementedError::new_err(
+        "The event loops per worker need unix",
+    ))
+}
+
+#[cfg(unix)]
+fn stop_worker_loops(timeout: Duration) {
+    worker_loop::stop_all(timeout);
+}
+
+#[cfg(not(unix))]
+fn stop_worker_loops(_timeout: Duration) {}
+
 /// This is our service handler. It receives a Request, routes on it
 /// path, and returns a Future of a Response.
 #[allow(clippy::too_many_arguments)]
 async fn index(
-    router: web::Data<Arc<HttpRouter>>,
+    pipeline_router: web::Data<Arc<PipelineRouter>>,
     payload: web::Payload,
-    const_router: web::Data<Arc<ConstRouter>>,
-    middleware_router: web::Data<Arc<MiddlewareRouter>>,
-    global_request_headers: web::Data<Arc<Headers>>,
-    global_response_headers: web::Data<Arc<Headers>>,
-    excluded_response_headers_paths: web::Data<Option<Vec<String>>>,
+    global_request_headers: web::Data<Arc<SharedHeaders>>,
+    global_response_headers: web::Data<Arc<GlobalResponseHeaders>>,
+    excluded_response_headers_paths: web::Data<HashSet<String>>,
+    multipart_config: web::Data<MultipartConfig>,
+    etag: bool,
+    compression: web::Data<Option<CompressionConfig>>,
+    cors: web::Data<Option<CorsConfig>>,
+    rate_limiter: web::Data<RateLimiter>,
+    task_locals: TaskLocals,
     req: HttpRequest,
-) -> impl Responder {
-    let mut request = Request::from_actix_request(&req, payload, &global_request_headers).await;
-
-    // Before middleware
-    // Global
-    let mut before_middlewares =
-        middleware_router.get_global_middlewares(&MiddlewareType::BeforeRequest);
-    // Route specific
-    if let Some((function, route_params)) =
-        middleware_router.get_route(&MiddlewareType::BeforeRequest, req.uri().path())
-    {
-        before_middlewares.push(function);
-        request.path_params = route_params;
-    }
-    for before_middleware in before_middlewares {
-        request = match execute_middleware_function(&request, &before_middleware).await {
-            Ok(MiddlewareReturn::Request(r)) => r,
-            Ok(MiddlewareReturn::Response(r)) => {
-                // If a before middleware returns a response, we abort the request and return the response
-                return r;
+) -> HttpResponse {
+    let global_response_headers = (!excluded_response_headers_paths.contains(req.uri().path()))
+        .then(|| global_response_headers.get_ref().clone());
+    let (response, global_headers_applied) = match cors.as_ref() {
+        Some(cors) => match cors.preflight(&req).or_else(|| cors.reject(&req)) {
+            Some(preflight) => (preflight, false),
+            None => {
+                let (mut response, global_headers_applied) = handle_request(
+                    pipeline_router,
+                    payload,
+                    global_request_headers,
+                    global_response_headers.clone(),
+                    multipart_config,
+                    etag,
+                    compression,
+                    rate_limiter,
+                    &task_locals,
+                    &req,
+                )
+                .await;
+                cors.apply(&req, &mut response);
+                (response, global_headers_applied)
             }
-            Err(e) => {
-                error!(
-                    "Error while executing before middleware function for endpoint `{}`: {}",
-                    req.uri().path(),
-                    get_traceback(e.downcast_ref::<PyErr>().unwrap())
-                );
-                return Response::internal_server_error(None);
-            }
-        };
+        },
+        None => {
+            handle_request(
+                pipeline_router,
+                payload,
+                global_request_headers,
+                global_response_headers.clone(),
+                multipart_config,
+                etag,
+                compression,
+                rate_limiter,
+                &task_locals,
+                &req,
+            )
+            .await
+        }
+    };
+
+    let mut response = response.into_http_response(&req).await;
+    if let (Some(global_response_headers), false) =
+        (global_response_headers, global_headers_applied)
+    {
+        global_response_headers.apply(response.headers_mut());
     }
+    response
+}
 
-    // Route execution
-    let mut response = if let Some(res) = const_router.get_route(
-        &HttpMethod::from_actix_method(req.method()),
-        req.uri().path(),
-    ) {
-        res
-    } else if let Some((function, route_params)) = router.get_route(
+/// The response to the request, and whether the global response headers were already added
+/// to it, which is the case when the route has after middlewares so that they can see them.
+#[allow(clippy::too_many_arguments)]
+async fn handle_request(
+    pipeline_router: web::Data<Arc<PipelineRouter>>,
+    payload: web::Payload,
+    global_request_headers: web::Data<Arc<SharedHeaders>>,
+    global_response_headers: Option<Arc<GlobalResponseHeaders>>,
+    multipart_config: web::Data<MultipartConfig>,
+    etag: bool,
+    compression: web::Data<Option<CompressionConfig>>,
+    rate_limiter: web::Data<RateLimiter>,
+    task_locals: &TaskLocals,
+    req: &HttpRequest,
+) -> (Response, bool) {
+    let (pipeline, route_params) = pipeline_router.get_pipeline(
         &HttpMethod::from_actix_method(req.method()),
         req.uri().path(),
-    ) {
-        request.path_params = route_params;
-        match execute_http_function(&request, &function).await {
-            Ok(r) => r,
-            Err(e) => {
-                error!(
-                    "Error while executing route function for endpoint `{}`: {}",
-                    req.uri().path(),
-                    get_traceback(&e)
-                );
-
-                Response::internal_server_error(None)
+    );
+    if let Some(response) = rate_limiter.check(pipeline.rate_limit.as_ref(), req) {
+        return (response, false);
+    }
+    let etag = etag || pipeline.etag();
+    // the after middlewares run after the global response headers are added, and can change them
+    let global_response_headers =
+        global_response_headers.filter(|_| !pipeline.after_middlewares.is_empty());
+    let global_headers_applied = global_response_headers.is_some();
+
+    let mut request = match Request::from_actix_request(
+        req,
+        payload,
+        &global_request_headers,
+        &multipart_config,
+        pipeline.stream_body(),
+    )
+    .await
+    {
+        Ok(request) => request,
+        Err(e) => {
+            error!(
+                "Error while reading the request body for endpoint `{}`: {}",
+                req.uri().path(),
+                e
+            );
+            return (Response::from_error(&e), false);
+        }
+    };
+    request.path_params = route_params;
+    // the request is shared with the Python functions of the route, not copied for each of them
+    let mut request = Arc::new(request);
+
+    // every function of the route is synchronous, they all run under a single GIL acquisition
+    let mut response = if pipeline.is_sync() {
+        let cache_key = pipeline.cache().map(|cache| cache.key(req));
+        let returned = match pipeline.blocking_pool.clone() {
+            Some(blocking_pool) => {
+                let (pipeline, endpoint) = (pipeline.clone(), req.uri().path().to_string());
+                let global_response_headers = global_response_headers.clone();
+                blocking_pool
+                    .run(task_locals.clone(), move || {
+                        execute_sync_pipeline(
+                            &request,
+                            &pipeline,
+                            cache_key,
+                            global_response_headers.as_deref(),
+                            &endpoint,
+                        )
+                    })
+                    .await
+                    .unwrap_or_else(|e| {
+                        error!(
+                            "Error while executing route function for endpoint `{}`: {}",
+                            req.uri().path(),
+                            e
+                        );
+                        SyncPipelineReturn::Aborted(Response::internal_server_error(None))
+                    })
             }
+            None => execute_sync_pipeline(
+                &request,
+                &pipeline,
+                cache_key,
+                global_response_headers.as_deref(),
+                req.uri().path(),
+            ),
+        };
+        match returned {
+            SyncPipelineReturn::Aborted(response) => return (response, false),
+            SyncPipelineReturn::Completed(response) => response,
         }
     } else {
-        Response::not_found(None)
-    };
-
-    debug!("OG Response : {:?}", response);
+        // Before middleware
+        for before_middleware in &pipeline.before_middlewares {
+            let input = PyRequest::from_request(Arc::clone(&request));
+            request = match execute_middleware_function(&input, before_middleware).await {
+                Ok(MiddlewareReturn::Request(r)) => r,
+                Ok(MiddlewareReturn::Response(r)) => {
+                    // If a before middleware returns a response, we abort the request and return the response
+                    return (r, false);
+                }
+                Err(e) => {
+                    error!(
+                        "Error while executing before middleware function for endpoint `{}`: {}",
+                        req.uri().path(),
+                        get_traceback(e.downcast_ref::<PyErr>().unwrap())
+                    );
+                    return (Response::internal_server_error(None), false);
+                }
+            };
+        }
 
-    response.headers.extend(&global_response_headers);
+        // Route execution
+        let mut response = match &pipeline.handler {
+            Some(RouteHandler::Const(res)) => res.negotiate(req),
+            Some(RouteHandler::Function(function)) => {
+                let cache = function.cache.as_ref().map(|cache| (cache, cache.key(req)));
+                match cache.as_ref().and_then(|(cache, key)| cache.get(key)) {
+                    Some(cached_response) => cached_response,
+                    None => match execute_http_function(
+                        &request,
+                        function,
+                        pipeline
+                            .blocking_pool
+                            .as_ref()
+                            .map(|blocking_pool| (blocking_pool, task_locals)),
+                    )
+                    .await
+                    {
+                        Ok(r) => {
+                            if let Some((cache, key)) = cache {
+                                cache.insert(key, &r);
+                            }
+                            r
+                        }
+                        Err(e) => {
+                            error!(
+                                "Error while executing route function for endpoint `{}`: {}",
+                                req.uri().path(),
+                                get_traceback(&e)
+                            );
 
-    match &excluded_response_headers_paths.get_ref() {
-        None => {}
-        Some(excluded_response_headers_paths) => {
-            if excluded_response_headers_paths.contains(&req.uri().path().to_owned()) {
-                response.headers.clear();
+                            Response::internal_server_error(None)
+                        }
+                    },
+                }
             }
+            None => Response::not_found(None),
+        };
+
+        debug!("OG Response : {:?}", response);
+        if let Some(global_response_headers) = &global_response_headers {
+            global_response_headers.extend_into(&mut response.headers);
         }
-    }
 
-    debug!("Extended Response : {:?}", response);
+        // After middleware
+        for after_middleware in &pipeline.after_middlewares {
+            response = match execute_middleware_function(&response, after_middleware).await {
+                Ok(MiddlewareReturn::Request(_)) => {
+                    error!("After middleware returned a request");
+                    return (
+                        Response::internal_server_error(Some(&response.headers)),
+                        global_headers_applied,
+                    );
+                }
+                Ok(MiddlewareReturn::Response(r)) => {
+                    let response = r;
 
-    // After middleware
-    // Global
-    let mut after_middlewares =
-        middleware_router.get_global_middlewares(&MiddlewareType::AfterRequest);
-    // Route specific
-    if let Some((function, _)) =
-        middleware_router.get_route(&MiddlewareType::AfterRequest, req.uri().path())
-    {
-        after_middlewares.push(function);
+                    debug!("Response returned: {:?}", response);
+                    response
+                }
+                Err(e) => {
+                    error!(
+                        "Error while executing after middleware function for endpoint `{}`: {}",
+                        req.uri().path(),
+                        get_traceback(e.downcast_ref::<PyErr>().unwrap())
+                    );
+                    return (
+                        Response::internal_server_error(Some(&response.headers)),
+                        global_headers_applied,
+                    );
+                }
+            };
+        }
+        response
+    };
+
+    if etag {
+        response.apply_etag(req);
     }
-    for after_middleware in after_middlewares {
-        response = match execute_middleware_function(&response, &after_middleware).await {
-            Ok(MiddlewareReturn::Request(_)) => {
-                error!("After middleware returned a request");
-                return Response::internal_server_error(Some(&response.headers));
-            }
-            Ok(MiddlewareReturn::Response(r)) => {
-                let response = r;
 
-                debug!("Response returned: {:?}", response);
-                response
-            }
-            Err(e) => {
-                error!(
-                    "Error while executing after middleware function for endpoint `{}`: {}",
-                    req.uri().path(),
-                    get_traceback(e.downcast_ref::<PyErr>().unwrap())
-                );
-                return Response::internal_server_error(Some(&response.headers));
-            }
-        };
+    if let Some(compression) = compression.as_ref() {
+        compression.compress(&mut response, req).await;
     }
 
     debug!("Response returned: {:?}", response);
 
-    response
-}
-
-fn get_traceback(error: &PyErr) -> String {
-    Python::with_gil(|py| -> String {
-        if let Some(traceback) = error.traceback(py) {
-            let msg = match traceback.format() {
-                Ok(msg) => format!("\n{msg} {error}"),
-                Err(e) => e.to_string(),
-            };
-            return msg;
-        };
-
-        error.value(py).to_string()
-    })
+    (response, global_headers_applied)
 }
@@ -0,0 +1,159 @@
+use std::{
+    sync::{
+        atomic::{AtomicU64, AtomicUsize, Ordering},
+        Arc,
+    },
+    time::Instant,
+};
+
+use pyo3::{
+    exceptions::{PyRuntimeError, PyValueError},
+    prelude::*,
+};
+use pyo3_asyncio::TaskLocals;
+use tokio::sync::Semaphore;
+
+#[derive(Debug)]
+struct PoolState {
+    slots: Arc<Semaphore>,
+    queued: AtomicUsize,
+    active: AtomicUsize,
+    completed: AtomicU64,
+    // in microseconds
+    total_wait: AtomicU64,
+    max_wait: AtomicU64,
+}
+
+/// Counts a task for as long as it is alive, including when it is cancelled or panics.
+struct Counted<'a>(&'a AtomicUsize);
+
+impl<'a> Counted<'a> {
+    fn new(counter: &'a AtomicUsize) -> Self {
+        counter.fetch_add(1, Ordering::Relaxed);
+        Self(counter)
+    }
+}
+
+impl Drop for Counted<'_> {
+    fn drop(&mut self) {
+        self.0.fetch_sub(1, Ordering::Relaxed);
+    }
+}
+
+/// Runs the synchronous handlers on at most `size` threads at once, off the actix workers.
+///
+/// A slow sync handler then only holds one of the threads of the pool instead of an actix
+/// worker, which keeps accepting connections and serving the async, const and cached routes.
+/// The slots are shared by every worker of the process. The handlers waiting for a slot
+/// are counted by `queue_depth`, and the time they waited by `wait_time` and `max_wait_time`.
+#[pyclass]
+#[derive(Debug, Clone)]
+pub struct BlockingPool {
+    #[pyo3(get)]
+    pub size: usize,
+    state: Arc<PoolState>,
+}
+
+#[pymethods]
+impl BlockingPool {
+    #[new]
+    pub fn new(size: usize) -> PyResult<Self> {
+        if size == 0 {
+            return Err(PyValueError::new_err("size must be greater than 0"));
+        }
+
+        Ok(Self {
+            size,
+            state: Arc::new(PoolState {
+                slots: Arc::new(Semaphore::new(size)),
+                queued: AtomicUsize::new(0),
+                active: AtomicUsize::new(0),
+                completed: AtomicU64::new(0),
+                total_wait: AtomicU64::new(0),
+                max_wait: AtomicU64::new(0),
+            }),
+        })
+    }
+
+    /// The number of handlers waiting for a thread of the pool
+    #[getter]
+    pub fn queue_depth(&self) -> usize {
+        self.state.queued.load(Ordering::Relaxed)
+    }
+
+    /// The number of handlers running on the pool
+    #[getter]
+    pub fn active(&self) -> usize {
+        self.state.active.load(Ordering::Relaxed)
+    }
+
+    #[getter]
+    pub fn completed(&self) -> u64 {
+        self.state.completed.load(Ordering::Relaxed)
+    }
+
+    /// The average time, in seconds, the handlers waited for a thread of the pool
+    #[getter]
+    pub fn wait_time(&self) -> f64 {
+        let started = self.state.completed.load(Ordering::Relaxed)
+            + self.state.active.load(Ordering::Relaxed) as u64;
+        if started == 0 {
+            return 0.0;
+        }
+        self.state.total_wait.load(Ordering::Relaxed) as f64 / started as f64 / 1_000_000.0
+    }
+
+    /// The longest time, in seconds, a handler waited for a thread of the pool
+    #[getter]
+    pub fn max_wait_time(&self) -> f64 {
+        self.state.max_wait.load(Ordering::Relaxed) as f64 / 1_000_000.0
+    }
+
+    pub fn __repr__(&self) -> String {
+        format!(
+            "BlockingPool(size={}, active={}, queue_depth={})",
+            self.size,
+            self.active(),
+            self.queue_depth()
+        )
+    }
+}
+
+impl BlockingPool {
+    /// Runs the function on a blocking thread once a slot of the pool is free.
+    ///
+    /// The slot is held until the function returns, even if the request is dropped meanwhile.
+    /// The function runs with the task locals of the worker, so that e.g. the async generator
+    /// of a streaming response is bound to the event loop of the worker, as it is without a pool.
+    pub async fn run<F, T>(&self, task_locals: TaskLocals, function: F) -> PyResult<T>
+    where
+        F: FnOnce() -> T + Send + 'static,
+        T: Send + 'static,
+    {
+        let queued_at = Instant::now();
+        let slot = {
+            let _queued = Counted::new(&self.state.queued);
+            self.state.slots.clone().acquire_owned().await
+        }
+        .map_err(|e| PyRuntimeError::new_err(e.to_string()))?;
+
+        let wait = queued_at.elapsed().as_micros() as u64;
+        self.state.total_wait.fetch_add(wait, Ordering::Relaxed);
+        self.state.max_wait.fetch_max(wait, Ordering::Relaxed);
+
+        let state = self.state.clone();
+        tokio::task::spawn_blocking(move || {
+            let _slot = slot;
+            let output = {
+                let _active = Counted::new(&state.active);
+                futures::executor::block_on(pyo3_asyncio::tokio::scope(task_locals, async move {
+                    function()
+                }))
+            };
+            state.completed.fetch_add(1, Ordering::Relaxed);
+            output
+        })
+        .await
+        .map_err(|e| PyRuntimeError::new_err(format!("The blocking pool task failed: {}", e)))
+    }
+}
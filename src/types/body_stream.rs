@@ -0,0 +1,84 @@
+use std::sync::Arc;
+
+use actix_web::{
+    error::PayloadError,
+    web::{self, Bytes},
+};
+use futures_util::StreamExt as _;
+use pyo3::{
+    exceptions::{PyIOError, PyStopAsyncIteration},
+    prelude::*,
+    types::PyBytes,
+};
+use tokio::sync::{mpsc, Mutex};
+
+/// Number of chunks read ahead of the handler. Once they are all buffered the
+/// payload is not polled anymore, which applies backpressure to the client.
+const BODY_STREAM_BUFFER_SIZE: usize = 8;
+
+type Chunk = Result<Bytes, PayloadError>;
+
+/// The request body as an async iterator of `bytes` chunks.
+///
+/// Handed to the routes that opt into streaming by annotating a parameter with `BodyStream`,
+/// the body is then never buffered as a whole.
+#[pyclass]
+#[derive(Clone)]
+pub struct BodyStream {
+    receiver: Arc<Mutex<mpsc::Receiver<Chunk>>>,
+}
+
+impl std::fmt::Debug for BodyStream {
+    fn fmt(&self, f: &mut std::fmt::Formatter<'_>) -> std::fmt::Result {
+        f.debug_struct("BodyStream").finish_non_exhaustive()
+    }
+}
+
+impl BodyStream {
+    /// Reads the payload from a task spawned on the current actix worker,
+    /// as `web::Payload` can not be moved to another thread.
+    pub fn from_payload(mut payload: web::Payload) -> Self {
+        let (sender, receiver) = mpsc::channel(BODY_STREAM_BUFFER_SIZE);
+
+        actix_web::rt::spawn(async move {
+            while let Some(chunk) = payload.next().await {
+                let is_error = chunk.is_err();
+                // stop once the body is broken or nobody is reading it anymore
+                if sender.send(chunk).await.is_err() || is_error {
+                    break;
+                }
+            }
+        });
+
+        Self {
+            receiver: Arc::new(Mutex::new(receiver)),
+        }
+    }
+}
+
+#[pymethods]
+impl BodyStream {
+    fn __aiter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    fn __anext__(&self, py: Python) -> PyResult<Option<PyObject>> {
+        let receiver = self.receiver.clone();
+
+        let next_chunk = pyo3_asyncio::tokio::future_into_py(py, async move {
+            match receiver.lock().await.recv().await {
+                Some(Ok(chunk)) => Ok(Python::with_gil(|py| {
+                    PyObject::from(PyBytes::new(py, &chunk))
+                })),
+                Some(Err(e)) => Err(PyIOError::new_err(format!(
+                    "Failed to read the request body: {e}"
+                ))),
+                None => Err(PyStopAsyncIteration::new_err(
+                    "The request body was fully read",
+                )),
+            }
+        })?;
+
+        Ok(Some(next_chunk.into()))
+    }
+}
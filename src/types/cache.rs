@@ -0,0 +1,181 @@
+use std::{
+    num::NonZeroUsize,
+    sync::{
+        atomic::{AtomicU64, Ordering},
+        Arc,
+    },
+    time::{Duration, Instant},
+};
+
+use actix_web::HttpRequest;
+use lru::LruCache;
+use parking_lot::Mutex;
+use pyo3::{exceptions::PyValueError, prelude::*};
+
+use super::{multimap::QueryParams, response::Response};
+
+struct CacheEntry {
+    response: Response,
+    expires_at: Instant,
+}
+
+struct CacheStore {
+    entries: Mutex<LruCache<String, CacheEntry>>,
+    hits: AtomicU64,
+    misses: AtomicU64,
+}
+
+/// Caches the successful responses of a route for `ttl` seconds.
+///
+/// Responses are keyed by method, path, the `query_params` (all of the query string if None)
+/// and the `vary` request headers, and the least recently used ones are evicted past `max_entries`.
+/// A hit is served from Rust without calling the handler.
+#[pyclass]
+#[derive(Clone)]
+pub struct Cache {
+    #[pyo3(get)]
+    pub ttl: f64,
+    #[pyo3(get)]
+    pub max_entries: usize,
+    #[pyo3(get)]
+    pub vary: Vec<String>,
+    #[pyo3(get)]
+    pub query_params: Option<Vec<String>>,
+    store: Arc<CacheStore>,
+}
+
+impl std::fmt::Debug for Cache {
+    fn fmt(&self, f: &mut std::fmt::Formatter<'_>) -> std::fmt::Result {
+        f.debug_struct("Cache")
+            .field("ttl", &self.ttl)
+            .field("max_entries", &self.max_entries)
+            .field("vary", &self.vary)
+            .field("query_params", &self.query_params)
+            .finish()
+    }
+}
+
+#[pymethods]
+impl Cache {
+    #[new]
+    #[pyo3(signature = (ttl, max_entries = 10000, vary = vec![], query_params = None))]
+    pub fn new(
+        ttl: f64,
+        max_entries: usize,
+        vary: Vec<String>,
+        query_params: Option<Vec<String>>,
+    ) -> PyResult<Self> {
+        if !(ttl > 0.0) {
+            return Err(PyValueError::new_err(
+                "ttl must be a positive number of seconds",
+            ));
+        }
+        let capacity = NonZeroUsize::new(max_entries)
+            .ok_or_else(|| PyValueError::new_err("max_entries must be greater than 0"))?;
+
+        Ok(Self {
+            ttl,
+            max_entries,
+            vary: vary.iter().map(|header| header.to_lowercase()).collect(),
+            query_params,
+            store: Arc::new(CacheStore {
+                entries: Mutex::new(LruCache::new(capacity)),
+                hits: AtomicU64::new(0),
+                misses: AtomicU64::new(0),
+            }),
+        })
+    }
+
+    #[getter]
+    pub fn hits(&self) -> u64 {
+        self.store.hits.load(Ordering::Relaxed)
+    }
+
+    #[getter]
+    pub fn misses(&self) -> u64 {
+        self.store.misses.load(Ordering::Relaxed)
+    }
+
+    pub fn clear(&self) {
+        self.store.entries.lock().clear();
+    }
+
+    pub fn __len__(&self) -> usize {
+        self.store.entries.lock().len()
+    }
+}
+
+impl Cache {
+    pub fn key(&self, req: &HttpRequest) -> String {
+        let mut key = format!("{} {}", req.method(), req.path());
+
+        match &self.query_params {
+            None => {
+                key.push('?');
+                key.push_str(req.query_string());
+            }
+            Some(query_params) => {
+                let request_query_params = QueryParams::from_query_string(req.query_string());
+                for query_param in query_params {
+                    key.push('\0');
+                    key.push_str(query_param);
+                    key.push('=');
+                    for value in request_query_params.values(query_param) {
+                        key.push_str(value);
+                        key.push(',');
+                    }
+                }
+            }
+        }
+
+        for header in &self.vary {
+            key.push('\0');
+            key.push_str(header);
+            key.push(':');
+            for value in req.headers().get_all(header.as_str()) {
+                key.push_str(value.to_str().unwrap_or_default());
+                key.push(',');
+            }
+        }
+
+        key
+    }
+
+    pub fn get(&self, key: &str) -> Option<Response> {
+        let now = Instant::now();
+        let mut entries = self.store.entries.lock();
+
+        let cached = entries
+            .get(key)
+            .map(|entry| (entry.expires_at > now).then(|| entry.response.clone()));
+        let response = match cached {
+            Some(Some(response)) => Some(response),
+            Some(None) => {
+                entries.pop(key);
+                None
+            }
+            None => None,
+        };
+        drop(entries);
+
+        let counter = match response {
+            Some(_) => &self.store.hits,
+            None => &self.store.misses,
+        };
+        counter.fetch_add(1, Ordering::Relaxed);
+
+        response
+    }
+
+    pub fn insert(&self, key: String, response: &Response) {
+        if response.stream.is_some() || !(200..300).contains(&response.status_code) {
+            return;
+        }
+
+        let entry = CacheEntry {
+            response: response.clone(),
+            expires_at: Instant::now() + Duration::from_secs_f64(self.ttl),
+        };
+        self.store.entries.lock().put(key, entry);
+    }
+}
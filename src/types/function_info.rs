@@ -5,6 +5,8 @@ use std::{
 
 use pyo3::{prelude::*, types::PyDict};
 
+use super::{blocking_pool::BlockingPool, cache::Cache, rate_limit::RateLimit};
+
 #[pyclass]
 #[derive(Debug, PartialEq, Eq, Hash)]
 pub enum MiddlewareType {
@@ -37,24 +39,60 @@ pub struct FunctionInfo {
     pub args: Py<PyDict>,
     #[pyo3(get, set)]
     pub kwargs: Py<PyDict>,
+    /// Whether the handler reads the request body as a stream instead of as a whole.
+    #[pyo3(get, set)]
+    pub stream_body: bool,
+    #[pyo3(get, set)]
+    pub cache: Option<Cache>,
+    /// Whether the responses get an `ETag` and conditional requests are answered with a 304.
+    #[pyo3(get, set)]
+    pub etag: bool,
+    #[pyo3(get, set)]
+    pub rate_limit: Option<RateLimit>,
+    /// The pool the handler runs on if it is synchronous, instead of the actix worker.
+    #[pyo3(get, set)]
+    pub blocking_pool: Option<BlockingPool>,
+    /// Whether the handler takes any argument apart from the injected dependencies,
+    /// i.e. whether the request (or response) has to be converted to a Python object at all.
+    pub consumes_input: bool,
 }
 
 #[pymethods]
 impl FunctionInfo {
     #[new]
+    #[pyo3(signature = (handler, is_async, number_of_params, args, kwargs, stream_body = false, cache = None, etag = false, rate_limit = None, blocking_pool = None))]
     pub fn new(
+        py: Python,
         handler: Py<PyAny>,
         is_async: bool,
         number_of_params: u8,
         args: Py<PyDict>,
         kwargs: Py<PyDict>,
+        stream_body: bool,
+        cache: Option<Cache>,
+        etag: bool,
+        rate_limit: Option<RateLimit>,
+        blocking_pool: Option<BlockingPool>,
     ) -> Self {
+        let injected_dependencies = kwargs.as_ref(py);
+        let consumes_input = args
+            .as_ref(py)
+            .keys()
+            .iter()
+            .any(|param| !injected_dependencies.contains(param).unwrap_or(false));
+
         Self {
             handler,
             is_async,
             number_of_params,
             args,
             kwargs,
+            stream_body,
+            cache,
+            etag,
+            rate_limit,
+            blocking_pool,
+            consumes_input,
         }
     }
 }
@@ -1,84 +1,110 @@
-use actix_http::header::HeaderMap;
+use std::borrow::Cow;
+
+use actix_http::header::{HeaderMap, HeaderName, HeaderValue};
 use dashmap::DashMap;
 use log::debug;
+use parking_lot::RwLock;
 use pyo3::prelude::*;
 use pyo3::types::{PyDict, PyList};
 
-// Custom Multimap class
+/// The most common header names, sorted, shared by every request instead of allocated.
+const COMMON_HEADER_NAMES: [&str; 36] = [
+    "accept",
+    "accept-encoding",
+    "accept-language",
+    "access-control-allow-origin",
+    "authorization",
+    "cache-control",
+    "connection",
+    "content-disposition",
+    "content-encoding",
+    "content-length",
+    "content-type",
+    "cookie",
+    "date",
+    "etag",
+    "expires",
+    "host",
+    "if-modified-since",
+    "if-none-match",
+    "keep-alive",
+    "last-modified",
+    "location",
+    "origin",
+    "pragma",
+    "referer",
+    "retry-after",
+    "sec-fetch-dest",
+    "sec-fetch-mode",
+    "sec-fetch-site",
+    "server",
+    "set-cookie",
+    "transfer-encoding",
+    "upgrade",
+    "user-agent",
+    "vary",
+    "x-forwarded-for",
+    "x-request-id",
+];
+
+/// Lowercases the header name, without allocating for the common ones.
+fn intern(key: &str) -> Cow<'static, str> {
+    let key: Cow<str> = if key.bytes().any(|byte| byte.is_ascii_uppercase()) {
+        Cow::Owned(key.to_ascii_lowercase())
+    } else {
+        Cow::Borrowed(key)
+    };
+    match COMMON_HEADER_NAMES.binary_search(&&*key) {
+        Ok(index) => Cow::Borrowed(COMMON_HEADER_NAMES[index]),
+        Err(_) => Cow::Owned(key.into_owned()),
+    }
+}
+
+/// The headers of a request or a response, owned by a single request.
+///
+/// A header with several values is stored as several entries, in the order they were added,
+/// so that the few headers of a request fit in a single allocation.
 #[pyclass(name = "Headers")]
 #[derive(Clone, Debug, Default)]
 pub struct Headers {
-    pub headers: DashMap<String, Vec<String>>,
+    entries: Vec<(Cow<'static, str>, String)>,
 }
 
 #[pymethods]
 impl Headers {
     #[new]
     pub fn new(default_headers: Option<&PyDict>) -> Self {
-        match default_headers {
-            Some(default_headers) => {
-                let headers = DashMap::new();
-                for (key, value) in default_headers {
-                    let key = key.to_string().to_lowercase();
-
-                    let new_value = value.downcast::<PyList>();
-
-                    if let Ok(new_value) = new_value {
-                        let value: Vec<String> = new_value.iter().map(|x| x.to_string()).collect();
-                        headers.entry(key).or_insert_with(Vec::new).extend(value);
-                    } else {
-                        let value = value.to_string();
-                        headers.entry(key).or_insert_with(Vec::new).push(value);
-                    }
-                }
-                Headers { headers }
-            }
-            None => Headers {
-                headers: DashMap::new(),
-            },
+        let mut headers = Headers::default();
+        if let Some(default_headers) = default_headers {
+            headers.populate_from_dict(default_headers);
         }
+        headers
     }
 
     pub fn set(&mut self, key: String, value: String) {
         debug!("Setting header {} to {}", key, value);
-        self.headers.insert(key.to_lowercase(), vec![value]);
+        self.remove(&key);
+        self.entries.push((intern(&key), value));
     }
 
     pub fn append(&mut self, key: String, value: String) {
         debug!("Setting header {} to {}", key, value);
-        self.headers
-            .entry(key.to_lowercase())
-            .or_default()
-            .push(value);
+        self.entries.push((intern(&key), value));
     }
 
     pub fn get_all(&self, py: Python, key: String) -> Py<PyList> {
-        match self.headers.get(&key.to_lowercase()) {
-            Some(values) => {
-                let py_values = PyList::new(py, values.iter().map(|value| value.to_object(py)));
-                py_values.into()
-            }
-            None => PyList::empty(py).into(),
-        }
+        PyList::new(py, self.values(&key).map(|value| value.to_object(py))).into()
     }
 
     pub fn get(&self, key: String) -> Option<String> {
         // return the last value
-        match self.headers.get(&key.to_lowercase()) {
-            Some(iter) => {
-                let (_, values) = iter.pair();
-                let last_value = values.last().unwrap();
-                Some(last_value.to_string())
-            }
-            None => None,
-        }
+        self.get_last(&key).map(|value| value.to_string())
     }
 
     pub fn get_headers(&self, py: Python) -> Py<PyDict> {
         // return as a dict of lists
         let dict = PyDict::new(py);
-        for iter in self.headers.iter() {
-            let (key, values) = iter.pair();
+        for (key, values) in self.grouped() {
             let py_values = PyList::new(py, values.iter().map(|value| value.to_object(py)));
             dict.set_item(key, py_values).unwrap();
         }
@@ -87,53 +113,38 @@ impl Headers {
 
     pub fn contains(&self, key: String) -> bool {
         debug!("Checking if header {} exists", key);
-        debug!("Headers: {:?}", self.headers);
-        self.headers.contains_key(&key.to_lowercase())
+        self.has(&key)
     }
 
     pub fn populate_from_dict(&mut self, headers: &PyDict) {
         for (key, value) in headers {
-            let key = key.to_string().to_lowercase();
-            let new_value = value.downcast::<PyList>();
-
-            if let Ok(new_value) = new_value {
-                let value: Vec<String> = new_value.iter().map(|x| x.to_string()).collect();
-                self.headers.entry(key).or_default().extend(value);
+            let key = intern(&key.to_string());
+            if let Ok(values) = value.downcast::<PyList>() {
+                for value in values {
+                    self.entries.push((key.clone(), value.to_string()));
+                }
             } else {
-                let value = value.to_string();
-                self.headers.entry(key).or_default().push(value);
+                self.entries.push((key, value.to_string()));
             }
         }
     }
 
     pub fn is_empty(&self) -> bool {
-        self.headers.is_empty()
+        self.entries.is_empty()
     }
 
     fn __eq__(&self, other: &Headers) -> bool {
-        if self.headers.is_empty() && other.headers.is_empty() {
-            return true;
-        }
-
-        if self.headers.len() != other.headers.len() {
-            return false;
-        }
-
-        for iter in &self.headers {
-            let (key, values) = iter.pair();
-            match other.headers.get(key) {
-                Some(other_values) => {
-                    if values.len() != other_values.len()
-                        || !values.iter().all(|v| other_values.contains(v))
-                    {
-                        return false;
-                    }
-                }
-                None => return false,
-            }
-        }
-
-        true
+        let (headers, other_headers) = (self.grouped(), other.grouped());
+        headers.len() == other_headers.len()
+            && headers.iter().all(|(key, values)| {
+                other_headers
+                    .iter()
+                    .find(|(other_key, _)| other_key == key)
+                    .is_some_and(|(_, other_values)| {
+                        values.len() == other_values.len()
+                            && values.iter().all(|value| other_values.contains(value))
+                    })
+            })
     }
 
     pub fn __contains__(&self, key: String) -> bool {
@@ -141,7 +152,7 @@ impl Headers {
     }
 
     pub fn __repr__(&self) -> String {
-        format!("{:?}", self.headers)
+        format!("{:?}", self.grouped())
     }
 
     pub fn __setitem__(&mut self, key: String, value: String) {
@@ -155,33 +166,171 @@ impl Headers {
 
 impl Headers {
     pub fn remove(&mut self, key: &str) {
-        self.headers.remove(&key.to_lowercase());
+        self.entries
+            .retain(|(name, _)| !name.eq_ignore_ascii_case(key));
     }
 
     pub fn clear(&mut self) {
-        self.headers.clear();
+        self.entries.clear();
     }
 
-    pub fn extend(&mut self, headers: &Headers) {
-        for iter in headers.headers.iter() {
-            let (key, values) = iter.pair();
-            let mut entry = self.headers.entry(key.clone()).or_default();
-            entry.extend(values.clone());
+    pub fn has(&self, key: &str) -> bool {
+        self.entries
+            .iter()
+            .any(|(name, _)| name.eq_ignore_ascii_case(key))
+    }
+
+    /// The values of the header, in the order they were added.
+    pub fn values<'a>(&'a self, key: &'a str) -> impl Iterator<Item = &'a str> {
+        self.entries
+            .iter()
+            .filter(move |(name, _)| name.eq_ignore_ascii_case(key))
+            .map(|(_, value)| value.as_str())
+    }
+
+    pub fn get_last(&self, key: &str) -> Option<&str> {
+        self.values(key).last()
+    }
+
+    /// Every header and value, a header with several values appearing several times.
+    pub fn iter(&self) -> impl Iterator<Item = (&str, &str)> {
+        self.entries
+            .iter()
+            .map(|(name, value)| (&**name, value.as_str()))
+    }
+
+    /// The values of every header, in the order the headers were first added.
+    fn grouped(&self) -> Vec<(&str, Vec<&str>)> {
+        let mut grouped: Vec<(&str, Vec<&str>)> = Vec::new();
+        for (name, value) in self.iter() {
+            match grouped.iter_mut().find(|(key, _)| *key == name) {
+                Some((_, values)) => values.push(value),
+                None => grouped.push((name, vec![value])),
+            }
         }
+        grouped
+    }
+
+    pub fn extend(&mut self, headers: &Headers) {
+        self.entries.extend(headers.entries.iter().cloned());
     }
 
     pub fn from_actix_headers(req_headers: &HeaderMap) -> Self {
-        let headers = Headers::default();
+        let mut entries = Vec::with_capacity(req_headers.len());
 
         for (key, value) in req_headers {
-            let key = key.to_string().to_lowercase();
-            let value = match value.to_str() {
-                Ok(value) => value.to_string(),
-                Err(_) => continue,
+            let Ok(value) = value.to_str() else {
+                continue;
             };
-            headers.headers.entry(key).or_default().push(value);
+            // the actix header names are already lowercase
+            entries.push((intern(key.as_str()), value.to_string()));
         }
 
-        headers
+        Headers { entries }
+    }
+}
+
+/// Headers shared by every worker, e.g. the global request and response headers,
+/// which can still be removed once the server has started.
+#[derive(Debug, Default)]
+pub struct SharedHeaders {
+    headers: DashMap<String, Vec<String>>,
+}
+
+impl SharedHeaders {
+    pub fn new(headers: &Headers) -> Self {
+        let shared = SharedHeaders::default();
+        for (key, value) in headers.iter() {
+            shared
+                .headers
+                .entry(key.to_string())
+                .or_default()
+                .push(value.to_string());
+        }
+        shared
+    }
+
+    pub fn remove(&self, key: &str) {
+        self.headers.remove(&key.to_lowercase());
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.headers.is_empty()
+    }
+
+    /// Appends the shared headers to the headers of a request or a response.
+    pub fn extend_into(&self, headers: &mut Headers) {
+        for entry in self.headers.iter() {
+            let (key, values) = entry.pair();
+            let key = intern(key);
+            for value in values {
+                headers.entries.push((key.clone(), value.clone()));
+            }
+        }
+    }
+}
+
+/// The global response headers, converted once into actix headers
+/// and appended as is to every response.
+#[derive(Debug, Default)]
+pub struct GlobalResponseHeaders {
+    headers: RwLock<Vec<(HeaderName, Vec<HeaderValue>)>>,
+}
+
+impl GlobalResponseHeaders {
+    pub fn new(headers: &Headers) -> Self {
+        let mut converted: Vec<(HeaderName, Vec<HeaderValue>)> = Vec::new();
+        for (key, value) in headers.iter() {
+            let (Ok(name), Ok(value)) = (HeaderName::try_from(key), HeaderValue::try_from(value))
+            else {
+                debug!("Skipping the invalid global response header {}", key);
+                continue;
+            };
+            match converted
+                .iter_mut()
+                .find(|(converted_name, _)| *converted_name == name)
+            {
+                Some((_, values)) => values.push(value),
+                None => converted.push((name, vec![value])),
+            }
+        }
+        Self {
+            headers: RwLock::new(converted),
+        }
+    }
+
+    /// Can be called once the server has started
+    pub fn remove(&self, key: &str) {
+        self.headers
+            .write()
+            .retain(|(name, _)| !name.as_str().eq_ignore_ascii_case(key));
+    }
+
+    /// Appends the global headers that the response did not set itself to a Robyn response,
+    /// for the routes whose after middlewares must see them.
+    pub fn extend_into(&self, headers: &mut Headers) {
+        for (name, values) in self.headers.read().iter() {
+            if headers.has(name.as_str()) {
+                continue;
+            }
+            let key = intern(name.as_str());
+            for value in values {
+                if let Ok(value) = value.to_str() {
+                    headers.entries.push((key.clone(), value.to_string()));
+                }
+            }
+        }
+    }
+
+    /// Appends the global headers that the response did not set itself.
+    pub fn apply(&self, response_headers: &mut HeaderMap) {
+        for (name, values) in self.headers.read().iter() {
+            if response_headers.contains_key(name) {
+                continue;
+            }
+            for value in values {
+                response_headers.append(name.clone(), value.clone());
+            }
+        }
     }
 }
@@ -3,7 +3,7 @@ use std::collections::HashMap;
 use pyo3::{pyclass, pymethods};
 
 #[pyclass]
-#[derive(Debug, Clone)]
+#[derive(Debug, Clone, PartialEq)]
 pub struct Identity {
     #[pyo3(get, set)]
     claims: HashMap<String, String>,
@@ -1,20 +1,29 @@
+use std::sync::Arc;
+
+use bytes::Bytes;
 use log::debug;
 use pyo3::{
+    buffer::PyBuffer,
     exceptions::PyValueError,
     prelude::*,
     types::{PyBytes, PyString},
 };
 
+pub mod blocking_pool;
+pub mod body_stream;
+pub mod cache;
 pub mod function_info;
 pub mod headers;
 pub mod identity;
 pub mod multimap;
+pub mod rate_limit;
 pub mod request;
 pub mod response;
+pub mod upload_file;
 
 #[allow(clippy::large_enum_variant)]
 pub enum MiddlewareReturn {
-    Request(request::Request),
+    Request(Arc<request::Request>),
     Response(response::Response),
 }
 
@@ -73,30 +82,84 @@ impl Url {
     }
 }
 
-pub fn get_body_from_pyobject(body: &PyAny) -> PyResult<Vec<u8>> {
-    if let Ok(s) = body.downcast::<PyString>() {
-        Ok(s.to_string().into_bytes())
-    } else if let Ok(b) = body.downcast::<PyBytes>() {
-        Ok(b.as_bytes().to_vec())
-    } else {
-        debug!("Could not convert specified body to bytes");
-        Ok(vec![])
+/// `bytes` objects of at least this size are shared with Python instead of being copied.
+/// Smaller ones are copied, as a copy is cheaper than holding on to the Python object.
+const ZERO_COPY_MIN_SIZE: usize = 64 * 1024;
+
+/// Keeps a Python `bytes` alive for as long as the `Bytes` pointing into its data.
+struct PyBytesOwner {
+    data: &'static [u8],
+    _bytes: Py<PyBytes>,
+}
+
+impl PyBytesOwner {
+    fn new(bytes: &PyBytes) -> Self {
+        let data = bytes.as_bytes();
+        Self {
+            // Safety: a `bytes` object is immutable, so its data can't change or move, and it
+            // is only released when the owner is dropped, after the slice
+            data: unsafe { std::slice::from_raw_parts(data.as_ptr(), data.len()) },
+            _bytes: bytes.into(),
+        }
+    }
+}
+
+impl AsRef<[u8]> for PyBytesOwner {
+    fn as_ref(&self) -> &[u8] {
+        self.data
+    }
+}
+
+/// Converts a str or any object implementing the buffer protocol into `Bytes`.
+/// Large `bytes` objects are shared instead of being copied. Every other buffer is copied,
+/// as its exporter (e.g. a `bytearray` behind a read only memoryview) can still be changed
+/// or resized from Python while the response is written.
+fn get_bytes_from_pyobject(object: &PyAny) -> PyResult<Option<Bytes>> {
+    if let Ok(s) = object.downcast::<PyString>() {
+        return Ok(Some(Bytes::from(s.to_string_lossy().into_owned())));
+    }
+
+    if let Ok(b) = object.downcast::<PyBytes>() {
+        if b.as_bytes().len() < ZERO_COPY_MIN_SIZE {
+            return Ok(Some(Bytes::copy_from_slice(b.as_bytes())));
+        }
+        return Ok(Some(Bytes::from_owner(PyBytesOwner::new(b))));
+    }
+
+    match PyBuffer::<u8>::get(object) {
+        Ok(buffer) => Ok(Some(Bytes::from(buffer.to_vec(object.py())?))),
+        Err(_) => Ok(None),
+    }
+}
+
+fn supports_bytes_conversion(object: &PyAny) -> bool {
+    object.downcast::<PyString>().is_ok()
+        || object.downcast::<PyBytes>().is_ok()
+        || PyBuffer::<u8>::get(object).is_ok()
+}
+
+pub fn get_body_from_pyobject(body: &PyAny) -> PyResult<Bytes> {
+    match get_bytes_from_pyobject(body)? {
+        Some(body) => Ok(body),
+        None => {
+            debug!("Could not convert specified body to bytes");
+            Ok(Bytes::new())
+        }
     }
 }
 
-pub fn get_description_from_pyobject(description: &PyAny) -> PyResult<Vec<u8>> {
-    if let Ok(s) = description.downcast::<PyString>() {
-        Ok(s.to_string().into_bytes())
-    } else if let Ok(b) = description.downcast::<PyBytes>() {
-        Ok(b.as_bytes().to_vec())
-    } else {
-        debug!("Could not convert specified response description to bytes");
-        Ok(vec![])
+pub fn get_description_from_pyobject(description: &PyAny) -> PyResult<Bytes> {
+    match get_bytes_from_pyobject(description)? {
+        Some(description) => Ok(description),
+        None => {
+            debug!("Could not convert specified response description to bytes");
+            Ok(Bytes::new())
+        }
     }
 }
 
 pub fn check_body_type(py: Python, body: &Py<PyAny>) -> PyResult<()> {
-    if body.downcast::<PyString>(py).is_err() && body.downcast::<PyBytes>(py).is_err() {
+    if !supports_bytes_conversion(body.as_ref(py)) {
         return Err(PyValueError::new_err(
             "Could not convert specified body to bytes",
         ));
@@ -105,7 +168,7 @@ pub fn check_body_type(py: Python, body: &Py<PyAny>) -> PyResult<()> {
 }
 
 pub fn check_description_type(py: Python, body: &Py<PyAny>) -> PyResult<()> {
-    if body.downcast::<PyString>(py).is_err() && body.downcast::<PyBytes>(py).is_err() {
+    if !supports_bytes_conversion(body.as_ref(py)) {
         return Err(PyValueError::new_err(
             "Could not convert specified response description to bytes",
         ));
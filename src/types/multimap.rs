@@ -1,83 +1,236 @@
-use log::debug;
+use std::borrow::Cow;
+
+use once_cell::sync::OnceCell;
+use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
 use pyo3::types::{PyDict, PyList};
 use std::collections::HashMap;
 
-// Custom Multimap class
+fn hex_value(byte: u8) -> Option<u8> {
+    match byte {
+        b'0'..=b'9' => Some(byte - b'0'),
+        b'a'..=b'f' => Some(byte - b'a' + 10),
+        b'A'..=b'F' => Some(byte - b'A' + 10),
+        _ => None,
+    }
+}
+
+/// Decodes a key or a value of an `application/x-www-form-urlencoded` query string:
+/// `+` is a space and `%XX` an escaped byte. Malformed escapes are kept as is.
+pub fn percent_decode(input: &str) -> Cow<str> {
+    if !input.bytes().any(|byte| byte == b'%' || byte == b'+') {
+        return Cow::Borrowed(input);
+    }
+
+    let bytes = input.as_bytes();
+    let mut decoded = Vec::with_capacity(bytes.len());
+    let mut index = 0;
+    while index < bytes.len() {
+        match bytes[index] {
+            b'+' => decoded.push(b' '),
+            b'%' if index + 2 < bytes.len() => {
+                match (hex_value(bytes[index + 1]), hex_value(bytes[index + 2])) {
+                    (Some(high), Some(low)) => {
+                        decoded.push(high << 4 | low);
+                        index += 2;
+                    }
+                    _ => decoded.push(b'%'),
+                }
+            }
+            byte => decoded.push(byte),
+        }
+        index += 1;
+    }
+
+    Cow::Owned(String::from_utf8_lossy(&decoded).into_owned())
+}
+
+/// Splits a query string into its decoded key and value pairs, in order.
+fn parse_query_string(query_string: &str) -> Vec<(String, String)> {
+    query_string
+        .split('&')
+        .filter(|pair| !pair.is_empty())
+        .map(|pair| {
+            let (key, value) = pair.split_once('=').unwrap_or((pair, ""));
+            (
+                percent_decode(key).into_owned(),
+                percent_decode(value).into_owned(),
+            )
+        })
+        .collect()
+}
+
+/// The query parameters of a request.
+///
+/// The raw query string is only parsed the first time a parameter is read, so requests
+/// whose handler never looks at the query params don't pay for it. A key with several
+/// values is stored as several pairs, in the order they appear in the query string.
 #[pyclass(subclass)]
 #[derive(Clone, Debug, Default)]
 pub struct QueryParams {
-    pub queries: HashMap<String, Vec<String>>,
+    raw: String,
+    pairs: OnceCell<Vec<(String, String)>>,
 }
 
 #[pymethods]
 impl QueryParams {
     #[new]
-    pub fn new() -> Self {
-        QueryParams {
-            queries: HashMap::new(),
+    #[pyo3(signature = (query_string = None))]
+    pub fn py_new(query_string: Option<&str>) -> Self {
+        match query_string {
+            Some(query_string) => QueryParams::from_query_string(query_string),
+            None => QueryParams::new(),
         }
     }
 
     pub fn set(&mut self, key: String, value: String) {
-        debug!("Setting key: {} to value: {}", key, value);
-        self.queries.entry(key).or_default().push(value);
-        debug!("Multimap: {:?}", self.queries);
+        self.pairs_mut().push((key, value));
     }
 
     pub fn get(&self, key: String, default: Option<String>) -> Option<String> {
-        match self.queries.get(&key) {
-            Some(values) => values.last().cloned(),
+        match self.values(&key).last() {
+            Some(value) => Some(value.to_string()),
             None => default,
         }
     }
 
     pub fn get_first(&self, key: String) -> Option<String> {
-        match self.queries.get(&key) {
-            Some(values) => values.first().cloned(),
-            None => None,
+        self.values(&key).next().map(|value| value.to_string())
+    }
+
+    /// The last value of the key as an integer, the default if the key is missing.
+    #[pyo3(signature = (key, default = None))]
+    pub fn get_int(&self, key: String, default: Option<i64>) -> PyResult<Option<i64>> {
+        match self.values(&key).last() {
+            Some(value) => value.trim().parse().map(Some).map_err(|_| {
+                PyValueError::new_err(format!(
+                    "Query parameter {} is not an integer: {}",
+                    key, value
+                ))
+            }),
+            None => Ok(default),
         }
     }
 
+    /// The last value of the key as a boolean, the default if the key is missing.
+    /// A key without a value, e.g. `?verbose`, is true.
+    #[pyo3(signature = (key, default = None))]
+    pub fn get_bool(&self, key: String, default: Option<bool>) -> PyResult<Option<bool>> {
+        match self.values(&key).last() {
+            Some(value) => match value.trim().to_ascii_lowercase().as_str() {
+                "" | "true" | "1" | "yes" | "on" => Ok(Some(true)),
+                "false" | "0" | "no" | "off" => Ok(Some(false)),
+                _ => Err(PyValueError::new_err(format!(
+                    "Query parameter {} is not a boolean: {}",
+                    key, value
+                ))),
+            },
+            None => Ok(default),
+        }
+    }
+
+    /// Every value of the key, each split on the separator,
+    /// e.g. `?tag=a,b&tag=c` gives `["a", "b", "c"]`. Empty if the key is missing.
+    #[pyo3(signature = (key, separator = ","))]
+    pub fn get_list(&self, key: String, separator: &str) -> Vec<String> {
+        let mut list = Vec::new();
+        for value in self.values(&key) {
+            if separator.is_empty() {
+                list.push(value.to_string());
+                continue;
+            }
+            list.extend(
+                value
+                    .split(separator)
+                    .filter(|item| !item.is_empty())
+                    .map(|item| item.to_string()),
+            );
+        }
+        list
+    }
+
     pub fn empty(&self) -> bool {
-        self.queries.is_empty()
+        self.pairs().is_empty()
     }
 
     pub fn contains(&self, key: String) -> bool {
-        self.queries.contains_key(&key)
+        self.contains_key(&key)
     }
 
     pub fn get_all(&self, key: String) -> Option<Vec<String>> {
-        self.queries.get(&key).cloned()
+        let values: Vec<String> = self.values(&key).map(|value| value.to_string()).collect();
+        if values.is_empty() {
+            None
+        } else {
+            Some(values)
+        }
     }
 
     pub fn extend(&mut self, other: &mut Self) {
-        for (key, values) in other.queries.iter_mut() {
-            for value in values.iter_mut() {
-                self.set(key.clone(), value.clone());
-            }
-        }
+        let other_pairs = other.pairs().clone();
+        self.pairs_mut().extend(other_pairs);
     }
 
     pub fn to_dict(&self, py: Python) -> PyResult<Py<PyDict>> {
         let dict = PyDict::new(py);
-        for (key, values) in self.queries.iter() {
-            let values = PyList::new(py, values.iter());
+        for (key, values) in self.grouped() {
+            let values = PyList::new(py, values);
             dict.set_item(key, values)?;
         }
         Ok(dict.into())
     }
 
     pub fn __contains__(&self, key: String) -> bool {
-        self.queries.contains_key(&key)
+        self.contains_key(&key)
     }
 
     pub fn __repr__(&self) -> String {
-        format!("{:?}", self.queries)
+        format!("{:?}", self.grouped())
     }
 }
 
 impl QueryParams {
+    pub fn new() -> Self {
+        QueryParams::default()
+    }
+
+    /// Keeps the raw query string, which is parsed on first access.
+    pub fn from_query_string(query_string: &str) -> Self {
+        QueryParams {
+            raw: query_string.to_string(),
+            pairs: OnceCell::new(),
+        }
+    }
+
+    fn pairs(&self) -> &Vec<(String, String)> {
+        self.pairs.get_or_init(|| parse_query_string(&self.raw))
+    }
+
+    fn pairs_mut(&mut self) -> &mut Vec<(String, String)> {
+        self.pairs();
+        self.pairs.get_mut().unwrap()
+    }
+
+    /// The values of the key, in the order they appear in the query string.
+    pub fn values<'a>(&'a self, key: &'a str) -> impl Iterator<Item = &'a str> {
+        self.pairs()
+            .iter()
+            .filter(move |(name, _)| name == key)
+            .map(|(_, value)| value.as_str())
+    }
+
+    /// The values of every key, in the order the keys first appear.
+    fn grouped(&self) -> Vec<(&str, Vec<&str>)> {
+        let mut grouped: Vec<(&str, Vec<&str>)> = Vec::new();
+        for (key, value) in self.pairs() {
+            match grouped.iter_mut().find(|(name, _)| *name == key.as_str()) {
+                Some((_, values)) => values.push(value),
+                None => grouped.push((key, vec![value])),
+            }
+        }
+        grouped
+    }
+
     pub fn from_hashmap(map: HashMap<String, Vec<String>>) -> Self {
         let mut multimap = QueryParams::new();
         for (key, values) in map {
@@ -99,14 +252,12 @@ impl QueryParams {
     }
 
     pub fn contains_key(&self, key: &str) -> bool {
-        self.queries.contains_key(key)
+        self.pairs().iter().any(|(name, _)| name == key)
     }
 
     pub fn insert(&mut self, key: String, value: Vec<String>) {
-        self.queries.insert(key, value);
-    }
-
-    pub fn get_mut(&mut self, key: &str) -> Option<&Vec<String>> {
-        self.queries.get(key)
+        let pairs = self.pairs_mut();
+        pairs.retain(|(name, _)| *name != key);
+        pairs.extend(value.into_iter().map(|value| (key.clone(), value)));
     }
 }
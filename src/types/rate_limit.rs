@@ -0,0 +1,254 @@
+use std::{
+    collections::hash_map::DefaultHasher,
+    hash::{Hash, Hasher},
+    sync::atomic::{AtomicU64, Ordering},
+    time::{Duration, SystemTime, UNIX_EPOCH},
+};
+
+use actix_web::{web::Bytes, HttpRequest};
+use pyo3::{buffer::PyBuffer, exceptions::PyValueError, prelude::*};
+
+use super::{headers::Headers, response::Response};
+
+/// Number of slots probed for the bucket of a client before taking over one.
+const MAX_PROBES: usize = 8;
+/// Number of slots of the store when it is not shared with other processes.
+const LOCAL_STORE_SLOTS: usize = 16384;
+
+// the ids are assigned before the processes are forked, so that they match in all of them
+static NEXT_RATE_LIMIT_ID: AtomicU64 = AtomicU64::new(1);
+
+/// Limits the requests to `rate` every `per` seconds, with bursts of up to `burst` requests.
+///
+/// The requests are counted per client IP, or per value of a header with `key="header:X-Api-Key"`
+/// (the requests without the header being counted per IP). Once over the limit,
+/// the requests get a 429 with a `Retry-After` header without calling Python.
+#[pyclass]
+#[derive(Debug, Clone)]
+pub struct RateLimit {
+    #[pyo3(get)]
+    pub rate: u32,
+    #[pyo3(get)]
+    pub per: f64,
+    #[pyo3(get)]
+    pub burst: u32,
+    #[pyo3(get)]
+    pub key: String,
+    id: u64,
+    header: Option<String>,
+    // in microseconds
+    emission_interval: u64,
+}
+
+#[pymethods]
+impl RateLimit {
+    #[new]
+    #[pyo3(signature = (rate, per = 1.0, burst = None, key = "ip".to_string()))]
+    pub fn new(rate: u32, per: f64, burst: Option<u32>, key: String) -> PyResult<Self> {
+        if rate == 0 {
+            return Err(PyValueError::new_err("rate must be greater than 0"));
+        }
+        if !(per > 0.0) {
+            return Err(PyValueError::new_err(
+                "per must be a positive number of seconds",
+            ));
+        }
+        let burst = burst.unwrap_or(rate);
+        if burst == 0 {
+            return Err(PyValueError::new_err("burst must be greater than 0"));
+        }
+        let header = match key.strip_prefix("header:") {
+            Some(header) => Some(header.trim().to_lowercase()),
+            None if key == "ip" => None,
+            None => {
+                return Err(PyValueError::new_err(
+                    "key must be \"ip\" or \"header:<name>\"",
+                ))
+            }
+        };
+
+        Ok(Self {
+            rate,
+            per,
+            burst,
+            key,
+            id: NEXT_RATE_LIMIT_ID.fetch_add(1, Ordering::Relaxed),
+            header,
+            emission_interval: ((per * 1_000_000.0) / rate as f64).max(1.0) as u64,
+        })
+    }
+
+    pub fn __repr__(&self) -> String {
+        format!(
+            "RateLimit(rate={}, per={}, burst={}, key={:?})",
+            self.rate, self.per, self.burst, self.key
+        )
+    }
+}
+
+impl RateLimit {
+    /// Hash of the limit and of the client, the same in all the processes.
+    fn client_key(&self, req: &HttpRequest) -> u64 {
+        let mut hasher = DefaultHasher::new();
+        self.id.hash(&mut hasher);
+        match self
+            .header
+            .as_ref()
+            .and_then(|header| req.headers().get(header.as_str()))
+        {
+            Some(value) => value.as_bytes().hash(&mut hasher),
+            None => req.peer_addr().map(|addr| addr.ip()).hash(&mut hasher),
+        }
+        // 0 marks the empty slots
+        hasher.finish().max(1)
+    }
+}
+
+enum Slots {
+    Local(Box<[AtomicU64]>),
+    // e.g. an anonymous `mmap` created before the processes are forked
+    Shared(PyBuffer<u8>),
+}
+
+/// The buckets of the rate limits, counted with the generic cell rate algorithm.
+///
+/// Each slot is a pair of `AtomicU64`, the hash of the client and the time at which its
+/// bucket is full again, so that the store can live in memory shared by several processes.
+pub struct RateLimitStore {
+    slots: Slots,
+}
+
+impl RateLimitStore {
+    pub fn local() -> Self {
+        Self {
+            slots: Slots::Local(
+                (0..LOCAL_STORE_SLOTS * 2)
+                    .map(|_| AtomicU64::new(0))
+                    .collect(),
+            ),
+        }
+    }
+
+    pub fn shared(buffer: &PyAny) -> PyResult<Self> {
+        let buffer = PyBuffer::<u8>::get(buffer)?;
+        if buffer.readonly()
+            || !buffer.is_c_contiguous()
+            || buffer.len_bytes() < 16
+            || buffer.buf_ptr() as usize % std::mem::align_of::<AtomicU64>() != 0
+        {
+            return Err(PyValueError::new_err(
+                "The rate limit store must be a writable and aligned buffer of at least 16 bytes",
+            ));
+        }
+
+        Ok(Self {
+            slots: Slots::Shared(buffer),
+        })
+    }
+
+    fn words(&self) -> &[AtomicU64] {
+        match &self.slots {
+            Slots::Local(words) => &words[..],
+            // SAFETY: the buffer is writable, aligned and kept alive along with the store
+            Slots::Shared(buffer) => unsafe {
+                std::slice::from_raw_parts(
+                    buffer.buf_ptr() as *const AtomicU64,
+                    buffer.len_bytes() / 16 * 2,
+                )
+            },
+        }
+    }
+
+    /// The time at which the bucket of the client is full again.
+    fn bucket(&self, client_key: u64, now: u64) -> &AtomicU64 {
+        let words = self.words();
+        let slots = words.len() / 2;
+        let start = (client_key % slots as u64) as usize;
+
+        let mut refilled = None;
+        for probe in 0..MAX_PROBES.min(slots) {
+            let index = (start + probe) % slots;
+            let (key, bucket) = (&words[2 * index], &words[2 * index + 1]);
+            match key.load(Ordering::Acquire) {
+                k if k == client_key => return bucket,
+                0 => match key.compare_exchange(0, client_key, Ordering::AcqRel, Ordering::Acquire)
+                {
+                    Ok(_) => return bucket,
+                    Err(k) if k == client_key => return bucket,
+                    Err(_) => {}
+                },
+                _ => {
+                    if refilled.is_none() && bucket.load(Ordering::Relaxed) <= now {
+                        refilled = Some(index);
+                    }
+                }
+            }
+        }
+
+        // a full bucket can be taken over without losing anything,
+        // the first probed one is when all of them are in use
+        let index = refilled.unwrap_or(start);
+        let bucket = &words[2 * index + 1];
+        // the bucket belonged to another client, whose debt the new one must not inherit
+        bucket.store(0, Ordering::Relaxed);
+        words[2 * index].store(client_key, Ordering::Release);
+        bucket
+    }
+
+    /// Counts the request, returning how long the client has to wait if it is over the limit.
+    pub fn check(&self, rate_limit: &RateLimit, req: &HttpRequest) -> Option<Duration> {
+        let now = SystemTime::now()
+            .duration_since(UNIX_EPOCH)
+            .unwrap_or_default()
+            .as_micros() as u64;
+        let bucket = self.bucket(rate_limit.client_key(req), now);
+        let tolerance = rate_limit.emission_interval * rate_limit.burst as u64;
+
+        let mut current = bucket.load(Ordering::Acquire);
+        loop {
+            let next = current.max(now) + rate_limit.emission_interval;
+            if next > now + tolerance {
+                return Some(Duration::from_micros(next - tolerance - now));
+            }
+            match bucket.compare_exchange_weak(current, next, Ordering::AcqRel, Ordering::Acquire) {
+                Ok(_) => return None,
+                Err(actual) => current = actual,
+            }
+        }
+    }
+}
+
+/// The rate limit of every route, along with the store of the buckets of all the limits.
+pub struct RateLimiter {
+    pub store: RateLimitStore,
+    pub global: Option<RateLimit>,
+}
+
+impl RateLimiter {
+    /// The 429 response if the request is over the global or the route limit.
+    pub fn check(
+        &self,
+        route_rate_limit: Option<&RateLimit>,
+        req: &HttpRequest,
+    ) -> Option<Response> {
+        let retry_after = self
+            .global
+            .iter()
+            .chain(route_rate_limit)
+            .find_map(|rate_limit| self.store.check(rate_limit, req))?;
+
+        let mut headers = Headers::new(None);
+        headers.set(
+            "retry-after".to_string(),
+            (retry_after.as_secs_f64().ceil() as u64).max(1).to_string(),
+        );
+        Some(Response {
+            status_code: 429,
+            response_type: "text".to_string(),
+            headers,
+            description: Bytes::from_static(b"Too Many Requests"),
+            file_path: None,
+            stream: None,
+        })
+    }
+}
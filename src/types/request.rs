@@ -1,112 +1,174 @@
-use actix_multipart::Multipart;
+use actix_multipart::{Field, Multipart};
 use actix_web::{
-    web::{self, BytesMut},
+    web::{self, Bytes, BytesMut},
     Error, HttpRequest,
 };
 use futures_util::StreamExt as _;
 use log::debug;
-use pyo3::types::{PyBytes, PyDict, PyString};
-use pyo3::{exceptions::PyValueError, prelude::*};
-use serde_json::Value;
+use once_cell::unsync::OnceCell;
+use pyo3::types::{IntoPyDict, PyBytes, PyDict, PyString};
+use pyo3::{exceptions::PyBufferError, ffi, prelude::*, sync::GILOnceCell, AsPyPointer};
 use std::collections::HashMap;
+use std::ffi::CStr;
+use std::os::raw::{c_int, c_void};
+use std::sync::Arc;
+use tempfile::NamedTempFile;
+use tokio::io::AsyncWriteExt as _;
 
 use crate::types::{check_body_type, get_body_from_pyobject, Url};
 
-use super::{headers::Headers, identity::Identity, multimap::QueryParams};
+use super::{
+    body_stream::BodyStream,
+    headers::{Headers, SharedHeaders},
+    identity::Identity,
+    multimap::QueryParams,
+    upload_file::UploadFile,
+};
 
-#[derive(Default, Debug, Clone, FromPyObject)]
+#[derive(Default, Debug, Clone)]
 pub struct Request {
     pub query_params: QueryParams,
     pub headers: Headers,
     pub method: String,
     pub path_params: HashMap<String, String>,
-    // https://pyo3.rs/v0.19.2/function.html?highlight=from_py_#per-argument-options
-    #[pyo3(from_py_with = "get_body_from_pyobject")]
-    pub body: Vec<u8>,
+    pub body: Bytes,
     pub url: Url,
     pub ip_addr: Option<String>,
     pub identity: Option<Identity>,
     pub form_data: Option<HashMap<String, String>>,
     pub files: Option<HashMap<String, Vec<u8>>>,
+    pub uploads: Vec<UploadFile>,
+    pub body_stream: Option<BodyStream>,
 }
 
-impl ToPyObject for Request {
+impl ToPyObject for PyRequest {
     fn to_object(&self, py: Python) -> PyObject {
-        let query_params = self.query_params.clone();
-        let headers: Py<Headers> = self.headers.clone().into_py(py).extract(py).unwrap();
-        let path_params = self.path_params.clone().into_py(py).extract(py).unwrap();
-        let body = match String::from_utf8(self.body.clone()) {
-            Ok(s) => s.into_py(py),
-            Err(_) => self.body.clone().into_py(py),
-        };
-        let form_data: Py<PyDict> = match &self.form_data {
-            Some(data) => {
-                let dict = PyDict::new(py);
-                for (key, value) in data.iter() {
-                    dict.set_item(key, value).unwrap();
-                }
-                dict.into_py(py)
-            }
-            None => PyDict::new(py).into_py(py),
-        };
+        Py::new(py, self.clone()).unwrap().as_ref(py).into()
+    }
+}
 
-        let files: Py<PyDict> = match &self.files {
-            Some(data) => {
-                let dict = PyDict::new(py);
-                for (key, value) in data.iter() {
-                    let bytes = PyBytes::new(py, value);
-                    dict.set_item(key, bytes).unwrap();
-                }
-                dict.into_py(py)
-            }
-            None => PyDict::new(py).into_py(py),
-        };
+impl<'source> FromPyObject<'source> for Request {
+    fn extract(ob: &'source PyAny) -> PyResult<Self> {
+        let request: PyRef<PyRequest> = ob.extract()?;
+        request.to_request(ob.py())
+    }
+}
 
-        let request = PyRequest {
-            query_params,
-            path_params,
-            headers,
-            body,
-            method: self.method.clone(),
-            url: self.url.clone(),
-            ip_addr: self.ip_addr.clone(),
-            identity: self.identity.clone(),
-            form_data: form_data.clone(),
-            files: files.clone(),
-        };
-        Py::new(py, request).unwrap().as_ref(py).into()
+/// How multipart requests are read.
+#[derive(Debug, Clone)]
+pub struct MultipartConfig {
+    /// Files larger than this are spooled to a temporary file instead of being kept in memory.
+    pub spool_size: usize,
+    /// Whether the data of all the fields is also concatenated into the request body.
+    pub raw_body: bool,
+}
+
+impl Default for MultipartConfig {
+    fn default() -> Self {
+        Self {
+            spool_size: 1024 * 1024,
+            raw_body: false,
+        }
+    }
+}
+
+async fn read_upload(
+    field: &mut Field,
+    name: String,
+    filename: String,
+    spool_size: usize,
+    mut body: Option<&mut BytesMut>,
+) -> Result<UploadFile, Error> {
+    let content_type = field.content_type().map(|mime| mime.to_string());
+    let mut data = BytesMut::new();
+    let mut spooled: Option<(NamedTempFile, tokio::fs::File)> = None;
+    let mut size = 0;
+
+    while let Some(chunk) = field.next().await {
+        let chunk = chunk?;
+        size += chunk.len();
+        if let Some(body) = body.as_mut() {
+            body.extend_from_slice(&chunk);
+        }
+
+        if let Some((_, file)) = spooled.as_mut() {
+            file.write_all(&chunk).await?;
+        } else if data.len() + chunk.len() > spool_size {
+            let temp_file = NamedTempFile::new()?;
+            let mut file = tokio::fs::File::from_std(temp_file.reopen()?);
+            file.write_all(&data).await?;
+            file.write_all(&chunk).await?;
+            data = BytesMut::new();
+            spooled = Some((temp_file, file));
+        } else {
+            data.extend_from_slice(&chunk);
+        }
+    }
+
+    match spooled {
+        Some((temp_file, mut file)) => {
+            file.flush().await?;
+            Ok(UploadFile::on_disk(
+                name,
+                filename,
+                content_type,
+                size,
+                temp_file,
+            ))
+        }
+        None => Ok(UploadFile::in_memory(
+            name,
+            filename,
+            content_type,
+            data.freeze(),
+        )),
     }
 }
 
 async fn handle_multipart(
     mut payload: Multipart,
-    files: &mut HashMap<String, Vec<u8>>,
+    config: &MultipartConfig,
+    uploads: &mut Vec<UploadFile>,
     form_data: &mut HashMap<String, String>,
-    body: &mut Vec<u8>,
+    body: &mut BytesMut,
 ) -> Result<(), Error> {
-    // Iterate over multipart stream
-
     while let Some(item) = payload.next().await {
         let mut field = item?;
 
-        let mut data = Vec::new();
-        // Read the field data
-        while let Some(chunk) = field.next().await {
-            debug!("Chunk: {:?}", chunk);
-            let data_chunk = chunk?;
-            data.extend_from_slice(&data_chunk);
-        }
-
         let content_disposition = field.content_disposition();
-        let field_name = content_disposition.get_name().unwrap_or_default();
+        let field_name = content_disposition
+            .get_name()
+            .unwrap_or_default()
+            .to_string();
         let file_name = content_disposition.get_filename().map(|s| s.to_string());
 
-        body.extend_from_slice(&data.clone());
+        let raw_body = if config.raw_body {
+            Some(&mut *body)
+        } else {
+            None
+        };
 
-        if let Some(name) = file_name {
-            files.insert(name, data);
-        } else if let Ok(text) = String::from_utf8(data) {
-            form_data.insert(field_name.to_string(), text);
+        if let Some(file_name) = file_name {
+            let upload = read_upload(
+                &mut field,
+                field_name,
+                file_name,
+                config.spool_size,
+                raw_body,
+            )
+            .await?;
+            uploads.push(upload);
+        } else {
+            let mut data = BytesMut::new();
+            while let Some(chunk) = field.next().await {
+                data.extend_from_slice(&chunk?);
+            }
+            if let Some(body) = raw_body {
+                body.extend_from_slice(&data);
+            }
+            if let Ok(text) = std::str::from_utf8(&data) {
+                form_data.insert(field_name, text.to_owned());
+            }
         }
     }
 
@@ -114,31 +176,28 @@ async fn handle_multipart(
 }
 
 impl Request {
+    /// Builds the request from actix, buffering the whole body
+    /// unless `stream_body` is set, in which case it is handed over as a `BodyStream`.
     pub async fn from_actix_request(
         req: &HttpRequest,
         mut payload: web::Payload,
-        global_headers: &Headers,
-    ) -> Self {
-        let mut query_params: QueryParams = QueryParams::new();
+        global_headers: &SharedHeaders,
+        multipart_config: &MultipartConfig,
+        stream_body: bool,
+    ) -> Result<Self, Error> {
+        let query_params = QueryParams::from_query_string(req.query_string());
         let mut form_data: HashMap<String, String> = HashMap::new();
-        let mut files = HashMap::new();
-
-        if !req.query_string().is_empty() {
-            let split = req.query_string().split('&');
-            for s in split {
-                let path_params = s.split_once('=').unwrap_or((s, ""));
-                let key = path_params.0.to_string();
-                let value = path_params.1.to_string();
-
-                query_params.set(key, value);
-            }
-        }
+        let mut uploads = Vec::new();
 
         let mut headers = Headers::from_actix_headers(req.headers());
-        debug!("Global headers: {:?}", global_headers);
-        headers.extend(global_headers);
+        global_headers.extend_into(&mut headers);
+
+        let mut body_stream = None;
 
-        let body: Vec<u8> = if headers.contains(String::from("content-type"))
+        let body: Bytes = if stream_body {
+            body_stream = Some(BodyStream::from_payload(payload));
+            Bytes::new()
+        } else if headers.contains(String::from("content-type"))
             && headers
                 .get(String::from("content-type"))
                 .is_some_and(|val| val.contains("multipart/form-data"))
@@ -146,29 +205,35 @@ impl Request {
             let h = headers.get(String::from("content-type")).unwrap();
             debug!("Content-Type: {:?}", h);
             let multipart = Multipart::new(req.headers(), payload);
-            let mut body_local: Vec<u8> = Vec::new();
+            let mut body_local = BytesMut::new();
 
-            let a = handle_multipart(multipart, &mut files, &mut form_data, &mut body_local).await;
+            let a = handle_multipart(
+                multipart,
+                multipart_config,
+                &mut uploads,
+                &mut form_data,
+                &mut body_local,
+            )
+            .await;
 
             if let Err(e) = a {
                 debug!("Error handling multipart data: {:?}", e);
             }
 
-            body_local
+            body_local.freeze()
         } else {
             let mut body_local = BytesMut::new();
             while let Some(chunk) = payload.next().await {
-                let chunk = chunk.expect("Failed to read chunk from payload");
-                body_local.extend_from_slice(&chunk);
+                body_local.extend_from_slice(&chunk?);
             }
-            body_local.freeze().to_vec()
+            body_local.freeze()
         };
 
         debug!("Request body: {:?}", body);
         debug!("Request headers: {:?}", headers);
         debug!("Request query params: {:?}", query_params);
         debug!("Request form data: {:?}", form_data);
-        debug!("Request files: {:?}", files);
+        debug!("Request files: {:?}", uploads);
 
         let url = Url::new(
             req.connection_info().scheme(),
@@ -177,7 +242,7 @@ impl Request {
         );
         let ip_addr = req.peer_addr().map(|val| val.ip().to_string());
 
-        Self {
+        Ok(Self {
             query_params,
             headers,
             method: req.method().as_str().to_owned(),
@@ -187,34 +252,110 @@ impl Request {
             ip_addr,
             identity: None,
             form_data: Some(form_data),
-            files: Some(files),
-        }
+            // built from the uploads when read from Python
+            files: None,
+            uploads,
+            body_stream,
+        })
     }
 }
 
+/// The request object handed to Python.
+///
+/// It keeps the Rust request behind an `Arc` and only converts a field into
+/// a Python object the first time it is read. Fields that were never read are
+/// moved back into Rust without a round trip through Python.
 #[pyclass(name = "Request")]
 #[derive(Clone)]
 pub struct PyRequest {
-    #[pyo3(get, set)]
-    pub query_params: QueryParams,
-    #[pyo3(get, set)]
-    pub headers: Py<Headers>,
-    #[pyo3(get, set)]
-    pub path_params: Py<PyDict>,
+    inner: Arc<Request>,
+    query_params: OnceCell<Py<QueryParams>>,
+    headers: OnceCell<Py<Headers>>,
+    path_params: OnceCell<Py<PyDict>>,
+    body: OnceCell<Py<PyAny>>,
+    form_data: OnceCell<Py<PyDict>>,
+    files: OnceCell<Py<PyDict>>,
+    json: OnceCell<PyObject>,
     #[pyo3(get, set)]
     pub identity: Option<Identity>,
-    #[pyo3(get)]
-    pub body: Py<PyAny>,
-    #[pyo3(get)]
-    pub method: String,
-    #[pyo3(get)]
-    pub url: Url,
-    #[pyo3(get)]
-    pub ip_addr: Option<String>,
-    #[pyo3(get, set)]
-    pub form_data: Py<PyDict>,
-    #[pyo3(get, set)]
-    pub files: Py<PyDict>,
+}
+
+impl PyRequest {
+    pub fn from_request(request: Arc<Request>) -> Self {
+        Self {
+            identity: request.identity.clone(),
+            inner: request,
+            query_params: OnceCell::new(),
+            headers: OnceCell::new(),
+            path_params: OnceCell::new(),
+            body: OnceCell::new(),
+            form_data: OnceCell::new(),
+            files: OnceCell::new(),
+            json: OnceCell::new(),
+        }
+    }
+
+    /// The Rust request behind this object. It is shared, without a copy,
+    /// as long as none of its fields were materialized in Python.
+    pub fn to_shared_request(&self, py: Python) -> PyResult<Arc<Request>> {
+        let untouched = self.query_params.get().is_none()
+            && self.headers.get().is_none()
+            && self.path_params.get().is_none()
+            && self.body.get().is_none()
+            && self.form_data.get().is_none()
+            && self.files.get().is_none()
+            && self.identity == self.inner.identity;
+        if untouched {
+            return Ok(Arc::clone(&self.inner));
+        }
+        self.to_request(py).map(Arc::new)
+    }
+
+    /// Builds the Rust request back, only extracting the fields
+    /// that were materialized (and possibly modified) in Python.
+    pub fn to_request(&self, py: Python) -> PyResult<Request> {
+        let inner = &self.inner;
+
+        let query_params = match self.query_params.get() {
+            Some(query_params) => QueryParams::clone(&query_params.try_borrow(py)?),
+            None => inner.query_params.clone(),
+        };
+        let headers = match self.headers.get() {
+            Some(headers) => Headers::clone(&headers.try_borrow(py)?),
+            None => inner.headers.clone(),
+        };
+        let path_params = match self.path_params.get() {
+            Some(path_params) => path_params.extract(py)?,
+            None => inner.path_params.clone(),
+        };
+        let body = match self.body.get() {
+            Some(body) => get_body_from_pyobject(body.as_ref(py))?,
+            None => inner.body.clone(),
+        };
+        let form_data = match self.form_data.get() {
+            Some(form_data) => Some(form_data.extract(py)?),
+            None => inner.form_data.clone(),
+        };
+        let files = match self.files.get() {
+            Some(files) => Some(files.extract(py)?),
+            None => inner.files.clone(),
+        };
+
+        Ok(Request {
+            query_params,
+            headers,
+            method: inner.method.clone(),
+            path_params,
+            body,
+            url: inner.url.clone(),
+            ip_addr: inner.ip_addr.clone(),
+            identity: self.identity.clone(),
+            form_data,
+            files,
+            uploads: inner.uploads.clone(),
+            body_stream: inner.body_stream.clone(),
+        })
+    }
 }
 
 #[pymethods]
@@ -222,7 +363,7 @@ impl PyRequest {
     #[new]
     #[allow(clippy::too_many_arguments)]
     pub fn new(
-        query_params: QueryParams,
+        query_params: Py<QueryParams>,
         headers: Py<Headers>,
         path_params: Py<PyDict>,
         body: Py<PyAny>,
@@ -233,48 +374,229 @@ impl PyRequest {
         identity: Option<Identity>,
         ip_addr: Option<String>,
     ) -> Self {
-        Self {
-            query_params,
-            headers,
-            path_params,
-            identity,
-            body,
+        let request = Request {
             method,
             url,
-            form_data,
-            files,
             ip_addr,
+            ..Default::default()
+        };
+
+        Self {
+            inner: Arc::new(request),
+            query_params: OnceCell::from(query_params),
+            headers: OnceCell::from(headers),
+            path_params: OnceCell::from(path_params),
+            body: OnceCell::from(body),
+            form_data: OnceCell::from(form_data),
+            files: OnceCell::from(files),
+            json: OnceCell::new(),
+            identity,
         }
     }
 
+    #[getter]
+    pub fn query_params(&self, py: Python) -> PyResult<Py<QueryParams>> {
+        let query_params = self
+            .query_params
+            .get_or_try_init(|| Py::new(py, self.inner.query_params.clone()))?;
+        Ok(query_params.clone_ref(py))
+    }
+
+    #[setter]
+    pub fn set_query_params(&mut self, query_params: Py<QueryParams>) {
+        self.query_params = OnceCell::from(query_params);
+    }
+
+    #[getter]
+    pub fn headers(&self, py: Python) -> PyResult<Py<Headers>> {
+        let headers = self
+            .headers
+            .get_or_try_init(|| Py::new(py, self.inner.headers.clone()))?;
+        Ok(headers.clone_ref(py))
+    }
+
+    #[setter]
+    pub fn set_headers(&mut self, headers: Py<Headers>) {
+        self.headers = OnceCell::from(headers);
+    }
+
+    #[getter]
+    pub fn path_params(&self, py: Python) -> Py<PyDict> {
+        let path_params = self
+            .path_params
+            .get_or_init(|| self.inner.path_params.clone().into_py_dict(py).into());
+        path_params.clone_ref(py)
+    }
+
+    #[setter]
+    pub fn set_path_params(&mut self, path_params: Py<PyDict>) {
+        self.path_params = OnceCell::from(path_params);
+    }
+
+    #[getter]
+    pub fn body(&self, py: Python) -> Py<PyAny> {
+        let body = self
+            .body
+            .get_or_init(|| match std::str::from_utf8(&self.inner.body) {
+                Ok(body) => PyString::new(py, body).into(),
+                Err(_) => PyBytes::new(py, &self.inner.body).into(),
+            });
+        body.clone_ref(py)
+    }
+
     #[setter]
     pub fn set_body(&mut self, py: Python, body: Py<PyAny>) -> PyResult<()> {
         check_body_type(py, &body)?;
-        self.body = body;
+        self.body = OnceCell::from(body);
+        self.json = OnceCell::new();
         Ok(())
     }
 
-    pub fn json(&self, py: Python) -> PyResult<PyObject> {
-        match self.body.as_ref(py).downcast::<PyString>() {
-            Ok(python_string) => match serde_json::from_str(python_string.extract()?) {
-                Ok(Value::Object(map)) => {
-                    let dict = PyDict::new(py);
-
-                    for (key, value) in map.iter() {
-                        let py_key = key.to_string().into_py(py);
-                        let py_value = match value {
-                            Value::String(s) => s.as_str().into_py(py),
-                            _ => value.to_string().into_py(py),
-                        };
-
-                        dict.set_item(py_key, py_value)?;
-                    }
-
-                    Ok(dict.into_py(py))
+    /// A read only memoryview over the request body, without copying it.
+    #[getter]
+    pub fn raw_body(&self, py: Python) -> PyResult<PyObject> {
+        let data = match self.body.get() {
+            Some(body) => get_body_from_pyobject(body.as_ref(py))?,
+            None => self.inner.body.clone(),
+        };
+        let buffer = Py::new(py, BodyBuffer { data })?;
+        // Safety: `PyMemoryView_FromObject` returns a new reference or NULL with an exception set
+        unsafe {
+            PyObject::from_owned_ptr_or_err(py, ffi::PyMemoryView_FromObject(buffer.as_ptr()))
+        }
+    }
+
+    /// The body as an async iterator of chunks, only set for routes streaming their body.
+    #[getter]
+    pub fn body_stream(&self) -> Option<BodyStream> {
+        self.inner.body_stream.clone()
+    }
+
+    #[getter]
+    pub fn method(&self) -> String {
+        self.inner.method.clone()
+    }
+
+    #[getter]
+    pub fn url(&self) -> Url {
+        self.inner.url.clone()
+    }
+
+    #[getter]
+    pub fn ip_addr(&self) -> Option<String> {
+        self.inner.ip_addr.clone()
+    }
+
+    #[getter]
+    pub fn form_data(&self, py: Python) -> PyResult<Py<PyDict>> {
+        let form_data = self.form_data.get_or_try_init(|| -> PyResult<Py<PyDict>> {
+            let dict = PyDict::new(py);
+            if let Some(data) = &self.inner.form_data {
+                for (key, value) in data.iter() {
+                    dict.set_item(key, value)?;
                 }
-                _ => Err(PyValueError::new_err("Invalid JSON object")),
-            },
-            Err(e) => Err(e.into()),
+            }
+            Ok(dict.into())
+        })?;
+        Ok(form_data.clone_ref(py))
+    }
+
+    #[setter]
+    pub fn set_form_data(&mut self, form_data: Py<PyDict>) {
+        self.form_data = OnceCell::from(form_data);
+    }
+
+    #[getter]
+    pub fn files(&self, py: Python) -> PyResult<Py<PyDict>> {
+        let files = self.files.get_or_try_init(|| -> PyResult<Py<PyDict>> {
+            let dict = PyDict::new(py);
+            if let Some(data) = &self.inner.files {
+                for (key, value) in data.iter() {
+                    dict.set_item(key, PyBytes::new(py, value))?;
+                }
+            } else {
+                for upload in self.inner.uploads.iter() {
+                    dict.set_item(&upload.filename, upload.read(py)?)?;
+                }
+            }
+            Ok(dict.into())
+        })?;
+        Ok(files.clone_ref(py))
+    }
+
+    /// Every uploaded file, in the order they were received.
+    /// Unlike `files`, they are not read in memory and files sharing a name are all kept.
+    #[getter]
+    pub fn uploads(&self) -> Vec<UploadFile> {
+        self.inner.uploads.clone()
+    }
+
+    #[setter]
+    pub fn set_files(&mut self, files: Py<PyDict>) {
+        self.files = OnceCell::from(files);
+    }
+
+    /// The body decoded from JSON into native Python objects, parsed once and cached.
+    pub fn json(&self, py: Python) -> PyResult<PyObject> {
+        let json = self.json.get_or_try_init(|| {
+            let loads = ORJSON_LOADS.get_or_try_init(py, || -> PyResult<PyObject> {
+                Ok(py.import("orjson")?.getattr("loads")?.into())
+            })?;
+            // orjson reads the memoryview, without copying the body into a `str` first
+            loads.call1(py, (self.raw_body(py)?,))
+        })?;
+        Ok(json.clone_ref(py))
+    }
+}
+
+static ORJSON_LOADS: GILOnceCell<PyObject> = GILOnceCell::new();
+
+/// Exposes `Bytes` to Python through the buffer protocol.
+#[pyclass]
+struct BodyBuffer {
+    data: Bytes,
+}
+
+#[pymethods]
+impl BodyBuffer {
+    unsafe fn __getbuffer__(
+        slf: PyRef<'_, Self>,
+        view: *mut ffi::Py_buffer,
+        flags: c_int,
+    ) -> PyResult<()> {
+        if view.is_null() {
+            return Err(PyBufferError::new_err("View is null"));
         }
+        if (flags & ffi::PyBUF_WRITABLE) == ffi::PyBUF_WRITABLE {
+            return Err(PyBufferError::new_err("Request body is read only"));
+        }
+
+        ffi::Py_INCREF(slf.as_ptr());
+        (*view).obj = slf.as_ptr();
+        (*view).buf = slf.data.as_ptr() as *mut c_void;
+        (*view).len = slf.data.len() as ffi::Py_ssize_t;
+        (*view).readonly = 1;
+        (*view).itemsize = 1;
+        (*view).format = if (flags & ffi::PyBUF_FORMAT) == ffi::PyBUF_FORMAT {
+            CStr::from_bytes_with_nul(b"B\0").unwrap().as_ptr() as *mut _
+        } else {
+            std::ptr::null_mut()
+        };
+        (*view).ndim = 1;
+        (*view).shape = if (flags & ffi::PyBUF_ND) == ffi::PyBUF_ND {
+            &mut (*view).len
+        } else {
+            std::ptr::null_mut()
+        };
+        (*view).strides = if (flags & ffi::PyBUF_STRIDES) == ffi::PyBUF_STRIDES {
+            &mut (*view).itemsize
+        } else {
+            std::ptr::null_mut()
+        };
+        (*view).suboffsets = std::ptr::null_mut();
+        (*view).internal = std::ptr::null_mut();
+        Ok(())
     }
+
+    unsafe fn __releasebuffer__(&self, _view: *mut ffi::Py_buffer) {}
 }
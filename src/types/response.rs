@@ -1,13 +1,23 @@
-use actix_http::{body::BoxBody, StatusCode};
-use actix_web::{HttpRequest, HttpResponse, HttpResponseBuilder, Responder};
+use actix_files::NamedFile;
+use std::{
+    collections::hash_map::DefaultHasher,
+    hash::{Hash, Hasher},
+};
+
+use actix_http::{body::BoxBody, header, Method, StatusCode};
+use actix_web::{web::Bytes, HttpRequest, HttpResponse, HttpResponseBuilder, Responder};
+use futures::{stream, Stream, StreamExt};
+use log::error;
 use pyo3::{
-    exceptions::PyIOError,
+    exceptions::{PyIOError, PyRuntimeError, PyStopAsyncIteration},
     prelude::*,
     types::{PyBytes, PyDict},
 };
+use pyo3_asyncio::TaskLocals;
 
-use crate::io_helpers::{apply_hashmap_headers, read_file};
-use crate::types::{check_body_type, check_description_type, get_description_from_pyobject};
+use crate::compression::{ContentEncoding, Encoder};
+use crate::io_helpers::{apply_hashmap_headers, override_hashmap_headers};
+use crate::types::{check_description_type, get_description_from_pyobject};
 
 use super::headers::Headers;
 
@@ -18,22 +28,220 @@ pub struct Response {
     pub headers: Headers,
     // https://pyo3.rs/v0.19.2/function.html?highlight=from_py_#per-argument-options
     #[pyo3(from_py_with = "get_description_from_pyobject")]
-    pub description: Vec<u8>,
+    pub description: Bytes,
     pub file_path: Option<String>,
+    #[pyo3(from_py_with = "get_stream_from_pyobject")]
+    pub stream: Option<ResponseStream>,
+}
+
+/// A response body produced chunk by chunk by a Python iterator or async iterator.
+///
+/// The next chunk is only pulled from Python once actix polls for it,
+/// so a slow client applies backpressure to the generator. Sync iterators are advanced
+/// on a blocking thread, async iterators on the event loop.
+#[derive(Clone)]
+pub struct ResponseStream {
+    iterator: Py<PyAny>,
+    // only set for async iterators
+    task_locals: Option<TaskLocals>,
+    // set once the compression of the stream was negotiated
+    pub encoding: Option<(ContentEncoding, u32)>,
+}
+
+impl std::fmt::Debug for ResponseStream {
+    fn fmt(&self, f: &mut std::fmt::Formatter<'_>) -> std::fmt::Result {
+        f.debug_struct("ResponseStream")
+            .field("iterator", &self.iterator)
+            .field("is_async", &self.task_locals.is_some())
+            .field("encoding", &self.encoding)
+            .finish()
+    }
+}
+
+fn get_stream_from_pyobject(stream: &PyAny) -> PyResult<Option<ResponseStream>> {
+    if stream.is_none() {
+        return Ok(None);
+    }
+
+    if stream.hasattr("__aiter__")? {
+        return Ok(Some(ResponseStream {
+            iterator: stream.call_method0("__aiter__")?.into(),
+            task_locals: Some(pyo3_asyncio::tokio::get_current_locals(stream.py())?),
+            encoding: None,
+        }));
+    }
+
+    Ok(Some(ResponseStream {
+        iterator: stream.iter()?.into(),
+        task_locals: None,
+        encoding: None,
+    }))
+}
+
+impl ResponseStream {
+    async fn next_chunk(&self) -> PyResult<Option<Bytes>> {
+        let task_locals = match &self.task_locals {
+            Some(task_locals) => task_locals,
+            None => {
+                // a sync generator may block between two chunks, which must not stall the worker
+                let iterator = self.iterator.clone();
+                return tokio::task::spawn_blocking(move || {
+                    Python::with_gil(|py| match iterator.as_ref(py).iter()?.next() {
+                        Some(chunk) => get_description_from_pyobject(chunk?).map(Some),
+                        None => Ok(None),
+                    })
+                })
+                .await
+                .map_err(|e| {
+                    PyRuntimeError::new_err(format!("The response stream task failed: {}", e))
+                })?;
+            }
+        };
+
+        let chunk = Python::with_gil(|py| {
+            let awaitable = self.iterator.as_ref(py).call_method0("__anext__")?;
+            pyo3_asyncio::into_future_with_locals(task_locals, awaitable)
+        })?
+        .await;
+
+        Python::with_gil(|py| match chunk {
+            Ok(chunk) => get_description_from_pyobject(chunk.as_ref(py)).map(Some),
+            Err(e) if e.is_instance_of::<PyStopAsyncIteration>(py) => Ok(None),
+            Err(e) => Err(e),
+        })
+    }
+
+    fn into_body(self) -> impl Stream<Item = PyResult<Bytes>> {
+        let encoder = match self.encoding {
+            Some((encoding, level)) => match Encoder::new(encoding, level) {
+                Ok(encoder) => Some(encoder),
+                Err(e) => return stream::once(async move { Err(PyErr::from(e)) }).left_stream(),
+            },
+            None => None,
+        };
+
+        stream::unfold(Some((self, encoder)), |state| async move {
+            let (response_stream, mut encoder) = state?;
+            loop {
+                let chunk = match response_stream.next_chunk().await {
+                    Ok(Some(chunk)) => match encoder.as_mut() {
+                        Some(encoder) => encoder.write_chunk(&chunk).map_err(PyErr::from),
+                        None => Ok(chunk),
+                    },
+                    // the encoder writes its trailer once the iterator is exhausted
+                    Ok(None) => match encoder.take() {
+                        Some(encoder) => match encoder.finish() {
+                            Ok(trailer) if !trailer.is_empty() => return Some((Ok(trailer), None)),
+                            Ok(_) => return None,
+                            Err(e) => Err(e.into()),
+                        },
+                        None => return None,
+                    },
+                    Err(e) => Err(e),
+                };
+
+                match chunk {
+                    // an empty chunk would terminate a chunked body early
+                    Ok(chunk) if chunk.is_empty() => continue,
+                    Ok(chunk) => return Some((Ok(chunk), Some((response_stream, encoder)))),
+                    Err(e) => {
+                        error!("Error while streaming the response body: {}", e);
+                        return Some((Err(e), None));
+                    }
+                }
+            }
+        })
+        .right_stream()
+    }
+}
+
+/// Weak comparison of an `If-None-Match` header against an entity tag.
+fn etag_matches(if_none_match: &str, etag: &str) -> bool {
+    let etag = etag.trim_start_matches("W/");
+    if_none_match
+        .split(',')
+        .map(str::trim)
+        .any(|candidate| candidate == "*" || candidate.trim_start_matches("W/") == etag)
 }
 
 impl Responder for Response {
     type Body = BoxBody;
 
+    /// File responses are opened asynchronously by `Response::into_http_response`.
     fn respond_to(self, _req: &HttpRequest) -> HttpResponse<Self::Body> {
         let mut response_builder =
             HttpResponseBuilder::new(StatusCode::from_u16(self.status_code).unwrap());
         apply_hashmap_headers(&mut response_builder, &self.headers);
-        response_builder.body(self.description)
+        match self.stream {
+            Some(stream) => response_builder.streaming(stream.into_body()),
+            None => response_builder.body(self.description),
+        }
     }
 }
 
 impl Response {
+    /// Converts the response for actix, opening the file of a file response
+    /// on a blocking thread instead of the worker.
+    pub async fn into_http_response(self, req: &HttpRequest) -> HttpResponse {
+        if let Some(file_path) = &self.file_path {
+            return self.respond_with_file(file_path, req).await;
+        }
+        self.respond_to(req)
+    }
+
+    /// Streams the file from disk with `NamedFile`, which also answers `Range`,
+    /// `If-Modified-Since` and `If-None-Match` requests.
+    async fn respond_with_file(&self, file_path: &str, req: &HttpRequest) -> HttpResponse {
+        let file = match NamedFile::open_async(file_path).await {
+            Ok(file) => file,
+            Err(e) => {
+                error!("Failed to open file `{}`: {}", file_path, e);
+                return Response::not_found(None).respond_to(req);
+            }
+        };
+
+        let mut response = file.into_response(req);
+        // keep the partial content and not modified statuses
+        if response.status() == StatusCode::OK {
+            *response.status_mut() = StatusCode::from_u16(self.status_code).unwrap();
+        }
+        override_hashmap_headers(response.headers_mut(), &self.headers);
+        response
+    }
+
+    /// Sets an `ETag` on the response, hashing the body unless the handler already set one,
+    /// and turns it into a bodyless `304 Not Modified` when it matches the request `If-None-Match`.
+    pub fn apply_etag(&mut self, req: &HttpRequest) {
+        if !matches!(*req.method(), Method::GET | Method::HEAD)
+            || self.status_code != 200
+            || self.stream.is_some()
+            || self.file_path.is_some()
+        {
+            return;
+        }
+
+        let etag = match self.headers.get("etag".to_string()) {
+            Some(etag) => etag,
+            None => {
+                let mut hasher = DefaultHasher::new();
+                self.description.hash(&mut hasher);
+                let etag = format!("\"{:x}-{:016x}\"", self.description.len(), hasher.finish());
+                self.headers.set("etag".to_string(), etag.clone());
+                etag
+            }
+        };
+
+        let not_modified = req
+            .headers()
+            .get_all(header::IF_NONE_MATCH)
+            .filter_map(|value| value.to_str().ok())
+            .any(|if_none_match| etag_matches(if_none_match, &etag));
+        if not_modified {
+            self.status_code = 304;
+            self.description = Bytes::new();
+        }
+    }
+
     pub fn not_found(headers: Option<&Headers>) -> Self {
         let headers = match headers {
             Some(headers) => headers.clone(),
@@ -44,8 +252,20 @@ impl Response {
             status_code: 404,
             response_type: "text".to_string(),
             headers,
-            description: "Not found".to_owned().into_bytes(),
+            description: Bytes::from_static(b"Not found"),
+            file_path: None,
+            stream: None,
+        }
+    }
+
+    pub fn from_error(error: &actix_web::Error) -> Self {
+        Self {
+            status_code: error.as_response_error().status_code().as_u16(),
+            response_type: "text".to_string(),
+            headers: Headers::new(None),
+            description: Bytes::from(error.to_string()),
             file_path: None,
+            stream: None,
         }
     }
 
@@ -59,8 +279,9 @@ impl Response {
             status_code: 500,
             response_type: "text".to_string(),
             headers,
-            description: "Internal server error".to_owned().into_bytes(),
+            description: Bytes::from_static(b"Internal server error"),
             file_path: None,
+            stream: None,
         }
     }
 }
@@ -70,9 +291,9 @@ impl ToPyObject for Response {
         let headers = self.headers.clone().into_py(py).extract(py).unwrap();
         // The description should only be either string or binary.
         // it should raise an exception otherwise
-        let description = match String::from_utf8(self.description.to_vec()) {
+        let description = match std::str::from_utf8(&self.description) {
             Ok(description) => description.to_object(py),
-            Err(_) => PyBytes::new(py, &self.description.to_vec()).into(),
+            Err(_) => PyBytes::new(py, &self.description).into(),
         };
 
         let response = PyResponse {
@@ -81,6 +302,10 @@ impl ToPyObject for Response {
             headers,
             description,
             file_path: self.file_path.clone(),
+            stream: self
+                .stream
+                .as_ref()
+                .map(|stream| stream.iterator.clone_ref(py)),
         };
         Py::new(py, response).unwrap().as_ref(py).into()
     }
@@ -99,6 +324,8 @@ pub struct PyResponse {
     pub description: Py<PyAny>,
     #[pyo3(get)]
     pub file_path: Option<String>,
+    #[pyo3(get, set)]
+    pub stream: Option<Py<PyAny>>,
 }
 
 #[pymethods]
@@ -111,7 +338,7 @@ impl PyResponse {
         headers: &PyAny,
         description: Py<PyAny>,
     ) -> PyResult<Self> {
-        check_body_type(py, &description)?;
+        check_description_type(py, &description)?;
 
         let headers_output: Py<Headers> = if let Ok(headers_dict) = headers.downcast::<PyDict>() {
             // Here you'd have logic to create a Headers instance from a PyDict
@@ -134,6 +361,7 @@ impl PyResponse {
             headers: headers_output,
             description,
             file_path: None,
+            stream: None,
         })
     }
 
@@ -144,18 +372,17 @@ impl PyResponse {
         Ok(())
     }
 
+    /// The file is not read here, it is streamed from disk when the response is sent.
     #[setter]
     pub fn set_file_path(&mut self, py: Python, file_path: &str) -> PyResult<()> {
+        if let Err(e) = std::fs::metadata(file_path) {
+            return Err(PyIOError::new_err(format!("Failed to read file: {}", e)));
+        }
+
         self.response_type = "static_file".to_string();
         self.file_path = Some(file_path.to_string());
-
-        match read_file(file_path) {
-            Ok(content) => {
-                self.description = PyBytes::new(py, &content).into();
-                Ok(())
-            }
-            Err(e) => Err(PyIOError::new_err(format!("Failed to read file: {}", e))),
-        }
+        self.description = PyBytes::new(py, b"").into();
+        Ok(())
     }
 
     pub fn set_cookie(&mut self, py: Python, key: &str, value: &str) -> PyResult<()> {
@@ -0,0 +1,102 @@
+use std::sync::Arc;
+
+use actix_web::web::Bytes;
+use pyo3::{prelude::*, types::PyBytes};
+use tempfile::NamedTempFile;
+
+#[derive(Debug, Clone)]
+enum UploadStorage {
+    Memory(Bytes),
+    // the temporary file is removed once the last reference to it is dropped
+    Disk(Arc<NamedTempFile>),
+}
+
+/// A file received in a multipart request.
+///
+/// Small files are kept in memory, larger ones are spooled to a temporary file
+/// that only lives as long as the request.
+#[pyclass]
+#[derive(Debug, Clone)]
+pub struct UploadFile {
+    #[pyo3(get)]
+    pub name: String,
+    #[pyo3(get)]
+    pub filename: String,
+    #[pyo3(get)]
+    pub content_type: Option<String>,
+    #[pyo3(get)]
+    pub size: usize,
+    storage: UploadStorage,
+}
+
+impl UploadFile {
+    pub fn in_memory(
+        name: String,
+        filename: String,
+        content_type: Option<String>,
+        data: Bytes,
+    ) -> Self {
+        Self {
+            name,
+            filename,
+            content_type,
+            size: data.len(),
+            storage: UploadStorage::Memory(data),
+        }
+    }
+
+    pub fn on_disk(
+        name: String,
+        filename: String,
+        content_type: Option<String>,
+        size: usize,
+        file: NamedTempFile,
+    ) -> Self {
+        Self {
+            name,
+            filename,
+            content_type,
+            size,
+            storage: UploadStorage::Disk(Arc::new(file)),
+        }
+    }
+}
+
+#[pymethods]
+impl UploadFile {
+    /// The path of the temporary file the upload was spooled to, None if it is kept in memory.
+    #[getter]
+    pub fn path(&self) -> Option<String> {
+        match &self.storage {
+            UploadStorage::Memory(_) => None,
+            UploadStorage::Disk(file) => Some(file.path().to_string_lossy().into_owned()),
+        }
+    }
+
+    /// Reads the whole file in memory.
+    pub fn read(&self, py: Python) -> PyResult<Py<PyBytes>> {
+        match &self.storage {
+            UploadStorage::Memory(data) => Ok(PyBytes::new(py, data).into()),
+            UploadStorage::Disk(file) => {
+                let content = py.allow_threads(|| std::fs::read(file.path()))?;
+                Ok(PyBytes::new(py, &content).into())
+            }
+        }
+    }
+
+    /// Copies the file to `destination`, without loading it in memory if it was spooled to disk.
+    pub fn save(&self, py: Python, destination: &str) -> PyResult<()> {
+        py.allow_threads(|| match &self.storage {
+            UploadStorage::Memory(data) => std::fs::write(destination, data),
+            UploadStorage::Disk(file) => std::fs::copy(file.path(), destination).map(|_| ()),
+        })?;
+        Ok(())
+    }
+
+    pub fn __repr__(&self) -> String {
+        format!(
+            "UploadFile(name={:?}, filename={:?}, content_type={:?}, size={})",
+            self.name, self.filename, self.content_type, self.size
+        )
+    }
+}
@@ -0,0 +1,72 @@
+import pytest
+
+from robyn.robyn import Headers
+
+HEADER_COUNTS = [10, 30, 100]
+
+
+def build_headers_dict(count: int) -> dict:
+    headers = {"Content-Type": "application/json", "Accept": "*/*", "User-Agent": "robyn"}
+    for index in range(count - len(headers)):
+        headers[f"X-Header-{index}"] = f"value-{index}"
+    return headers
+
+
+def test_headers_are_case_insensitive():
+    headers = Headers({"Content-Type": "application/json", "X-Custom": ["a", "b"]})
+    assert headers.get("content-type") == "application/json"
+    assert headers["CONTENT-TYPE"] == "application/json"
+    assert headers.get_all("x-custom") == ["a", "b"]
+    assert headers.get("x-custom") == "b"
+    assert "X-CUSTOM" in headers
+
+
+def test_headers_set_replaces_and_append_keeps_values():
+    headers = Headers({})
+    headers.append("Vary", "Origin")
+    headers.append("vary", "Accept-Encoding")
+    assert headers.get_all("Vary") == ["Origin", "Accept-Encoding"]
+
+    headers.set("VARY", "*")
+    assert headers.get_all("vary") == ["*"]
+    assert headers.get_headers() == {"vary": ["*"]}
+
+
+def test_headers_equality_ignores_order():
+    assert Headers({"a": ["1", "2"], "b": "3"}) == Headers({"b": "3", "a": ["2", "1"]})
+    assert not Headers({"a": "1"}) == Headers({"a": "1", "b": "2"})
+    assert Headers({}) == Headers({})
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", HEADER_COUNTS)
+def test_headers_build_benchmark(benchmark, count: int):
+    headers = build_headers_dict(count)
+    benchmark(Headers, headers)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", HEADER_COUNTS)
+def test_headers_lookup_benchmark(benchmark, count: int):
+    headers = Headers(build_headers_dict(count))
+
+    def lookup():
+        headers.get("content-type")
+        headers.contains("authorization")
+        headers.get(f"x-header-{count - 4}")
+
+    benchmark(lookup)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", HEADER_COUNTS)
+def test_headers_set_benchmark(benchmark, count: int):
+    headers = Headers(build_headers_dict(count))
+    benchmark(headers.set, "X-Response-Time", "1ms")
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", HEADER_COUNTS)
+def test_headers_get_headers_benchmark(benchmark, count: int):
+    headers = Headers(build_headers_dict(count))
+    benchmark(headers.get_headers)
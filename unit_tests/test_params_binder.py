@@ -0,0 +1,151 @@
+import json
+from dataclasses import dataclass
+from typing import List, Optional, TypedDict
+
+import pytest
+
+from robyn.robyn import Headers, HttpMethod, QueryParams, Request, Url
+from robyn.router import Router
+from robyn.types import Body, Method, PathParams
+
+INJECTED_DEPENDENCIES = {"global_dependencies": {"GLOBAL": "global"}, "router_dependencies": {}}
+
+
+def build_request(body: str = "hello=world") -> Request:
+    query_params = QueryParams()
+    query_params.set("hello", "robyn")
+    return Request(
+        query_params=query_params,
+        headers=Headers({"server": "robyn"}),
+        path_params={"id": "123"},
+        body=body,
+        method="POST",
+        url=Url(scheme="http", host="localhost", path="/bench"),
+        ip_addr=None,
+        identity=None,
+        form_data={},
+        files={},
+    )
+
+
+def add_route(handler):
+    return Router().add_route(
+        route_type=HttpMethod.POST,
+        endpoint="/bench",
+        handler=handler,
+        is_const=False,
+        auth_required=False,
+        openapi_name="",
+        openapi_tags=[],
+        exception_handler=None,
+        injected_dependencies=INJECTED_DEPENDENCIES,
+    )
+
+
+def zero_params():
+    return "zero"
+
+
+def one_param(request):
+    return request.method
+
+
+def five_params(body, query_params, method: Method, path: PathParams, headers: Headers):
+    return f"{body} {query_params.get('hello')} {method} {path['id']} {headers.get('server')}"
+
+
+def test_binds_params_by_name_and_type():
+    handler = add_route(five_params)
+    response = handler(build_request(), **INJECTED_DEPENDENCIES)
+    assert response.description == b"hello=world robyn POST 123 robyn"
+
+
+class ItemBody(Body):
+    name: str
+    price: float
+    tags: Optional[List[str]]
+
+
+@dataclass
+class ItemData:
+    name: str
+    price: float = 0.0
+
+
+class ItemDict(TypedDict):
+    name: str
+    items: List[ItemData]
+
+
+def test_binds_body_subclass_and_dependencies():
+    def handler(item: ItemBody, global_dependencies):
+        return f"{item.name} {item.price} {item.tags} {global_dependencies['GLOBAL']}"
+
+    response = add_route(handler)(build_request('{"name": "robyn", "price": 1}'), **INJECTED_DEPENDENCIES)
+    assert response.description == b"robyn 1.0 None global"
+
+
+def test_binds_dataclass_and_typed_dict_bodies():
+    def dataclass_handler(item: ItemData):
+        return f"{item!r}"
+
+    def typed_dict_handler(body: ItemDict):
+        return f"{body['name']} {body['items']!r}"
+
+    response = add_route(dataclass_handler)(build_request('{"name": "robyn"}'), **INJECTED_DEPENDENCIES)
+    assert response.description == b"ItemData(name='robyn', price=0.0)"
+
+    response = add_route(typed_dict_handler)(build_request('{"name": "robyn", "items": [{"name": "a", "price": 2}]}'), **INJECTED_DEPENDENCIES)
+    assert response.description == b"robyn [ItemData(name='a', price=2.0)]"
+
+
+@pytest.mark.parametrize(
+    "body, expected_errors",
+    [
+        ('{"price": "free"}', [(["body", "name"], "missing"), (["body", "price"], "float_type")]),
+        ('{"name": "robyn", "price": 1, "tags": [1]}', [(["body", "tags"], "union_type")]),
+        ("hello=world", [(["body"], "json_invalid")]),
+    ],
+)
+def test_invalid_body_is_422(body, expected_errors):
+    def handler(item: ItemBody):
+        return "unreachable"
+
+    response = add_route(handler)(build_request(body), **INJECTED_DEPENDENCIES)
+    assert response.status_code == 422
+    errors = json.loads(response.description)["detail"]
+    assert [(error["loc"], error["type"]) for error in errors] == expected_errors
+
+
+def test_unresolved_params_raise():
+    def handler(request, unknown):
+        return "unreachable"
+
+    with pytest.raises(SyntaxError):
+        add_route(handler)(build_request(), **INJECTED_DEPENDENCIES)
+
+
+def test_const_stream_route_raises():
+    def handler():
+        yield "chunk"
+
+    with pytest.raises(ValueError):
+        Router().add_route(
+            route_type=HttpMethod.GET,
+            endpoint="/stream",
+            handler=handler,
+            is_const=True,
+            auth_required=False,
+            openapi_name="",
+            openapi_tags=[],
+            exception_handler=None,
+            injected_dependencies={},
+        )
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("handler", [zero_params, one_param, five_params], ids=["0_params", "1_param", "5_params"])
+def test_params_binder_benchmark(benchmark, handler):
+    route_handler = add_route(handler)
+    request = build_request()
+    benchmark(route_handler, request, **INJECTED_DEPENDENCIES)
@@ -0,0 +1,53 @@
+import pytest
+
+from robyn.robyn import QueryParams
+
+
+def test_query_params_are_percent_decoded():
+    query_params = QueryParams("name=J%C3%B6rg+Doe&q=a%2Bb%26c&empty=&flag&&bad=%zz%2")
+    assert query_params.get("name") == "Jörg Doe"
+    assert query_params.get("q") == "a+b&c"
+    assert query_params.get("empty") == ""
+    assert query_params.get("flag") == ""
+    assert query_params.get("bad") == "%zz%2"
+    assert "" not in query_params
+
+
+def test_query_params_keep_every_value_in_order():
+    query_params = QueryParams("tag=b&page=1&tag=a")
+    assert query_params.get_first("tag") == "b"
+    assert query_params.get("tag") == "a"
+    assert query_params.get_all("tag") == ["b", "a"]
+    assert query_params.get_all("missing") is None
+    assert query_params.to_dict() == {"tag": ["b", "a"], "page": ["1"]}
+
+    query_params.set("page", "2")
+    assert query_params.get("page") == "2"
+    assert QueryParams().empty()
+
+
+def test_query_params_typed_getters():
+    query_params = QueryParams("page=2&debug=on&quiet=0&verbose&tags=a,b&tags=c&limit=ten")
+    assert query_params.get_int("page") == 2
+    assert query_params.get_int("missing", 10) == 10
+    assert query_params.get_bool("debug") is True
+    assert query_params.get_bool("quiet") is False
+    assert query_params.get_bool("verbose") is True
+    assert query_params.get_bool("missing") is None
+    assert query_params.get_list("tags") == ["a", "b", "c"]
+    assert query_params.get_list("tags", "") == ["a,b", "c"]
+    assert query_params.get_list("missing") == []
+
+    with pytest.raises(ValueError):
+        query_params.get_int("limit")
+    with pytest.raises(ValueError):
+        query_params.get_bool("limit")
+
+
+def test_query_params_parse(benchmark):
+    query_string = "&".join(f"key{index}=value+{index}%21" for index in range(30))
+
+    def parse():
+        return QueryParams(query_string).get("key29")
+
+    assert benchmark(parse) == "value 29!"
@@ -25,3 +25,33 @@ def test_request_object():
     print(request.headers.get("Content-Type"))
     assert request.headers.get("Content-Type") == "application/json"
     assert request.method == "GET"
+
+
+def test_request_object_fields_are_cached():
+    url = Url(
+        scheme="https",
+        host="localhost",
+        path="/user",
+    )
+    request = Request(
+        query_params=QueryParams(),
+        headers=Headers({}),
+        path_params={"id": "1"},
+        body="",
+        method="POST",
+        url=url,
+        ip_addr=None,
+        identity=None,
+        form_data={},
+        files={},
+    )
+
+    request.headers.set("Content-Type", "text/plain")
+    request.query_params.set("page", "2")
+    request.path_params["id"] = "2"
+    request.body = b"\xff"
+
+    assert request.headers.get("Content-Type") == "text/plain"
+    assert request.query_params.get("page") == "2"
+    assert request.path_params == {"id": "2"}
+    assert request.body == b"\xff"